@@ -22,10 +22,27 @@ if config.config_file_name is not None:
 
 # アプリケーションのモデルをインポート
 from app.db.models import Base
+from app.db.partitions import partition_parent
 
 target_metadata = Base.metadata
 
 
+def include_name(name: str | None, type_: str, parent_names: Any) -> bool:
+    """月パーティション（orders_p2024_01など）は自動生成の比較対象から除外"""
+    if type_ == "table" and name is not None:
+        return partition_parent(name) is None
+    return True
+
+
+def include_object(
+    obj: Any, name: str | None, type_: str, reflected: bool, compare_to: Any
+) -> bool:
+    """パーティション化したテーブルへの外部キーのうち、PostgreSQLがパーティションごとに作る内部の制約を除外"""
+    if type_ == "foreign_key_constraint" and reflected:
+        return partition_parent(obj.referred_table.name) is None
+    return True
+
+
 def get_url() -> str:
     """データベースURLを環境変数から取得"""
     return os.getenv("DATABASE_URL", config.get_main_option("sqlalchemy.url", ""))
@@ -39,6 +56,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -47,7 +66,12 @@ def run_migrations_offline() -> None:
 
 def do_run_migrations(connection: Connection) -> None:
     """実際のマイグレーション実行"""
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
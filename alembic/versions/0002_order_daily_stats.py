@@ -0,0 +1,71 @@
+"""order daily stats rollup tables
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# orderstatus型は0001で作成済み
+order_status = postgresql.ENUM(
+    'PENDING', 'PREPARING', 'READY', 'DELIVERED', 'CANCELLED',
+    name='orderstatus',
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'order_daily_stats',
+        sa.Column('stat_date', sa.Date(), nullable=False, comment='注文日'),
+        sa.Column('status', order_status, nullable=False, comment='注文ステータス'),
+        sa.Column('order_count', sa.Integer(), nullable=False, comment='注文数'),
+        sa.Column('revenue', sa.Numeric(precision=14, scale=0), nullable=False, comment='合計金額（円）'),
+        sa.PrimaryKeyConstraint('stat_date', 'status'),
+    )
+    op.create_table(
+        'order_menu_daily_stats',
+        sa.Column('stat_date', sa.Date(), nullable=False, comment='注文日'),
+        sa.Column('status', order_status, nullable=False, comment='注文ステータス'),
+        sa.Column('menu_id', sa.BigInteger(), nullable=False, comment='メニューID'),
+        sa.Column('quantity', sa.Integer(), nullable=False, comment='数量の合計'),
+        sa.Column('revenue', sa.Numeric(precision=14, scale=0), nullable=False, comment='小計の合計（円）'),
+        sa.ForeignKeyConstraint(['menu_id'], ['menus.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('stat_date', 'status', 'menu_id'),
+    )
+
+    # 既存の注文をバックフィル（以降はアプリケーションが差分を加算する）
+    op.execute(
+        """
+        INSERT INTO order_daily_stats (stat_date, status, order_count, revenue)
+        SELECT CAST(created_at AS DATE), status, count(id), sum(total_amount)
+        FROM orders
+        GROUP BY CAST(created_at AS DATE), status
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO order_menu_daily_stats (stat_date, status, menu_id, quantity, revenue)
+        SELECT CAST(o.created_at AS DATE), o.status, d.menu_id, sum(d.quantity), sum(d.subtotal)
+        FROM orders o
+        JOIN order_details d ON d.order_id = o.id
+        GROUP BY CAST(o.created_at AS DATE), o.status, d.menu_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('order_menu_daily_stats')
+    op.drop_table('order_daily_stats')
@@ -0,0 +1,70 @@
+"""composite and partial indexes for list queries
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# キッチン画面で参照する対応中のステータス
+ACTIVE_STATUSES = sa.text("status IN ('PENDING', 'PREPARING', 'READY')")
+
+
+def upgrade() -> None:
+    # 稼働中の注文テーブルをロックしないよう、トランザクション外でCONCURRENTLYに作成する
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_orders_user_id_created_at',
+            'orders',
+            ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_orders_created_at',
+            'orders',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_orders_active_status_created_at',
+            'orders',
+            ['status', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_where=ACTIVE_STATUSES,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_menus_available_category_created_at',
+            'menus',
+            ['is_available', 'category', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+        # 複合インデックスの先頭列で代替できる単一列インデックスを削除
+        # （ユーザー削除時の外部キー検索もix_orders_user_id_created_atで解決される）
+        op.drop_index('ix_orders_user_id', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_status', table_name='orders', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_orders_status', 'orders', ['status'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_orders_user_id', 'orders', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_menus_available_category_created_at', table_name='menus', postgresql_concurrently=True)
+        op.drop_index('ix_orders_active_status_created_at', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_created_at', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_user_id_created_at', table_name='orders', postgresql_concurrently=True)
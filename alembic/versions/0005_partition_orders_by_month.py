@@ -0,0 +1,204 @@
+"""partition orders and order_details by month
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 12:00:00.000000
+
+orders・order_detailsを注文日時（created_at）の月ごとのレンジパーティションに
+作り直す。既存の行は新しいテーブルにコピーし、IDの採番状態も引き継ぐ。
+コピーの間は両テーブルを排他ロックするため、注文受付を止めた時間帯に実行すること。
+
+月パーティションは既存データの最初の月から当月の数か月先まで作成する。
+以降の月はapp.scripts.create_order_partitionsで事前に作成する。
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 当月から何か月先までパーティションを作成しておくか
+MONTHS_AHEAD = 3
+
+# orderstatus型は0001で作成済み
+order_status = postgresql.ENUM(
+    'PENDING', 'PREPARING', 'READY', 'DELIVERED', 'CANCELLED',
+    name='orderstatus',
+    create_type=False,
+)
+
+# キッチン画面で参照する対応中のステータス
+ACTIVE_STATUSES = sa.text("status IN ('PENDING', 'PREPARING', 'READY')")
+
+ORDER_COLUMNS = (
+    'id, user_id, status, total_amount, delivery_address, delivery_time, notes, '
+    'created_at, updated_at'
+)
+ORDER_DETAIL_COLUMNS = 'id, order_id, menu_id, quantity, unit_price, subtotal, created_at'
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def order_columns(id_column: sa.Column) -> list[sa.Column]:
+    return [
+        id_column,
+        sa.Column('user_id', sa.BigInteger(), nullable=False, comment='注文者ユーザーID'),
+        sa.Column('status', order_status, nullable=False, comment='注文ステータス'),
+        sa.Column('total_amount', sa.Numeric(precision=10, scale=0), nullable=False, comment='合計金額（円）'),
+        sa.Column('delivery_address', sa.Text(), nullable=False, comment='配達先住所'),
+        sa.Column('delivery_time', sa.DateTime(timezone=True), nullable=True, comment='希望配達時間'),
+        sa.Column('notes', sa.Text(), nullable=True, comment='注文備考'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='注文日時'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='更新日時'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    ]
+
+
+def order_detail_columns(id_column: sa.Column) -> list[sa.Column]:
+    return [
+        id_column,
+        sa.Column('order_id', sa.BigInteger(), nullable=False, comment='注文ID'),
+        sa.Column('menu_id', sa.BigInteger(), nullable=False, comment='メニューID'),
+        sa.Column('quantity', sa.Integer(), nullable=False, comment='数量'),
+        sa.Column('unit_price', sa.Numeric(precision=10, scale=0), nullable=False, comment='注文時の単価（円）'),
+        sa.Column('subtotal', sa.Numeric(precision=10, scale=0), nullable=False, comment='小計（円）= quantity × unit_price'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='作成日時'),
+        sa.ForeignKeyConstraint(['menu_id'], ['menus.id'], ondelete='RESTRICT'),
+    ]
+
+
+def set_aside(table: str, suffix: str) -> None:
+    """既存テーブルを別名に退避し、主キー・シーケンス名を空ける（二次インデックスは削除）"""
+    op.rename_table(table, f'{table}_{suffix}')
+    op.execute(f'ALTER INDEX {table}_pkey RENAME TO {table}_{suffix}_pkey')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq RENAME TO {table}_{suffix}_id_seq')
+
+
+def copy_sequence(table: str, source: str) -> None:
+    """退避したテーブルのID採番状態を新しいテーブルに引き継ぐ"""
+    op.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), last_value, is_called) "
+        f"FROM {source}_id_seq"
+    )
+
+
+def create_list_indexes() -> None:
+    """一覧クエリ用のインデックス（0004と同じ定義）と注文詳細の外部キー用インデックス"""
+    op.create_index('ix_orders_user_id_created_at', 'orders', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('ix_orders_created_at', 'orders', [sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+    op.create_index(
+        'ix_orders_active_status_created_at',
+        'orders',
+        ['status', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=ACTIVE_STATUSES,
+    )
+    op.create_index(op.f('ix_order_details_menu_id'), 'order_details', ['menu_id'], unique=False)
+    op.create_index(op.f('ix_order_details_order_id'), 'order_details', ['order_id'], unique=False)
+
+
+def drop_list_indexes(suffix: str) -> None:
+    op.drop_index(op.f('ix_order_details_order_id'), table_name=f'order_details_{suffix}')
+    op.drop_index(op.f('ix_order_details_menu_id'), table_name=f'order_details_{suffix}')
+    op.drop_index('ix_orders_active_status_created_at', table_name=f'orders_{suffix}')
+    op.drop_index('ix_orders_created_at', table_name=f'orders_{suffix}')
+    op.drop_index('ix_orders_user_id_created_at', table_name=f'orders_{suffix}')
+
+
+def upgrade() -> None:
+    op.execute('LOCK TABLE orders, order_details IN ACCESS EXCLUSIVE MODE')
+    for table in ('order_details', 'orders'):
+        set_aside(table, 'unpartitioned')
+    drop_list_indexes('unpartitioned')
+
+    op.create_table(
+        'orders',
+        *order_columns(sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False, comment='注文ID')),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    # 注文詳細は注文と同じ月に入るよう、注文のcreated_atを持つ（複合外部キーで保証）
+    op.create_table(
+        'order_details',
+        *order_detail_columns(sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False, comment='注文詳細ID')),
+        sa.ForeignKeyConstraint(['order_id', 'created_at'], ['orders.id', 'orders.created_at'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+
+    # 既存データの最初の月から当月のMONTHS_AHEADか月先まで（月の境界はデータベースのタイムゾーン）
+    first, current = op.get_bind().execute(
+        sa.text(
+            "SELECT CAST(date_trunc('month', min(created_at)) AS date), "
+            "CAST(date_trunc('month', now()) AS date) FROM orders_unpartitioned"
+        )
+    ).one()
+    month = first or current
+    last = add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        for table in ('orders', 'order_details'):
+            op.execute(
+                f"CREATE TABLE {table}_p{month.year:04d}_{month.month:02d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            )
+        month = add_months(month, 1)
+    for table in ('orders', 'order_details'):
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute(f'INSERT INTO orders ({ORDER_COLUMNS}) SELECT {ORDER_COLUMNS} FROM orders_unpartitioned')
+    op.execute(
+        f'INSERT INTO order_details ({ORDER_DETAIL_COLUMNS}) '
+        'SELECT d.id, d.order_id, d.menu_id, d.quantity, d.unit_price, d.subtotal, o.created_at '
+        'FROM order_details_unpartitioned d JOIN orders_unpartitioned o ON o.id = d.order_id'
+    )
+    copy_sequence('orders', 'orders_unpartitioned')
+    copy_sequence('order_details', 'order_details_unpartitioned')
+
+    op.drop_table('order_details_unpartitioned')
+    op.drop_table('orders_unpartitioned')
+    create_list_indexes()
+    op.execute('ANALYZE orders, order_details')
+
+
+def downgrade() -> None:
+    op.execute('LOCK TABLE orders, order_details IN ACCESS EXCLUSIVE MODE')
+    for table in ('order_details', 'orders'):
+        set_aside(table, 'partitioned')
+    drop_list_indexes('partitioned')
+
+    op.create_table(
+        'orders',
+        *order_columns(sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False, comment='注文ID')),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'order_details',
+        *order_detail_columns(sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False, comment='注文詳細ID')),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.execute(f'INSERT INTO orders ({ORDER_COLUMNS}) SELECT {ORDER_COLUMNS} FROM orders_partitioned')
+    op.execute(
+        f'INSERT INTO order_details ({ORDER_DETAIL_COLUMNS}) '
+        f'SELECT {ORDER_DETAIL_COLUMNS} FROM order_details_partitioned'
+    )
+    copy_sequence('orders', 'orders_partitioned')
+    copy_sequence('order_details', 'order_details_partitioned')
+
+    # 親テーブルの削除でパーティションも削除される
+    op.drop_table('order_details_partitioned')
+    op.drop_table('orders_partitioned')
+    create_list_indexes()
+    op.execute('ANALYZE orders, order_details')
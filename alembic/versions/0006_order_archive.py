@@ -0,0 +1,85 @@
+"""archive tables for delivered and cancelled orders
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# orderstatus型は0001で作成済み
+order_status = postgresql.ENUM(
+    'PENDING', 'PREPARING', 'READY', 'DELIVERED', 'CANCELLED',
+    name='orderstatus',
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'orders_archive',
+        sa.Column('id', sa.BigInteger(), autoincrement=False, nullable=False, comment='注文ID'),
+        sa.Column('user_id', sa.BigInteger(), nullable=False, comment='注文者ユーザーID'),
+        sa.Column('status', order_status, nullable=False, comment='注文ステータス'),
+        sa.Column('total_amount', sa.Numeric(precision=10, scale=0), nullable=False, comment='合計金額（円）'),
+        sa.Column('delivery_address', sa.Text(), nullable=False, comment='配達先住所'),
+        sa.Column('delivery_time', sa.DateTime(timezone=True), nullable=True, comment='希望配達時間'),
+        sa.Column('notes', sa.Text(), nullable=True, comment='注文備考'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, comment='注文日時'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, comment='更新日時'),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='アーカイブ日時'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_orders_archive_user_id_created_at',
+        'orders_archive',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+    op.create_table(
+        'order_details_archive',
+        sa.Column('id', sa.BigInteger(), autoincrement=False, nullable=False, comment='注文詳細ID'),
+        sa.Column('order_id', sa.BigInteger(), nullable=False, comment='注文ID'),
+        sa.Column('menu_id', sa.BigInteger(), nullable=False, comment='メニューID'),
+        sa.Column('quantity', sa.Integer(), nullable=False, comment='数量'),
+        sa.Column('unit_price', sa.Numeric(precision=10, scale=0), nullable=False, comment='注文時の単価（円）'),
+        sa.Column('subtotal', sa.Numeric(precision=10, scale=0), nullable=False, comment='小計（円）= quantity × unit_price'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, comment='作成日時'),
+        sa.ForeignKeyConstraint(['menu_id'], ['menus.id'], ondelete='RESTRICT'),
+        sa.ForeignKeyConstraint(['order_id'], ['orders_archive.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_order_details_archive_menu_id'), 'order_details_archive', ['menu_id'], unique=False)
+    op.create_index(op.f('ix_order_details_archive_order_id'), 'order_details_archive', ['order_id'], unique=False)
+
+
+def downgrade() -> None:
+    # アーカイブ済みの注文を元のテーブルに戻してから削除する
+    op.execute(
+        'INSERT INTO orders (id, user_id, status, total_amount, delivery_address, delivery_time, '
+        'notes, created_at, updated_at) '
+        'SELECT id, user_id, status, total_amount, delivery_address, delivery_time, '
+        'notes, created_at, updated_at FROM orders_archive'
+    )
+    op.execute(
+        'INSERT INTO order_details (id, order_id, menu_id, quantity, unit_price, subtotal, created_at) '
+        'SELECT id, order_id, menu_id, quantity, unit_price, subtotal, created_at FROM order_details_archive'
+    )
+    op.drop_index(op.f('ix_order_details_archive_order_id'), table_name='order_details_archive')
+    op.drop_index(op.f('ix_order_details_archive_menu_id'), table_name='order_details_archive')
+    op.drop_table('order_details_archive')
+    op.drop_index('ix_orders_archive_user_id_created_at', table_name='orders_archive')
+    op.drop_table('orders_archive')
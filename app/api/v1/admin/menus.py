@@ -3,10 +3,18 @@
 店舗スタッフが使用するメニューCRUD機能
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.http_cache import (
+    REVALIDATE_PRIVATE,
+    etag_matches,
+    not_modified,
+    set_cache_headers,
+)
 from app.crud.menu import menu_crud
+from app.crud.menu_catalog import catalog_etag, menu_catalog
+from app.crud.pagination import TotalMode, next_cursor
 from app.db.database import get_db
 from app.db.models import MenuCategory
 from app.schemas.menu import MenuCreate, MenuListResponse, MenuResponse, MenuUpdate
@@ -16,38 +24,61 @@ router = APIRouter()
 
 @router.get("/", response_model=MenuListResponse)
 async def get_admin_menus(
+    response: Response,
     limit: int = Query(50, ge=1, le=100, description="取得件数"),
     offset: int = Query(0, ge=0, description="開始位置"),
     category: MenuCategory | None = Query(None, description="カテゴリフィルタ"),
     available_only: bool = Query(False, description="販売可能商品のみ取得"),
+    cursor: str | None = Query(None, description="前ページのnext_cursor（指定時はoffsetを使用しない）"),
+    total_mode: TotalMode = Query(TotalMode.EXACT, description="総件数の取得方法（exact / estimated / none）"),
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db)
-) -> MenuListResponse:
+) -> MenuListResponse | Response:
     """
     管理者向けメニュー一覧取得
 
     店舗スタッフ用のメニュー一覧を取得します。
     販売停止中の商品も含めて全商品を取得できます。
+    cursorを指定するとキーセット方式で次ページを取得します。
+    ETag（全メニューの最終更新日時と件数）がIf-None-Matchと一致する場合は
+    一覧を読み込まずに304を返します。
     """
     try:
+        max_updated_at, count = await menu_crud.get_menus_version(db=db)
+        etag = catalog_etag(max_updated_at, count)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, REVALIDATE_PRIVATE)
+
         # データベースからメニューを取得
-        menus, total = await menu_crud.get_menus(
+        page = await menu_crud.get_menus(
             db=db,
             skip=offset,
             limit=limit,
             category=category,
-            available_only=available_only
+            available_only=available_only,
+            cursor=cursor,
+            total_mode=total_mode
         )
 
         # レスポンス形式に変換
-        menu_responses = [MenuResponse.model_validate(menu) for menu in menus]
+        menu_responses = [MenuResponse.model_validate(menu) for menu in page.items]
 
+        set_cache_headers(response, etag, REVALIDATE_PRIVATE)
         return MenuListResponse(
             items=menu_responses,
-            total=total,
+            total=page.total,
             limit=limit,
-            offset=offset
+            offset=0 if cursor else offset,
+            has_more=page.has_more,
+            total_estimated=page.total_estimated,
+            next_cursor=next_cursor(menu_responses, page.has_more)
         )
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        ) from e
     except Exception:
         raise HTTPException(
             status_code=500,
@@ -101,6 +132,7 @@ async def create_menu(
     try:
         # メニューを作成
         new_menu = await menu_crud.create_menu(db=db, menu_data=menu_data)
+        menu_catalog.invalidate()
 
         return MenuResponse.model_validate(new_menu)
 
@@ -135,6 +167,7 @@ async def update_menu(
                 status_code=404,
                 detail="メニューが見つかりません"
             )
+        menu_catalog.invalidate()
 
         return MenuResponse.model_validate(updated_menu)
 
@@ -157,6 +190,7 @@ async def delete_menu(
     メニュー削除
 
     指定されたIDのメニューを削除します。
+    注文されたことのあるメニューは注文履歴を残すため削除できません（409）。
     """
     try:
         # メニューを削除
@@ -167,10 +201,16 @@ async def delete_menu(
                 status_code=404,
                 detail="メニューが見つかりません"
             )
+        menu_catalog.invalidate()
 
     except HTTPException:
         # HTTPExceptionはそのまま再発生
         raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e)
+        ) from e
     except Exception:
         raise HTTPException(
             status_code=500,
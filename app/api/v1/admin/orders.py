@@ -0,0 +1,503 @@
+"""
+管理者向け注文管理APIエンドポイント
+店舗スタッフが使用する注文一覧・詳細・ステータス更新機能
+"""
+
+import logging
+from datetime import date
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.dependencies.auth import get_current_user
+from app.core.config import settings
+from app.crud.order import build_order_response, order_crud
+from app.crud.order_events import order_event_crud
+from app.crud.order_feed import FeedEvent, order_feed
+from app.crud.order_stats import order_stats_crud
+from app.crud.pagination import TotalMode, next_cursor
+from app.db.database import get_db
+from app.db.models import OrderStatus, UserRole
+from app.schemas.admin import (
+    AdminOrderListResponse,
+    BulkOrderStatusOutcome,
+    BulkOrderStatusResponse,
+    BulkOrderStatusUpdate,
+    OrderStatistics,
+    OrderStatusUpdateResponse,
+)
+from app.schemas.order import OrderResponse
+from app.schemas.user import UserPrincipal
+
+router = APIRouter()
+
+# ロガーの設定
+logger = logging.getLogger("uvicorn")
+
+
+@router.get("/", response_model=AdminOrderListResponse)
+async def get_orders(
+    limit: int = Query(50, ge=1, le=100, description="取得件数"),
+    offset: int = Query(0, ge=0, description="開始位置"),
+    status: OrderStatus | None = Query(None, description="注文ステータスでフィルタ"),
+    date_from: date | None = Query(None, description="開始日（YYYY-MM-DD）"),
+    date_to: date | None = Query(None, description="終了日（YYYY-MM-DD）"),
+    cursor: str | None = Query(None, description="前ページのnext_cursor（指定時はoffsetを使用しない）"),
+    total_mode: TotalMode = Query(TotalMode.ESTIMATED, description="総件数の取得方法（exact / estimated / none）"),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> AdminOrderListResponse:
+    """
+    注文一覧を取得（店舗管理者のみ）
+
+    注文者の名前・メールアドレスは結合で、アイテム数は集計で
+    一覧と同じクエリ内で取得するため、ページサイズに関わらずクエリ数は一定。
+    cursorを指定するとキーセット方式で次ページを取得する。
+    注文テーブルは大きくなるため、総件数は既定で統計情報による推定値を返す。
+
+    Args:
+        limit: 取得件数
+        offset: 開始位置
+        status: 注文ステータスでフィルタ
+        date_from: 注文日の開始日
+        date_to: 注文日の終了日（この日を含む）
+        cursor: 前ページのnext_cursor
+        total_mode: 総件数の取得方法
+        db: データベースセッション
+        current_user: 現在のログインユーザー（認証必須）
+
+    Returns:
+        AdminOrderListResponse: 注文一覧
+
+    Raises:
+        HTTPException:
+            - 400: カーソルが不正
+            - 401: 認証エラー
+            - 403: 権限エラー（管理者以外）
+    """
+    if current_user.role != UserRole.STORE:
+        raise HTTPException(
+            status_code=403,
+            detail="この操作を実行する権限がありません"
+        )
+    try:
+        page = await order_crud.get_admin_orders(
+            db=db,
+            skip=offset,
+            limit=limit,
+            status=status,
+            date_from=date_from,
+            date_to=date_to,
+            cursor=cursor,
+            total_mode=total_mode,
+        )
+
+        return AdminOrderListResponse(
+            items=page.items,
+            total=page.total,
+            limit=limit,
+            offset=0 if cursor else offset,
+            has_more=page.has_more,
+            total_estimated=page.total_estimated,
+            next_cursor=next_cursor(page.items, page.has_more)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        ) from e
+    except Exception as e:
+        logger.exception("An error occurred while fetching orders: %s", str(e))
+        raise HTTPException(
+            status_code=500,
+            detail="注文の取得中にエラーが発生しました"
+        ) from e
+
+
+@router.get("/stats", response_model=OrderStatistics)
+async def get_order_stats(
+    date_from: date | None = Query(None, description="開始日（YYYY-MM-DD）"),
+    date_to: date | None = Query(None, description="終了日（YYYY-MM-DD）"),
+    popular_limit: int = Query(5, ge=1, le=50, description="人気メニューの件数"),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> OrderStatistics:
+    """
+    注文統計を取得（店舗管理者のみ）
+
+    注文・注文詳細を走査せず、日次集計テーブルの合計から返す。
+
+    Args:
+        date_from: 注文日の開始日
+        date_to: 注文日の終了日（この日を含む）
+        popular_limit: 人気メニューの件数
+        db: データベースセッション
+        current_user: 現在のログインユーザー（認証必須）
+
+    Returns:
+        OrderStatistics: 注文統計
+
+    Raises:
+        HTTPException:
+            - 400: 期間が不正
+            - 401: 認証エラー
+            - 403: 権限エラー（管理者以外）
+    """
+    if current_user.role != UserRole.STORE:
+        raise HTTPException(
+            status_code=403,
+            detail="この操作を実行する権限がありません"
+        )
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=400,
+            detail="開始日は終了日以前の日付を指定してください"
+        )
+
+    try:
+        return await order_stats_crud.get_statistics(
+            db=db,
+            date_from=date_from,
+            date_to=date_to,
+            popular_limit=popular_limit,
+        )
+    except Exception as e:
+        logger.exception("An error occurred while fetching order stats: %s", str(e))
+        raise HTTPException(
+            status_code=500,
+            detail="注文統計の取得中にエラーが発生しました"
+        ) from e
+
+
+@router.get("/events")
+async def stream_order_events(
+    last_event_id: int | None = Query(None, ge=0, description="受信済みの最新イベントID（Last-Event-IDヘッダーと同じ）"),
+    last_event_id_header: str | None = Header(None, alias="Last-Event-ID"),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    注文の作成・ステータス変更をServer-Sent Eventsで配信（店舗管理者のみ）
+
+    Last-Event-ID（ヘッダーまたはクエリ）を指定すると、それ以降のイベントを
+    送り直してから配信を続ける。指定しない場合はフィードの配信済みの最新イベントIDを
+    readyイベントで通知し、以降のイベントを配信する。
+    送り直しはフィードの配信済みの範囲（欠番が確定した範囲）に限り、
+    それより後のイベントは購読キューから届く。
+    送り直しが上限を超える場合はresetイベントを送るので、クライアントは一覧を再取得する。
+    配信中はデータベース接続を保持しない。
+
+    Args:
+        last_event_id: 受信済みの最新イベントID
+        last_event_id_header: Last-Event-IDヘッダー（EventSourceの再接続時に送られる）
+        db: データベースセッション
+        current_user: 現在のログインユーザー（認証必須）
+
+    Returns:
+        StreamingResponse: text/event-streamのレスポンス
+
+    Raises:
+        HTTPException:
+            - 400: Last-Event-IDが不正
+            - 401: 認証エラー
+            - 403: 権限エラー（管理者以外）
+            - 503: 配信を開始できない
+    """
+    if current_user.role != UserRole.STORE:
+        raise HTTPException(
+            status_code=403,
+            detail="この操作を実行する権限がありません"
+        )
+    if last_event_id_header is not None:
+        if not last_event_id_header.isdigit():
+            raise HTTPException(
+                status_code=400,
+                detail="Last-Event-IDが不正です"
+            )
+        last_event_id = int(last_event_id_header)
+
+    try:
+        # 購読を先に開始し、以降のイベントがキューに届く状態で送り直し分を読む
+        subscription = await order_feed.subscribe()
+    except Exception as e:
+        logger.exception("Failed to start the order feed: %s", str(e))
+        raise HTTPException(
+            status_code=503,
+            detail="注文の配信を開始できません"
+        ) from e
+
+    try:
+        backlog: list[FeedEvent] = []
+        reset = False
+        # 購読後のイベントは、このIDより後のものが必ずキューに届く
+        delivered_id = order_feed.last_event_id or 0
+        if last_event_id is None:
+            last_event_id = delivered_id
+        else:
+            limit = settings.order_feed_backlog_limit
+            events = await order_event_crud.get_events_after(
+                db, last_event_id, limit + 1, up_to=delivered_id
+            )
+            if len(events) > limit:
+                reset = True
+                last_event_id = delivered_id
+            else:
+                backlog = [FeedEvent.from_model(event) for event in events]
+    except Exception as e:
+        order_feed.unsubscribe(subscription)
+        logger.exception("An error occurred while reading order events: %s", str(e))
+        raise HTTPException(
+            status_code=500,
+            detail="注文イベントの取得中にエラーが発生しました"
+        ) from e
+    finally:
+        # 配信中はプールの接続を使わない
+        await db.close()
+
+    return StreamingResponse(
+        order_feed.stream(subscription, last_event_id, backlog, reset=reset),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.post("/status:bulk", response_model=BulkOrderStatusResponse)
+async def bulk_update_order_status(
+    bulk_update: BulkOrderStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> BulkOrderStatusResponse:
+    """
+    複数の注文のステータスを一括更新（店舗管理者のみ）
+
+    遷移できる注文だけを1文のUPDATEで更新し、注文ごとの結果を返す。
+    存在しない注文（not_found）や遷移できない注文（invalid_transition）が
+    含まれていても、他の注文は更新される。ライブフィードへの通知は1回にまとめる。
+
+    Args:
+        bulk_update: 注文ID一覧と新しいステータス
+        db: データベースセッション
+        current_user: 現在のログインユーザー（認証必須）
+
+    Returns:
+        BulkOrderStatusResponse: 注文ごとの結果
+
+    Raises:
+        HTTPException:
+            - 401: 認証エラー
+            - 403: 権限エラー（管理者以外）
+            - 422: 注文ID一覧が空、または上限を超えている
+    """
+    if current_user.role != UserRole.STORE:
+        raise HTTPException(
+            status_code=403,
+            detail="この操作を実行する権限がありません"
+        )
+
+    try:
+        results = await order_crud.bulk_update_order_status(
+            db=db,
+            order_ids=bulk_update.order_ids,
+            status=bulk_update.status,
+        )
+    except Exception as e:
+        logger.exception("An error occurred while bulk updating order status: %s", str(e))
+        raise HTTPException(
+            status_code=500,
+            detail="注文ステータスの一括更新中にエラーが発生しました"
+        ) from e
+
+    return BulkOrderStatusResponse(
+        status=bulk_update.status,
+        updated=sum(
+            1 for result in results if result.result == BulkOrderStatusOutcome.UPDATED
+        ),
+        results=results,
+    )
+
+
+@router.get("/{order_id}", response_model=OrderResponse)
+async def get_order_detail(
+    order_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+) -> OrderResponse:
+    """
+    指定された注文の詳細を取得（店舗管理者のみ）
+
+    Args:
+        order_id: 注文ID
+        db: データベースセッション
+        current_user: 現在のログインユーザー（認証必須）
+
+    Returns:
+        OrderResponse: 注文の詳細情報
+
+    Raises:
+        HTTPException:
+            - 401: 認証エラー
+            - 403: 権限エラー（管理者以外）
+            - 404: 注文が見つからない
+    """
+    if current_user.role != UserRole.STORE:
+        raise HTTPException(
+            status_code=403,
+            detail="この操作を実行する権限がありません"
+        )
+
+    try:
+        order = await order_crud.get_order_by_id(db, order_id)
+        if not order:
+            raise HTTPException(
+                status_code=404,
+                detail="指定された注文が見つかりません"
+            )
+        return build_order_response(order)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(
+            "An error occurred while fetching order details: %s", str(e))
+        raise HTTPException(
+            status_code=500,
+            detail="注文詳細の取得中にエラーが発生しました"
+        ) from e
+
+
+@router.patch(
+    "/{order_id}", response_model=OrderStatusUpdateResponse | OrderResponse
+)
+async def update_order_status(
+    order_id: int,
+    status: OrderStatus,
+    include_details: bool = Query(False, description="更新後の注文詳細を返すかどうか"),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+) -> OrderStatusUpdateResponse | OrderResponse:
+    """
+    注文のステータスを更新（店舗管理者のみ）
+
+    1文のUPDATEで更新し、ステータスと更新日時を返す。
+    現在のステータスから遷移できない場合は409を返す（同じステータスの指定は何もしない）。
+    include_detailsを指定した場合のみ、注文詳細を読み込んで返す。
+
+    Args:
+        order_id: 注文ID
+        status: 新しい注文ステータス
+        include_details: 更新後の注文詳細を返すかどうか
+        db: データベースセッション
+        current_user: 現在のログインユーザー（認証必須）
+
+    Returns:
+        OrderStatusUpdateResponse | OrderResponse: 更新結果（include_details指定時は注文の詳細）
+
+    Raises:
+        HTTPException:
+            - 401: 認証エラー
+            - 403: 権限エラー（管理者以外）
+            - 404: 注文が見つからない
+            - 409: 現在のステータスから遷移できない
+    """
+    if current_user.role != UserRole.STORE:
+        raise HTTPException(
+            status_code=403,
+            detail="この操作を実行する権限がありません"
+        )
+
+    try:
+        # ステータスの更新（日次集計も同じトランザクションで更新される）
+        updated = await order_crud.update_order_status(db, order_id, status)
+        if not updated:
+            raise HTTPException(
+                status_code=404,
+                detail="指定された注文が見つかりません"
+            )
+
+        if include_details:
+            order = await order_crud.get_order_by_id(db, order_id)
+            if not order:
+                raise HTTPException(
+                    status_code=404,
+                    detail="指定された注文が見つかりません"
+                )
+            return build_order_response(order)
+
+        return updated
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e)
+        ) from e
+    except Exception as e:
+        logger.exception(
+            "An error occurred while updating order status: %s", str(e))
+        raise HTTPException(
+            status_code=500,
+            detail="注文ステータスの更新中にエラーが発生しました"
+        ) from e
+
+
+@router.put("/{order_id}/status", response_model=OrderStatusUpdateResponse)
+async def put_order_status(
+    order_id: int,
+    order_status: OrderStatus,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+) -> OrderStatusUpdateResponse:
+    """
+    注文のステータスを更新（店舗管理者のみ）
+
+    現在のステータスから遷移できない場合は409を返す（同じステータスの指定は何もしない）。
+
+    Args:
+        order_id: 注文ID
+        order_status: 新しい注文ステータス
+        db: データベースセッション
+        current_user: 現在のログインユーザー（認証必須）
+
+    Returns:
+        OrderStatusUpdateResponse: 更新後のステータスと更新日時
+
+    Raises:
+        HTTPException:
+            - 401: 認証エラー
+            - 403: 権限エラー（管理者以外）
+            - 404: 注文が見つからない
+            - 409: 現在のステータスから遷移できない
+    """
+    if current_user.role != UserRole.STORE:
+        raise HTTPException(
+            status_code=403,
+            detail="この操作を実行する権限がありません"
+        )
+
+    try:
+        updated = await order_crud.update_order_status(
+            db=db, order_id=order_id, status=order_status
+        )
+        if not updated:
+            raise HTTPException(
+                status_code=404,
+                detail="注文が見つかりません"
+            )
+
+        return updated
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e)
+        ) from e
+    except Exception as e:
+        logger.exception("Failed to update order status: %s", str(e))
+        raise HTTPException(
+            status_code=500,
+            detail="注文ステータスの更新中にエラーが発生しました"
+        ) from e
@@ -0,0 +1,55 @@
+"""
+管理者向けスロークエリログAPIエンドポイント
+しきい値を超えたSQL文（ワーカープロセスごとの直近の記録）を参照する
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.v1.dependencies.auth import get_current_user
+from app.core.slow_query_log import slow_query_log
+from app.db.models import UserRole
+from app.schemas.admin import SlowQueryLogResponse, SlowQueryResponse
+from app.schemas.user import UserPrincipal
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SlowQueryLogResponse)
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000, description="取得件数（新しい順）"),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> SlowQueryLogResponse:
+    """
+    スロークエリログを取得（店舗管理者のみ）
+
+    リクエストを処理したワーカープロセスの記録のみを返す。
+    パラメータの値は記録していないため、型名のみを返す。
+
+    Args:
+        limit: 取得件数
+        current_user: 現在のログインユーザー（認証必須）
+
+    Returns:
+        SlowQueryLogResponse: スロークエリログの設定と記録
+
+    Raises:
+        HTTPException:
+            - 401: 認証エラー
+            - 403: 権限エラー（管理者以外）
+    """
+    if current_user.role != UserRole.STORE:
+        raise HTTPException(
+            status_code=403,
+            detail="この操作を実行する権限がありません"
+        )
+
+    return SlowQueryLogResponse(
+        threshold_ms=slow_query_log.threshold_ms,
+        explain=slow_query_log.explain,
+        max_entries=slow_query_log.max_entries,
+        recorded=slow_query_log.recorded,
+        items=[
+            SlowQueryResponse.model_validate(entry)
+            for entry in slow_query_log.snapshot()[:limit]
+        ],
+    )
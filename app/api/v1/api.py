@@ -6,8 +6,9 @@ v1のエンドポイントをまとめる
 from fastapi import APIRouter
 
 from app.api.v1.admin import menus as admin_menus
+from app.api.v1.admin import orders as admin_orders
+from app.api.v1.admin import slow_queries as admin_slow_queries
 from app.api.v1.endpoints import auth, menus, orders
-from app.api.v1.endpoints import orders as admin_orders
 
 api_router = APIRouter()
 
@@ -28,6 +29,10 @@ api_router.include_router(
 api_router.include_router(
     admin_menus.router, prefix="/admin/menus", tags=["admin", "menus"])
 
+# 管理者向けスロークエリログのエンドポイント
+api_router.include_router(
+    admin_slow_queries.router, prefix="/admin/slow-queries", tags=["admin"])
+
 # 他のエンドポイントは各担当者が追加
 # api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 # api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -7,9 +7,9 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import verify_token
-from app.crud.auth import get_user_by_email
+from app.crud.auth import get_principal_by_email
 from app.db.database import get_db
-from app.db.models import User
+from app.schemas.user import UserPrincipal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
 
@@ -17,16 +17,19 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> UserPrincipal:
     """
     現在のユーザーを取得
 
+    解決済みのユーザー情報はTTL付きでキャッシュされ、
+    キャッシュヒット時はデータベースに問い合わせない
+
     Args:
         token: JWTトークン
         db: データベースセッション
 
     Returns:
-        User: 現在のユーザー
+        UserPrincipal: 現在のユーザー
 
     Raises:
         HTTPException: 401 - トークンが無効または期限切れ
@@ -46,7 +49,7 @@ async def get_current_user(
     if email is None:
         raise credentials_exception
 
-    user = await get_user_by_email(db, email)
+    user = await get_principal_by_email(db, email)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -5,10 +5,17 @@ API_SPECS.mdの仕様に基づく実装
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.menu import menu_crud
+from app.core.http_cache import (
+    REVALIDATE_PUBLIC,
+    etag_matches,
+    not_modified,
+    set_cache_headers,
+)
+from app.crud.menu_catalog import menu_catalog
+from app.crud.pagination import TotalMode, next_cursor
 from app.db.database import get_db
 from app.db.models import MenuCategory
 from app.schemas.menu import MenuListResponse, MenuResponse
@@ -18,37 +25,63 @@ router = APIRouter()
 
 @router.get("/", response_model=MenuListResponse)
 async def get_menus(
+    response: Response,
     limit: int = Query(50, ge=1, le=100, description="取得件数"),
     offset: int = Query(0, ge=0, description="開始位置"),
     category: Optional[MenuCategory] = Query(None, description="カテゴリフィルタ"),
+    cursor: Optional[str] = Query(None, description="前ページのnext_cursor（指定時はoffsetを使用しない）"),
+    total_mode: TotalMode = Query(TotalMode.EXACT, description="総件数の取得方法（exact / none）"),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
-) -> MenuListResponse:
+) -> MenuListResponse | Response:
     """
     メニュー一覧取得
     
     公開メニューの一覧を取得します。
     販売可能な商品のみ返却されます。
+    cursorを指定するとキーセット方式で次ページを取得します。
+    メニューカタログのキャッシュから返すため、通常はデータベースにアクセスしません。
+    ETagがIf-None-Matchと一致する場合は本文なしで304を返します。
+    推定件数（total_mode=estimated）は管理者向け一覧のみで指定できます。
     """
+    if total_mode == TotalMode.ESTIMATED:
+        raise HTTPException(
+            status_code=422,
+            detail="total_mode=estimatedは管理者向け一覧でのみ指定できます"
+        )
+
     try:
-        # データベースからメニューを取得
-        menus, total = await menu_crud.get_menus(
+        # 一覧より先にETagを取得する（一覧がETagより古くなることはない）
+        etag = await menu_catalog.get_etag(db)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, REVALIDATE_PUBLIC)
+        
+        # キャッシュ済みのカタログから販売可能なメニューを取得
+        page = await menu_catalog.get_menus(
             db=db,
             skip=offset,
             limit=limit,
             category=category,
-            available_only=True  # 公開メニューは販売可能商品のみ
+            cursor=cursor,
+            total_mode=total_mode
         )
         
-        # レスポンス形式に変換
-        menu_responses = [MenuResponse.model_validate(menu) for menu in menus]
-        
+        set_cache_headers(response, etag, REVALIDATE_PUBLIC)
         return MenuListResponse(
-            items=menu_responses,
-            total=total,
+            items=page.items,
+            total=page.total,
             limit=limit,
-            offset=offset
+            offset=0 if cursor else offset,
+            has_more=page.has_more,
+            total_estimated=page.total_estimated,
+            next_cursor=next_cursor(page.items, page.has_more)
         )
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -67,8 +100,8 @@ async def get_menu_detail(
     指定されたIDのメニュー詳細を取得します。
     """
     try:
-        # データベースからメニューを取得
-        menu = await menu_crud.get_menu_by_id(db=db, menu_id=menu_id)
+        # キャッシュ済みのカタログから取得（販売停止商品は含まれないため公開しない）
+        menu = await menu_catalog.get_menu(db=db, menu_id=menu_id)
         
         if not menu:
             raise HTTPException(
@@ -76,14 +109,7 @@ async def get_menu_detail(
                 detail="メニューが見つかりません"
             )
         
-        # 販売停止商品の場合は公開しない
-        if not menu.is_available:
-            raise HTTPException(
-                status_code=404,
-                detail="メニューが見つかりません"
-            )
-        
-        return MenuResponse.model_validate(menu)
+        return menu
         
     except HTTPException:
         # HTTPExceptionはそのまま再発生
@@ -4,207 +4,42 @@
 """
 
 import logging
-from typing import Any
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.dependencies.auth import get_current_user
-from app.crud.order import order_crud
+from app.core.http_cache import (
+    REVALIDATE_PRIVATE,
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from app.crud.order import TERMINAL_ORDER_STATUSES, build_order_response, order_crud
+from app.crud.pagination import TotalMode, next_cursor
 from app.db.database import get_db
-from app.db.models import Order, OrderDetail, OrderStatus, User, UserRole
+from app.db.models import OrderStatus
 from app.schemas.order import (
     OrderCreate,
     OrderListResponse,
     OrderResponse,
-    OrderSummaryResponse,
 )
+from app.schemas.user import UserPrincipal
 
 router = APIRouter(tags=["orders"])
 
 # ロガーの設定
 logger = logging.getLogger("uvicorn")
 
+# 終了状態の注文はブラウザにしばらくキャッシュさせる
+TERMINAL_ORDER_CACHE_CONTROL = "private, max-age=300"
 
-@router.get("/admin/orders/", tags=["admin"])
-async def get_orders(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    status: OrderStatus | None = Query(None, description="注文ステータスでフィルタ")
-) -> list[OrderSummaryResponse]:
-    """
-    全ての注文を取得（店舗管理者のみ）
-
-    Args:
-        db: データベースセッション
-        current_user: 現在のログインユーザー（認証必須）
-        status: 注文ステータスでフィルタ
-
-    Returns:
-        list[OrderSummaryResponse]: 全注文のリスト
-
-    Raises:
-        HTTPException: 
-            - 401: 認証エラー
-            - 403: 権限エラー（管理者以外）
-    """
-    if current_user.role != UserRole.STORE:
-        raise HTTPException(
-            status_code=403,
-            detail="この操作を実行する権限がありません"
-        )
-    try:
-        logger.info("Fetching all orders from database")
-        stmt = select(Order)
-        if status:
-            stmt = stmt.where(Order.status == status)
-        stmt = stmt.order_by(Order.created_at.desc())
-
-        result = await db.execute(stmt)
-        orders = result.scalars().all()
-        logger.info(f"Found {len(list(orders))} orders")
-
-        order_details = []
-        for order in orders:
-            # 注文詳細の取得
-            stmt = select(OrderDetail).where(OrderDetail.order_id == order.id)
-            result = await db.execute(stmt)
-            details = result.scalars().all()
-
-            # 注文情報の構築
-            order_info = {
-                "id": order.id,
-                "user_id": order.user_id,
-                "status": order.status,
-                "total_amount": order.total_amount,
-                "delivery_address": order.delivery_address,
-                "delivery_time": order.delivery_time,
-                "notes": order.notes,
-                "created_at": order.created_at,
-                "updated_at": order.updated_at,
-                "items": [{
-                    "menu_item_id": detail.menu_item_id,
-                    "quantity": detail.quantity,
-                    "price": detail.price
-                } for detail in details]
-            }
-            order_details.append(OrderSummaryResponse(**order_info))
-
-        return order_details
-    except Exception as e:
-        logger.exception("An error occurred while fetching orders: %s", str(e))
-        raise HTTPException(
-            status_code=500,
-            detail="注文の取得中にエラーが発生しました"
-        ) from e
-logger = logging.getLogger("uvicorn")
-
-
-@router.get("/admin/orders/{order_id}", tags=["admin"])
-async def get_order_detail(
-    order_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-) -> OrderResponse:
-    """
-    指定された注文の詳細を取得（店舗管理者のみ）
 
-    Args:
-        order_id: 注文ID
-        db: データベースセッション
-        current_user: 現在のログインユーザー（認証必須）
-
-    Returns:
-        OrderResponse: 注文の詳細情報
-
-    Raises:
-        HTTPException:
-            - 401: 認証エラー
-            - 403: 権限エラー（管理者以外）
-            - 404: 注文が見つからない
-    """
-    if current_user.role != UserRole.STORE:
-        raise HTTPException(
-            status_code=403,
-            detail="この操作を実行する権限がありません"
-        )
-
-    try:
-        order = await order_crud.get_order_by_id(db, order_id)
-        if not order:
-            raise HTTPException(
-                status_code=404,
-                detail="指定された注文が見つかりません"
-            )
-        return order
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.exception(
-            "An error occurred while fetching order details: %s", str(e))
-        raise HTTPException(
-            status_code=500,
-            detail="注文詳細の取得中にエラーが発生しました"
-        ) from e
-
-
-@router.patch("/admin/orders/{order_id}", tags=["admin"])
-async def update_order_status(
-    order_id: int,
-    status: OrderStatus,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-) -> OrderResponse:
-    """
-    注文のステータスを更新（店舗管理者のみ）
-
-    Args:
-        order_id: 注文ID
-        status: 新しい注文ステータス
-        db: データベースセッション
-        current_user: 現在のログインユーザー（認証必須）
-
-    Returns:
-        OrderResponse: 更新された注文の詳細
-
-    Raises:
-        HTTPException:
-            - 401: 認証エラー
-            - 403: 権限エラー（管理者以外）
-            - 404: 注文が見つからない
-    """
-    if current_user.role != UserRole.STORE:
-        raise HTTPException(
-            status_code=403,
-            detail="この操作を実行する権限がありません"
-        )
-
-    try:
-        # 注文の存在確認
-        order = await order_crud.get_order_by_id(db, order_id)
-        if not order:
-            raise HTTPException(
-                status_code=404,
-                detail="指定された注文が見つかりません"
-            )
-
-        # ステータスの更新
-        order.status = status
-        db.add(order)
-        await db.commit()
-        await db.refresh(order)
-
-        return order
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.exception(
-            "An error occurred while updating order status: %s", str(e))
-        raise HTTPException(
-            status_code=500,
-            detail="注文ステータスの更新中にエラーが発生しました"
-        ) from e
+def order_etag(order_id: int, status: OrderStatus, updated_at: datetime) -> str:
+    """注文詳細のETagを生成（ステータスと更新日時から計算）"""
+    return make_etag("order", order_id, status.value, updated_at.isoformat())
 
 
 @router.get("/health")
@@ -217,7 +52,7 @@ async def health_check():
 async def create_order(
     order_data: OrderCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """
     新規注文を作成
@@ -236,27 +71,13 @@ async def create_order(
             - 404: メニューが見つからない
     """
     try:
-        db_order = await order_crud.create_order(
+        # レスポンスは作成時のデータから構築されるため再取得は不要
+        return await order_crud.create_order(
             db=db,
             order_data=order_data,
             user_id=current_user.id
         )
 
-        # 注文詳細を含む完全な注文情報を再取得
-        order_with_details = await order_crud.get_order_by_id(
-            db=db,
-            order_id=db_order.id,
-            user_id=current_user.id
-        )
-
-        if not order_with_details:
-            raise HTTPException(
-                status_code=500,
-                detail="注文の作成に失敗しました"
-            )
-
-        return order_with_details
-
     except ValueError as e:
         logger.warning("Validation error: %s", str(e))
         raise HTTPException(
@@ -276,8 +97,10 @@ async def get_user_orders(
     page: int = Query(1, ge=1, description="ページ番号"),
     per_page: int = Query(10, ge=1, le=50, description="1ページあたりの件数"),
     order_status: OrderStatus | None = Query(None, description="注文ステータスでフィルタ"),
+    cursor: str | None = Query(None, description="前ページのnext_cursor（指定時はpageを使用しない）"),
+    total_mode: TotalMode = Query(TotalMode.EXACT, description="総件数の取得方法（exact / none）"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """
     ユーザーの注文履歴を取得
@@ -286,43 +109,52 @@ async def get_user_orders(
         page: ページ番号
         per_page: 1ページあたりの件数
         status: 注文ステータスフィルタ
+        cursor: 前ページのnext_cursor（キーセットページネーション）
+        total_mode: 総件数の取得方法（exact / none）
         db: データベースセッション
         current_user: 現在のユーザー
 
     Returns:
         OrderListResponse: 注文一覧
+
+    Raises:
+        HTTPException: 422 - total_mode=estimatedが指定された（管理者向け一覧のみ）
     """
+    if total_mode == TotalMode.ESTIMATED:
+        raise HTTPException(
+            status_code=422,
+            detail="total_mode=estimatedは管理者向け一覧でのみ指定できます"
+        )
+
     skip = (page - 1) * per_page
 
     try:
-        orders, total = await order_crud.get_user_orders(
+        # アイテム数は一覧と同じクエリで集計される
+        page_result = await order_crud.get_user_orders(
             db=db,
             user_id=current_user.id,
             skip=skip,
             limit=per_page,
-            status=order_status
+            status=order_status,
+            cursor=cursor,
+            total_mode=total_mode
         )
 
-        # OrderモデルをOrderSummaryResponseに変換
-        order_summaries = [
-            OrderSummaryResponse(
-                id=order.id,
-                status=order.status,
-                total_amount=order.total_amount,
-                delivery_address=order.delivery_address,
-                delivery_time=order.delivery_time,
-                created_at=order.created_at,
-                items_count=await db.scalar(select(func.count()).select_from(OrderDetail).where(OrderDetail.order_id == order.id)) or 0
-            ) for order in orders
-        ]
-
         return OrderListResponse(
-            items=order_summaries,
-            total=total,
-            offset=skip,
-            limit=per_page
+            items=page_result.items,
+            total=page_result.total,
+            offset=0 if cursor else skip,
+            limit=per_page,
+            has_more=page_result.has_more,
+            total_estimated=page_result.total_estimated,
+            next_cursor=next_cursor(page_result.items, page_result.has_more)
         )
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        ) from e
     except Exception as e:
         logger.exception("Failed to fetch user orders: %s", str(e))
         raise HTTPException(
@@ -334,14 +166,21 @@ async def get_user_orders(
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order_detail(
     order_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """
     注文詳細を取得
 
+    配達完了・キャンセル済みの注文にはETagとCache-Controlを付与し、
+    If-None-Matchが一致する場合は注文詳細を読み込まずに304を返す。
+
     Args:
         order_id: 注文ID
+        response: レスポンス（キャッシュヘッダー設定用）
+        if_none_match: If-None-Matchヘッダー
         db: データベースセッション
         current_user: 現在のユーザー
 
@@ -352,6 +191,17 @@ async def get_order_detail(
         HTTPException: 404 - 注文が見つからない
     """
     try:
+        if if_none_match:
+            version = await order_crud.get_order_version(
+                db=db,
+                order_id=order_id,
+                user_id=current_user.id
+            )
+            if version and version[0] in TERMINAL_ORDER_STATUSES:
+                etag = order_etag(order_id, *version)
+                if etag_matches(if_none_match, etag):
+                    return not_modified(etag, TERMINAL_ORDER_CACHE_CONTROL)
+
         order = await order_crud.get_order_by_id(
             db=db,
             order_id=order_id,
@@ -364,7 +214,16 @@ async def get_order_detail(
                 detail="注文が見つかりません"
             )
 
-        return order
+        if order.status in TERMINAL_ORDER_STATUSES:
+            set_cache_headers(
+                response,
+                order_etag(order.id, order.status, order.updated_at),
+                TERMINAL_ORDER_CACHE_CONTROL
+            )
+        else:
+            response.headers["Cache-Control"] = REVALIDATE_PRIVATE
+
+        return build_order_response(order)
 
     except HTTPException:
         raise
@@ -374,44 +233,3 @@ async def get_order_detail(
             status_code=500,
             detail="注文詳細の取得中にエラーが発生しました"
         ) from e
-
-
-# -----------------
-# 管理者向け注文管理API
-# -----------------
-# 管理者向け注文管理API
-# -----------------
-
-@router.put("/admin/orders/{order_id}/status", tags=["admin"])
-async def update_order_status(
-    order_id: int,
-    order_status: OrderStatus,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """注文のステータスを更新"""
-    if current_user.role != UserRole.STORE:
-        raise HTTPException(
-            status_code=403,
-            detail="この操作を実行する権限がありません"
-        )
-
-    try:
-        order = await order_crud.get_order_by_id(db=db, order_id=order_id)
-        if not order:
-            raise HTTPException(
-                status_code=404,
-                detail="注文が見つかりません"
-            )
-
-        order.status = order_status
-        await db.commit()
-        await db.refresh(order)
-
-        return {"message": "注文ステータスが正常に更新されました"}
-    except Exception as e:
-        logger.exception("Failed to update order status: %s", str(e))
-        raise HTTPException(
-            status_code=500,
-            detail="注文ステータスの更新中にエラーが発生しました"
-        ) from e
@@ -0,0 +1,101 @@
+"""
+インプロセスキャッシュ
+サイズ上限とTTLを持つLRUキャッシュ
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    サイズ上限付きのLRU + TTLキャッシュ
+
+    ワーカープロセス内でのみ共有される。max_sizeまたはttl_secondsが
+    0以下の場合はキャッシュを無効化し、常にミスとして扱う。
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """キャッシュが有効かどうか"""
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, key: K) -> V | None:
+        """
+        キャッシュから値を取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            V | None: キャッシュされた値（存在しないか期限切れの場合はNone）
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """
+        キャッシュに値を保存
+
+        Args:
+            key: キャッシュキー
+            value: 保存する値
+        """
+        if not self.enabled:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """指定したキーのエントリを削除"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """全エントリを削除"""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        キャッシュの統計情報を取得
+
+        Returns:
+            dict[str, Any]: エントリ数、ヒット数、ミス数、ヒット率など
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
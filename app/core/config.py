@@ -22,6 +22,21 @@ class Settings(BaseSettings):
         alias="DATABASE_URL"
     )
 
+    # コネクションプール設定（Webプロセス用。Alembic・スクリプトはNullPool）
+    db_pool_size: int = Field(default=5, ge=1, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, ge=0, alias="DB_MAX_OVERFLOW")
+    db_pool_recycle: int = Field(
+        default=1800,
+        alias="DB_POOL_RECYCLE",
+        description="接続を再作成するまでの秒数（-1で無効）"
+    )
+    db_pool_pre_ping: bool = Field(default=True, alias="DB_POOL_PRE_PING")
+    db_pool_timeout: float = Field(
+        default=10.0,
+        gt=0,
+        alias="DB_POOL_TIMEOUT",
+        description="プールから接続を取得する際の最大待ち時間（秒）"
+    )
 
     # セキュリティ設定
     secret_key: str = Field(
@@ -49,6 +64,96 @@ class Settings(BaseSettings):
     pwd_context_schemes: list[str] = Field(default=["bcrypt"])
     pwd_context_deprecated: list[str] = Field(default=["auto"])
     refresh_token_expire_days: int = Field(default=7)
+    password_hash_max_workers: int = Field(
+        default=4,
+        ge=1,
+        alias="PASSWORD_HASH_MAX_WORKERS",
+        description="bcryptのハッシュ化・検証を同時に実行するスレッド数"
+    )
+
+    # 認証ユーザー（プリンシパル）キャッシュ設定（0で無効）
+    principal_cache_ttl_seconds: float = Field(
+        default=60.0, ge=0, alias="PRINCIPAL_CACHE_TTL_SECONDS"
+    )
+    principal_cache_max_size: int = Field(
+        default=10000, ge=0, alias="PRINCIPAL_CACHE_MAX_SIZE"
+    )
+
+    # 公開メニューカタログキャッシュ設定（TTLを0で無効）
+    menu_catalog_ttl_seconds: float = Field(
+        default=30.0, ge=0, alias="MENU_CATALOG_TTL_SECONDS"
+    )
+    menu_catalog_max_stale_seconds: float = Field(
+        default=300.0,
+        ge=0,
+        alias="MENU_CATALOG_MAX_STALE_SECONDS",
+        description="TTL経過後、再読み込み中に古いカタログを返してよい秒数"
+    )
+
+    # 注文ライブフィード（SSE）設定
+    order_feed_heartbeat_seconds: float = Field(
+        default=15.0, gt=0, alias="ORDER_FEED_HEARTBEAT_SECONDS"
+    )
+    order_feed_poll_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        alias="ORDER_FEED_POLL_SECONDS",
+        description="NOTIFYを取りこぼした場合に備えてイベントを確認する間隔"
+    )
+    order_feed_backlog_limit: int = Field(
+        default=500, ge=1, alias="ORDER_FEED_BACKLOG_LIMIT"
+    )
+    order_feed_queue_size: int = Field(
+        default=1000, ge=1, alias="ORDER_FEED_QUEUE_SIZE"
+    )
+
+    # 注文アーカイブ設定（app.scripts.archive_ordersの既定値）
+    order_archive_after_days: int = Field(
+        default=30,
+        ge=1,
+        alias="ORDER_ARCHIVE_AFTER_DAYS",
+        description="配達完了・キャンセル済みの注文をアーカイブに移すまでの日数"
+    )
+    order_archive_batch_size: int = Field(
+        default=500, ge=1, alias="ORDER_ARCHIVE_BATCH_SIZE"
+    )
+
+    # リクエストごとのSQL文の上限（超えたら警告をログに出力）
+    query_budget: int = Field(
+        default=20,
+        ge=1,
+        alias="QUERY_BUDGET",
+        description="1リクエストで実行してよいSQL文の数"
+    )
+    query_repeat_threshold: int = Field(
+        default=5,
+        ge=2,
+        alias="QUERY_REPEAT_THRESHOLD",
+        description="同じSQL文がこの回数以上実行されたらN+1の疑いとして警告する"
+    )
+
+    # スロークエリログ設定（しきい値を0で無効）
+    slow_query_threshold_ms: float = Field(
+        default=200.0,
+        ge=0,
+        alias="SLOW_QUERY_THRESHOLD_MS",
+        description="この時間（ミリ秒）以上かかったSQL文を記録する"
+    )
+    slow_query_log_size: int = Field(
+        default=100, ge=1, alias="SLOW_QUERY_LOG_SIZE"
+    )
+    slow_query_explain: bool = Field(
+        default=False,
+        alias="SLOW_QUERY_EXPLAIN",
+        description="読み取りのSQL文のEXPLAIN (ANALYZE, BUFFERS) を別の接続で取得するかどうか"
+    )
+
+    # メトリクス設定（/metrics）
+    metrics_enabled: bool = Field(
+        default=True,
+        alias="METRICS_ENABLED",
+        description="リクエストのレイテンシ・処理中の数を記録するかどうか"
+    )
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,76 @@
+"""
+HTTPキャッシュ（条件付きGET）のユーティリティ
+ETagの生成とIf-None-Matchの判定、304レスポンスの作成
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+
+# 変更され得る一覧：キャッシュは保持してよいが、毎回ETagで再検証させる
+REVALIDATE_PUBLIC = "public, no-cache"
+REVALIDATE_PRIVATE = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """
+    構成要素から強いETagを生成
+
+    Args:
+        *parts: 表現の内容を決める値（バージョン・更新日時・件数など）
+
+    Returns:
+        str: ダブルクォートで囲まれたETag
+    """
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-MatchヘッダーがETagに一致するか判定（弱い比較）
+
+    Args:
+        if_none_match: リクエストのIf-None-Matchヘッダー
+        etag: 現在の表現のETag
+
+    Returns:
+        bool: 一致する場合はTrue（304を返してよい）
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """
+    304 Not Modifiedレスポンスを作成（本文はシリアライズしない）
+
+    Args:
+        etag: 現在の表現のETag
+        cache_control: Cache-Controlヘッダー
+
+    Returns:
+        Response: 304レスポンス
+    """
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    """
+    200レスポンスにETagとCache-Controlを設定
+
+    Args:
+        response: FastAPIが注入するレスポンス
+        etag: 表現のETag
+        cache_control: Cache-Controlヘッダー
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
@@ -0,0 +1,239 @@
+"""
+リクエストメトリクス
+ルート・ステータスごとのレイテンシのヒストグラムと処理中のリクエスト数を記録し、
+Prometheusのテキスト形式で出力する
+
+値はワーカープロセスごとに保持される（複数ワーカーの場合はワーカーごとに収集する）。
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Prometheusのテキスト形式（/metricsのContent-Type。charsetはレスポンスが付与する）
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# レイテンシのヒストグラムのバケット（秒）
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# APIのルートに一致しなかったリクエスト（静的ファイル・404）のルートラベル。
+# パスをそのままラベルにすると系列数が際限なく増えるため、まとめて記録する
+UNMATCHED_ROUTE = "other"
+
+
+def escape_label_value(value: str) -> str:
+    """ラベル値のエスケープ（バックスラッシュ・ダブルクォート・改行）"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    """ラベルを {name="value",...} の形式にする（ラベルがなければ空文字）"""
+    pairs = [f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    """サンプル値の表記（整数はそのまま、無限大は+Inf）"""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Histogram:
+    """ラベルの組み合わせごとのヒストグラム"""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...],
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        # ラベル値 -> [バケットごとの件数（+Infを含む、非累積）, 合計値]
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, label_values: tuple[str, ...], value: float) -> None:
+        """
+        値を記録
+
+        Args:
+            label_values: label_namesの順のラベル値
+            value: 記録する値
+        """
+        series = self._series.get(label_values)
+        if series is None:
+            series = ([0] * (len(self.buckets) + 1), [0.0])
+            self._series[label_values] = series
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> list[str]:
+        """Prometheusのテキスト形式の行（バケットは累積件数）"""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        bounds = [format_value(bound) for bound in (*self.buckets, float("inf"))]
+        for label_values, (counts, total) in sorted(self._series.items()):
+            labels = format_labels(self.label_names, label_values)
+            # バケットの行は系列のラベルにleを加える
+            prefix = f"{self.name}_bucket{labels[:-1]}," if labels else f"{self.name}_bucket{{"
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(f'{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{labels} {format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """ラベルの組み合わせごとの現在値"""
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...]) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, label_values: tuple[str, ...], amount: float = 1) -> None:
+        """値を増やす"""
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, label_values: tuple[str, ...], amount: float = 1) -> None:
+        """値を減らす"""
+        self.inc(label_values, -amount)
+
+    def value(self, label_values: tuple[str, ...]) -> float:
+        """現在値（記録がなければ0）"""
+        return self._values.get(label_values, 0)
+
+    def render(self) -> list[str]:
+        """Prometheusのテキスト形式の行"""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} gauge",
+        ]
+        for label_values, value in sorted(self._values.items()):
+            labels = format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}{labels} {format_value(value)}")
+        return lines
+
+
+class RequestMetrics:
+    """HTTPリクエストのメトリクス（MetricsMiddlewareが記録する）"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.latency = Histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route template and status code.",
+            ("method", "route", "status"),
+            buckets,
+        )
+        # ルートはルーティング後に決まるため、処理中の数はメソッドごとに数える
+        self.in_flight = Gauge(
+            "http_requests_in_flight",
+            "HTTP requests currently being processed (including open streams).",
+            ("method",),
+        )
+
+    def render(self) -> str:
+        """Prometheusのテキスト形式"""
+        return "\n".join([*self.latency.render(), *self.in_flight.render()]) + "\n"
+
+
+# メトリクス名, 種類, 説明, get_pool_statsのキー
+POOL_METRICS = (
+    ("db_pool_size", "gauge", "Configured connection pool size.", "size"),
+    ("db_pool_max_overflow", "gauge", "Connections allowed beyond the pool size.", "max_overflow"),
+    ("db_pool_checked_out", "gauge", "Connections currently checked out.", "checked_out"),
+    ("db_pool_checked_in", "gauge", "Idle connections in the pool.", "checked_in"),
+    ("db_pool_overflow", "gauge", "Current overflow (negative while the pool is not full).", "overflow"),
+    ("db_pool_checkouts_total", "counter", "Connection checkouts.", "checkouts"),
+    ("db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection.", "timeouts"),
+    ("db_pool_wait_seconds_total", "counter", "Total time spent waiting for a connection.", "total_wait_seconds"),
+    ("db_pool_max_wait_seconds", "gauge", "Longest wait for a connection.", "max_wait_seconds"),
+    ("db_pool_connects_total", "counter", "New connections opened by the pool.", "connects"),
+    ("db_pool_connect_seconds_total", "counter", "Total time spent opening new connections.", "total_connect_seconds"),
+)
+
+
+def render_pool_metrics(stats: Mapping[str, Any]) -> str:
+    """
+    コネクションプールの統計情報をPrometheusのテキスト形式にする
+
+    Args:
+        stats: get_pool_stats()の戻り値（統計のないプールの場合は何も出力しない）
+
+    Returns:
+        str: Prometheusのテキスト形式
+    """
+    lines = []
+    for name, kind, description, key in POOL_METRICS:
+        if key not in stats:
+            continue
+        lines += [
+            f"# HELP {name} {description}",
+            f"# TYPE {name} {kind}",
+            f"{name} {format_value(stats[key])}",
+        ]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class MetricsMiddleware:
+    """
+    リクエストのレイテンシと処理中の数を記録するASGIミドルウェア
+
+    ルートはパスではなくルートのテンプレート（例: /api/v1/orders/{order_id}）で記録する。
+    レイテンシはレスポンスの本文を送り終えるまで（SSEでは接続が閉じるまで）の時間。
+    例外で終了したリクエストはステータス500として記録する。
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = (scope["method"],)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = self.metrics.in_flight
+        in_flight.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec(method)
+            # FastAPIのルーターが一致したルートをscopeに設定する
+            route = scope.get("route")
+            self.metrics.latency.observe(
+                (method[0], getattr(route, "path", UNMATCHED_ROUTE), str(status_code)),
+                elapsed,
+            )
+
+
+# ワーカープロセス内で共有するメトリクス
+request_metrics = RequestMetrics()
@@ -0,0 +1,112 @@
+"""
+リクエストごとのSQL文の計測
+リクエスト単位でSQL文の数・DBでの所要時間を計測し、上限を超えたリクエストや
+同じSQL文の繰り返し（N+1の疑い）を警告としてログに出力する
+"""
+
+import logging
+import re
+from contextvars import ContextVar
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.query_stats import QueryStats, track_queries
+
+logger = logging.getLogger(__name__)
+
+# ログに出力するSQL文の最大文字数
+LOGGED_STATEMENT_LENGTH = 200
+
+_WHITESPACE = re.compile(r"\s+")
+
+# 処理中のリクエストのASGI scope（ルーティング後はscope["route"]でルートがわかる）
+current_request_scope: ContextVar[Scope | None] = ContextVar(
+    "current_request_scope", default=None
+)
+
+
+def endpoint_label(scope: Scope) -> str:
+    """ログ用のリクエストの表記（メソッドとルートのテンプレート、ルーティング前はパス）"""
+    route = scope.get("route")
+    return f'{scope["method"]} {getattr(route, "path", scope["path"])}'
+
+
+def summarize_statement(statement: str) -> str:
+    """ログ用にSQL文の空白をまとめ、長い場合は切り詰める"""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    if len(statement) > LOGGED_STATEMENT_LENGTH:
+        return statement[:LOGGED_STATEMENT_LENGTH] + "..."
+    return statement
+
+
+def server_timing(stats: QueryStats) -> str:
+    """Server-Timingヘッダーの値（DBでの所要時間と実行回数）"""
+    return f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+
+
+class QueryBudgetMiddleware:
+    """
+    リクエストごとにSQL文を数えるASGIミドルウェア
+
+    - 実行回数がbudgetを超えたリクエストを警告する
+    - 同じSQL文がrepeat_threshold回以上実行されたリクエストをN+1の疑いとして警告する
+    - expose_headersがTrueの場合（デバッグモード）、X-DB-Queries・Server-Timingヘッダーを付与する
+      （ヘッダーの値はレスポンスの開始時点まで、警告はレスポンスの終了時点までの集計）
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        budget: int,
+        repeat_threshold: int,
+        expose_headers: bool = False,
+    ) -> None:
+        self.app = app
+        self.budget = budget
+        self.repeat_threshold = repeat_threshold
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_request_scope.set(scope)
+        with track_queries() as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if self.expose_headers and message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-DB-Queries", str(stats.count))
+                    headers.append("Server-Timing", server_timing(stats))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                current_request_scope.reset(token)
+                self.check(scope, stats)
+
+    def check(self, scope: Scope, stats: QueryStats) -> None:
+        """上限の超過・同じSQL文の繰り返しを警告する"""
+        if not stats.count:
+            return
+        endpoint = endpoint_label(scope)
+        statement, repeated = stats.most_repeated() or ("", 0)
+
+        if stats.count > self.budget:
+            logger.warning(
+                "%s ran %d SQL statements (budget %d, %.1f ms in DB)",
+                endpoint,
+                stats.count,
+                self.budget,
+                stats.seconds * 1000,
+            )
+        if repeated >= self.repeat_threshold:
+            logger.warning(
+                "%s ran the same SQL statement %d times (possible N+1): %s",
+                endpoint,
+                repeated,
+                summarize_statement(statement),
+            )
@@ -3,8 +3,11 @@
 パスワードハッシュ化、JWT認証など
 """
 
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
 
 import bcrypt
 from jose import JWTError, jwt
@@ -12,6 +15,8 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 
+T = TypeVar("T")
+
 
 def get_password_hash(password: str) -> str:
     """パスワードをハッシュ化"""
@@ -36,6 +41,111 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password, hashed_password)
 
 
+class PasswordHashExecutor:
+    """
+    パスワードハッシュ処理用のスレッドプール
+
+    bcryptはGILを解放するため、スレッドプールで実行することで
+    イベントループをブロックせずにハッシュ化・検証を行える。
+    同時実行数はmax_workersで制限し、待ち行列の長さを記録する。
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.max_queue_depth = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash",
+            )
+        return self._executor
+
+    def _call(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def _on_done(self, future: "Future[Any]") -> None:
+        # 実行前にキャンセルされた場合は待ち行列から外す
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        関数をスレッドプールで実行し、結果を待機
+
+        Args:
+            func: 実行する関数
+            *args: 関数の引数
+
+        Returns:
+            T: 関数の戻り値
+        """
+        with self._lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+
+        future = self._get_executor().submit(self._call, func, *args)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, int]:
+        """
+        スレッドプールの統計情報を取得
+
+        Returns:
+            dict[str, int]: 同時実行上限、待ち行列の長さ、実行中・完了件数
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "max_queue_depth": self.max_queue_depth,
+                "running": self.running,
+                "completed": self.completed,
+            }
+
+
+password_hash_executor = PasswordHashExecutor(
+    max_workers=settings.password_hash_max_workers
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """パスワードをハッシュ化（イベントループをブロックしない）"""
+    return await password_hash_executor.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    平文パスワードとハッシュ化パスワードを比較（イベントループをブロックしない）
+
+    Args:
+        plain_password: 平文パスワード
+        hashed_password: ハッシュ化パスワード
+
+    Returns:
+        bool: 一致する場合True
+    """
+    return await password_hash_executor.run(
+        verify_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     JWTアクセストークンを生成
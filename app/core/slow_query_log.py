@@ -0,0 +1,233 @@
+"""
+スロークエリログ
+実行時間がしきい値を超えたSQL文を、パラメータの値を伏せて呼び出し元のルートとともに
+ログに出力し、件数上限付きのリングバッファに保持する（管理者用APIで参照する）
+
+有効にした場合は、リクエストとは別のタスク・接続で EXPLAIN (ANALYZE, BUFFERS) を取得する。
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.query_budget import current_request_scope, endpoint_label, summarize_statement
+
+logger = logging.getLogger(__name__)
+
+# EXPLAIN ANALYZEは対象のSQL文を再度実行するため、所要時間の上限を設ける
+EXPLAIN_STATEMENT_TIMEOUT_MS = 5000
+
+# EXPLAIN ANALYZEで再実行してよいのは読み取りのみのSQL文
+_READ_ONLY_STATEMENT = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_WRITE_OR_LOCK = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|FOR\s+UPDATE|FOR\s+SHARE)\b", re.IGNORECASE)
+
+
+@dataclass
+class SlowQuery:
+    """しきい値を超えたSQL文の記録"""
+
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    # パラメータの値は記録せず、型名のみを残す
+    parameters: list[str]
+    # 呼び出し元のリクエスト（メソッドとルートのテンプレート。リクエスト外ではNone）
+    endpoint: str | None
+    # EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) の結果（取得しない・取得前はNone）
+    plan: Any | None = None
+    plan_error: str | None = None
+
+
+def redact_parameters(parameters: Any, executemany: bool) -> list[str]:
+    """
+    パラメータの値を型名に置き換える
+
+    Args:
+        parameters: DBAPIに渡したパラメータ（タプル・辞書、executemanyの場合はその一覧）
+        executemany: 複数行の実行かどうか
+
+    Returns:
+        list[str]: パラメータの型名（executemanyの場合は先頭行の型名と行数）
+    """
+    rows = list(parameters or ()) if executemany else [parameters]
+    first = rows[0] if rows else None
+    if first is None:
+        values: list[Any] = []
+    elif isinstance(first, dict):
+        values = list(first.values())
+    else:
+        values = list(first)
+    redacted = [type(value).__name__ for value in values]
+    if executemany:
+        redacted.append(f"x{len(rows)} rows")
+    return redacted
+
+
+def is_explainable(statement: str) -> bool:
+    """EXPLAIN ANALYZEで再実行してよい（データを変更・ロックしない）SQL文かどうか"""
+    return bool(_READ_ONLY_STATEMENT.match(statement)) and not _WRITE_OR_LOCK.search(statement)
+
+
+class SlowQueryLog:
+    """
+    スロークエリのリングバッファ
+
+    ワーカープロセスごとに保持され、max_entriesを超えると古い記録から破棄する。
+    threshold_msが0以下の場合は記録しない。
+    """
+
+    def __init__(self, threshold_ms: float, max_entries: int, explain: bool) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.entries: deque[SlowQuery] = deque(maxlen=max_entries)
+        # これまでに記録した件数（破棄した分を含む）
+        self.recorded = 0
+        self._explain_engine: AsyncEngine | None = None
+        self._explain_running = False
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """スロークエリを記録するかどうか"""
+        return self.threshold_ms > 0
+
+    @property
+    def max_entries(self) -> int:
+        """保持する記録の上限"""
+        return self.entries.maxlen or 0
+
+    def instrument(self, engine: AsyncEngine, explain_engine: AsyncEngine | None = None) -> None:
+        """
+        エンジンにスロークエリの計測用のイベントを登録（登録済みの場合は何もしない）
+
+        Args:
+            engine: 計測対象のエンジン
+            explain_engine: EXPLAINに使うエンジン（計測対象とは別の接続で実行する）
+        """
+        self._explain_engine = explain_engine
+        sync_engine = engine.sync_engine
+        for name, listener in (
+            ("before_cursor_execute", self._before_cursor_execute),
+            ("after_cursor_execute", self._after_cursor_execute),
+        ):
+            if not event.contains(sync_engine, name, listener):
+                event.listen(sync_engine, name, listener)
+
+    def _before_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        if self.enabled:
+            context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        entry = self.record(statement, parameters, executemany, duration_ms)
+        if not self.explain or conn.dialect.name != "postgresql":
+            return
+        if executemany or not is_explainable(statement):
+            entry.plan_error = "EXPLAIN ANALYZE is only captured for read-only statements"
+            return
+        self._schedule_explain(entry, parameters)
+
+    def record(
+        self, statement: str, parameters: Any, executemany: bool, duration_ms: float
+    ) -> SlowQuery:
+        """
+        スロークエリを記録してログに出力
+
+        Args:
+            statement: 実行したSQL文
+            parameters: DBAPIに渡したパラメータ（値は記録しない）
+            executemany: 複数行の実行かどうか
+            duration_ms: 実行時間（ミリ秒）
+
+        Returns:
+            SlowQuery: 記録した内容
+        """
+        scope = current_request_scope.get()
+        entry = SlowQuery(
+            recorded_at=datetime.now(timezone.utc),
+            duration_ms=duration_ms,
+            statement=statement,
+            parameters=redact_parameters(parameters, executemany),
+            endpoint=endpoint_label(scope) if scope is not None else None,
+        )
+        self.entries.append(entry)
+        self.recorded += 1
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s params=%s",
+            duration_ms,
+            entry.endpoint or "background",
+            summarize_statement(statement),
+            entry.parameters,
+        )
+        return entry
+
+    def _schedule_explain(self, entry: SlowQuery, parameters: Any) -> None:
+        """リクエストを待たせないよう、別のタスクでEXPLAINを取得する（同時に1件まで）"""
+        if self._explain_engine is None:
+            return
+        if self._explain_running:
+            entry.plan_error = "Skipped: another EXPLAIN was in progress"
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._explain_running = True
+        task = loop.create_task(self._capture_plan(entry, parameters))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _capture_plan(self, entry: SlowQuery, parameters: Any) -> None:
+        """EXPLAIN (ANALYZE, BUFFERS) を取得して記録に追加（結果は常にロールバック）"""
+        assert self._explain_engine is not None
+        try:
+            async with self._explain_engine.connect() as conn:
+                await conn.execute(
+                    text(f"SET LOCAL statement_timeout = {EXPLAIN_STATEMENT_TIMEOUT_MS}")
+                )
+                result = await conn.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + entry.statement,
+                    parameters,
+                )
+                entry.plan = result.scalar_one()
+                await conn.rollback()
+        except Exception as e:
+            entry.plan_error = f"{type(e).__name__}: {e}"
+            logger.info("Could not capture EXPLAIN for a slow query: %s", entry.plan_error)
+        finally:
+            self._explain_running = False
+
+    def snapshot(self) -> list[SlowQuery]:
+        """保持している記録（新しい順）"""
+        return list(reversed(self.entries))
+
+    def clear(self) -> None:
+        """記録を全て破棄"""
+        self.entries.clear()
+
+
+# ワーカープロセス内で共有するスロークエリログ
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_threshold_ms,
+    max_entries=settings.slow_query_log_size,
+    explain=settings.slow_query_explain,
+)
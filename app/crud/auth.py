@@ -1,9 +1,23 @@
-from sqlalchemy import select
+from typing import Any
+
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash, verify_password
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import get_password_hash_async, verify_password_async
 from app.db.models import User
-from app.schemas.user import UserCreate
+from app.schemas.user import UserCreate, UserPrincipal
+
+# 認証済みユーザーのキャッシュ（キーはトークンのsub = メールアドレス）
+principal_cache: TTLCache[str, UserPrincipal] = TTLCache(
+    max_size=settings.principal_cache_max_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
+
+# コミット後にキャッシュを破棄するメールアドレス（Session.infoのキー）
+PENDING_INVALIDATIONS_KEY = "principal_invalidations"
 
 
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
@@ -12,9 +26,79 @@ async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     return result.scalar_one_or_none()
 
 
+async def get_principal_by_email(db: AsyncSession, email: str) -> UserPrincipal | None:
+    """
+    メールアドレスで認証済みユーザー情報を取得（キャッシュ優先）
+
+    キャッシュにない場合はget_user_by_emailでデータベースから取得する。
+    存在しないユーザーはキャッシュしない。
+    """
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+
+    user = await get_user_by_email(db, email)
+    if user is None:
+        return None
+
+    principal = UserPrincipal.model_validate(user)
+    principal_cache.set(email, principal)
+    return principal
+
+
+def invalidate_principal(email: str) -> None:
+    """ユーザーのロール変更・無効化時などにキャッシュを破棄"""
+    principal_cache.invalidate(email)
+
+
+def _invalidate_now_and_after_commit(target: User, email: str) -> None:
+    """
+    キャッシュを直ちに破棄し、所属するセッションのコミット後にもう一度破棄する
+
+    変更がコミットされるまでの間に他のリクエストが変更前の行を読んで
+    キャッシュし直す場合があるため、コミット後の破棄で古い値が残らないようにする。
+    """
+    invalidate_principal(email)
+    session = inspect(target).session
+    if session is not None:
+        session.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).add(email)
+
+
+@event.listens_for(User.role, "set")
+@event.listens_for(User.is_active, "set")
+def _invalidate_on_change(target: User, value: Any, oldvalue: Any, initiator: Any) -> None:
+    """ORM経由でロール・有効フラグが変更された場合にキャッシュを破棄"""
+    # 期限切れ属性の遅延ロードを避けるため、ロード済みの値のみ参照する
+    email = inspect(target).dict.get("email")
+    if email is not None:
+        _invalidate_now_and_after_commit(target, email)
+
+
+@event.listens_for(User.email, "set")
+def _invalidate_on_email_change(
+    target: User, value: Any, oldvalue: Any, initiator: Any
+) -> None:
+    """メールアドレス変更時に旧アドレスのキャッシュを破棄"""
+    if isinstance(oldvalue, str):
+        _invalidate_now_and_after_commit(target, oldvalue)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    """コミットした変更の対象ユーザーのキャッシュを破棄"""
+    for email in session.info.pop(PENDING_INVALIDATIONS_KEY, ()):
+        invalidate_principal(email)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    """ロールバックした変更はキャッシュに影響しないため、破棄の予定を取り消す"""
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+
+
 async def create_user(db: AsyncSession, user: UserCreate) -> User:
     """新規ユーザーを作成"""
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -30,6 +114,6 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> User
     user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
@@ -3,11 +3,14 @@
 SQLAlchemy 2.0+ asyncio対応
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, Optional
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import delete, desc, func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.pagination import Page, TotalMode, keyset_filter, paginate
 from app.db.models import Menu, MenuCategory
 from app.schemas.menu import MenuCreate, MenuUpdate
 
@@ -21,8 +24,10 @@ class MenuCRUD:
         skip: int = 0,
         limit: int = 50,
         category: Optional[MenuCategory] = None,
-        available_only: bool = True
-    ) -> tuple[List[Menu], int]:
+        available_only: bool = True,
+        cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.EXACT
+    ) -> Page[Menu]:
         """
         メニュー一覧を取得
         
@@ -32,9 +37,14 @@ class MenuCRUD:
             limit: 取得件数
             category: カテゴリフィルタ
             available_only: 販売可能商品のみ取得するかどうか
+            cursor: 前ページの最後を示すカーソル（指定時はskipを使わない）
+            total_mode: 総件数の取得方法
             
         Returns:
-            tuple[List[Menu], int]: (メニュー一覧, 総件数)
+            Page[Menu]: メニュー一覧と総件数
+            
+        Raises:
+            ValueError: カーソルが不正な場合
         """
         # ベースクエリを構築
         query = select(Menu)
@@ -49,18 +59,45 @@ class MenuCRUD:
             query = query.where(Menu.category == category)
             count_query = count_query.where(Menu.category == category)
         
-        # 並び順とページネーション
-        query = query.order_by(desc(Menu.created_at))
-        query = query.offset(skip).limit(limit)
+        # 並び順とページネーション（カーソル指定時はキーセット方式）
+        query = query.order_by(desc(Menu.created_at), desc(Menu.id))
+        cursor_filter = keyset_filter(Menu.created_at, Menu.id, cursor) if cursor else None
+        
+        return await paginate(
+            db,
+            query,
+            count_query,
+            skip=skip,
+            limit=limit,
+            cursor_filter=cursor_filter,
+            total_mode=total_mode,
+            scalars=True,
+        )
+    
+    @staticmethod
+    async def get_menus_version(
+        db: AsyncSession,
+        available_only: bool = False
+    ) -> tuple[Optional[datetime], int]:
+        """
+        メニュー一覧のバージョン（最終更新日時と件数）を取得
         
-        # 実行
-        result = await db.execute(query)
-        menus = result.scalars().all()
+        一覧本体を読み込まずにETagを計算するための軽量なクエリ
         
-        count_result = await db.execute(count_query)
-        total = count_result.scalar() or 0
+        Args:
+            db: データベースセッション
+            available_only: 販売可能商品のみを対象とするかどうか
+            
+        Returns:
+            tuple[Optional[datetime], int]: (最大のupdated_at, 件数)
+        """
+        query = select(func.max(Menu.updated_at), func.count(Menu.id))
+        if available_only:
+            query = query.where(Menu.is_available == True)
         
-        return list(menus), total
+        result = await db.execute(query)
+        max_updated_at, count = result.one()
+        return max_updated_at, count
     
     @staticmethod
     async def get_menu_by_id(db: AsyncSession, menu_id: int) -> Optional[Menu]:
@@ -78,6 +115,29 @@ class MenuCRUD:
         result = await db.execute(query)
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_menus_by_ids(
+        db: AsyncSession,
+        menu_ids: Iterable[int]
+    ) -> dict[int, Menu]:
+        """
+        複数のIDでメニューをまとめて取得（1クエリ）
+        
+        Args:
+            db: データベースセッション
+            menu_ids: メニューIDの一覧（重複可）
+            
+        Returns:
+            dict[int, Menu]: メニューIDをキーとした辞書（存在しないIDは含まない）
+        """
+        unique_ids = set(menu_ids)
+        if not unique_ids:
+            return {}
+        
+        query = select(Menu).where(Menu.id.in_(unique_ids))
+        result = await db.execute(query)
+        return {menu.id: menu for menu in result.scalars().all()}
+    
     @staticmethod
     async def create_menu(db: AsyncSession, menu_data: MenuCreate) -> Menu:
         """
@@ -144,24 +204,33 @@ class MenuCRUD:
         """
         メニューを削除
         
+        メニューを読み込まず1文のDELETEで削除する。注文履歴（order_details）は
+        外部キーのON DELETE RESTRICTで保護されるため、注文されたことのあるメニューは
+        削除できない（販売停止にする）。
+        
         Args:
             db: データベースセッション
             menu_id: メニューID
             
         Returns:
             bool: 削除成功かどうか
+            
+        Raises:
+            ValueError: 注文履歴があるメニューの場合
         """
-        query = select(Menu).where(Menu.id == menu_id)
-        result = await db.execute(query)
-        db_menu = result.scalar_one_or_none()
-        
-        if not db_menu:
-            return False
-        
-        await db.delete(db_menu)
-        await db.commit()
-        
-        return True
+        try:
+            result = await db.execute(
+                delete(Menu).where(Menu.id == menu_id).returning(Menu.id)
+            )
+            deleted = result.scalar_one_or_none()
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            raise ValueError(
+                "注文履歴があるメニューは削除できません。販売停止にしてください"
+            ) from e
+        
+        return deleted is not None
 
 
 # CRUD操作のインスタンス
@@ -0,0 +1,343 @@
+"""
+公開メニューカタログのインプロセスキャッシュ
+販売可能なメニューのスナップショットをメモリに保持し、公開メニューAPIをデータベースなしで返す
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncContextManager, Awaitable, Callable, Optional
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.http_cache import make_etag
+from app.crud.menu import menu_crud
+from app.crud.pagination import Page, TotalMode, decode_cursor
+from app.db.database import AsyncSessionLocal
+from app.db.models import Menu, MenuCategory
+from app.schemas.menu import MenuResponse
+
+logger = logging.getLogger(__name__)
+
+CatalogLoader = Callable[[AsyncSession], Awaitable[list[MenuResponse]]]
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+async def load_available_menus(db: AsyncSession) -> list[MenuResponse]:
+    """
+    販売可能なメニューを一覧の並び順（作成日時・IDの降順）で取得
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        list[MenuResponse]: 販売可能なメニュー一覧
+    """
+    query = (
+        select(Menu)
+        .where(Menu.is_available == True)
+        .order_by(desc(Menu.created_at), desc(Menu.id))
+    )
+    result = await db.execute(query)
+    return [MenuResponse.model_validate(menu) for menu in result.scalars().all()]
+
+
+def catalog_etag(max_updated_at: Optional[datetime], count: int) -> str:
+    """
+    メニュー一覧のETagを生成（最終更新日時と件数から計算）
+
+    Args:
+        max_updated_at: 対象メニューの最大のupdated_at
+        count: 対象メニューの件数
+
+    Returns:
+        str: ETag
+    """
+    return make_etag(
+        "menus", max_updated_at.isoformat() if max_updated_at else None, count
+    )
+
+
+@dataclass(frozen=True)
+class MenuCatalogSnapshot:
+    """ある時点の公開メニューカタログ（読み取り専用）"""
+
+    version: int
+    loaded_at: float
+    menus: tuple[MenuResponse, ...]
+    etag: str
+    by_id: dict[int, MenuResponse] = field(repr=False)
+    by_category: dict[MenuCategory, tuple[MenuResponse, ...]] = field(repr=False)
+
+    @classmethod
+    def build(cls, version: int, menus: list[MenuResponse]) -> "MenuCatalogSnapshot":
+        """カテゴリ別・ID別の索引を作成してスナップショットを構築"""
+        by_category: dict[MenuCategory, list[MenuResponse]] = {}
+        for menu in menus:
+            by_category.setdefault(menu.category, []).append(menu)
+        return cls(
+            version=version,
+            loaded_at=time.monotonic(),
+            menus=tuple(menus),
+            etag=catalog_etag(
+                max((menu.updated_at for menu in menus), default=None), len(menus)
+            ),
+            by_id={menu.id: menu for menu in menus},
+            by_category={
+                category: tuple(items) for category, items in by_category.items()
+            },
+        )
+
+    @property
+    def age_seconds(self) -> float:
+        """スナップショットを読み込んでからの経過秒数"""
+        return time.monotonic() - self.loaded_at
+
+
+class MenuCatalog:
+    """
+    公開メニューカタログのキャッシュ
+
+    TTL内はスナップショットをそのまま返し、TTL経過後はmax_stale_seconds以内であれば
+    古いスナップショットを返しつつバックグラウンドで再読み込みする（stale-while-revalidate）。
+    管理者によるメニューの作成・更新・削除時はinvalidate()でスナップショットを破棄し、
+    破棄前に開始した読み込み結果は採用しない。
+    キャッシュはワーカープロセスごとに保持されるため、他プロセスでの変更はTTLで反映される。
+    ttl_secondsが0以下の場合は無効化し、常にデータベースから取得する。
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_stale_seconds: float,
+        loader: CatalogLoader = load_available_menus,
+        session_factory: SessionFactory = AsyncSessionLocal,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self._loader = loader
+        self._session_factory = session_factory
+        self._snapshot: Optional[MenuCatalogSnapshot] = None
+        self._generation = 0
+        self._version = 0
+        self._load_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task[None]] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """キャッシュが有効かどうか"""
+        return self.ttl_seconds > 0
+
+    @property
+    def version(self) -> int:
+        """現在のスナップショットのバージョン（未読み込みの場合は0）"""
+        return self._snapshot.version if self._snapshot else 0
+
+    def invalidate(self) -> None:
+        """スナップショットを破棄（メニュー変更のコミット後に呼び出す）"""
+        self._generation += 1
+        self._snapshot = None
+        self.invalidations += 1
+
+    async def get_snapshot(self, db: AsyncSession) -> MenuCatalogSnapshot:
+        """
+        現在のスナップショットを取得
+
+        スナップショットがない場合や古すぎる場合は、渡されたセッションで読み込む。
+
+        Args:
+            db: データベースセッション（同期読み込み時に使用）
+
+        Returns:
+            MenuCatalogSnapshot: 公開メニューカタログ
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            age = snapshot.age_seconds
+            if age < self.ttl_seconds:
+                self.hits += 1
+                return snapshot
+            if age < self.ttl_seconds + self.max_stale_seconds:
+                self.stale_hits += 1
+                self._schedule_refresh()
+                return snapshot
+
+        self.misses += 1
+        async with self._load_lock:
+            # 待機中に他のリクエストが読み込んだ場合はそれを使う
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.age_seconds < self.ttl_seconds:
+                return snapshot
+            return await self._load(db)
+
+    async def _load(self, db: AsyncSession) -> MenuCatalogSnapshot:
+        """データベースから読み込み、破棄されていなければスナップショットを差し替える"""
+        generation = self._generation
+        menus = await self._loader(db)
+        self._version += 1
+        snapshot = MenuCatalogSnapshot.build(self._version, menus)
+        if generation == self._generation:
+            self._snapshot = snapshot
+        return snapshot
+
+    def _schedule_refresh(self) -> None:
+        """バックグラウンドでの再読み込みを開始（実行中の場合は何もしない）"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        """バックグラウンド再読み込み（失敗時は古いスナップショットを使い続ける）"""
+        try:
+            async with self._load_lock:
+                async with self._session_factory() as db:
+                    await self._load(db)
+            self.refreshes += 1
+        except Exception:
+            self.refresh_failures += 1
+            logger.exception("Failed to refresh menu catalog")
+
+    async def get_etag(self, db: AsyncSession) -> str:
+        """
+        販売可能なメニュー一覧のETagを取得
+
+        キャッシュが有効な場合はスナップショットから計算済みの値を返す。
+
+        Args:
+            db: データベースセッション
+
+        Returns:
+            str: ETag
+        """
+        if not self.enabled:
+            max_updated_at, count = await menu_crud.get_menus_version(
+                db=db, available_only=True
+            )
+            return catalog_etag(max_updated_at, count)
+
+        snapshot = await self.get_snapshot(db)
+        return snapshot.etag
+
+    async def get_menus(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 50,
+        category: Optional[MenuCategory] = None,
+        cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.EXACT,
+    ) -> Page[MenuResponse]:
+        """
+        販売可能なメニュー一覧を取得（MenuCRUD.get_menusと同じ並び順・ページネーション）
+
+        Args:
+            db: データベースセッション
+            skip: スキップ件数
+            limit: 取得件数
+            category: カテゴリフィルタ
+            cursor: 前ページの最後を示すカーソル（指定時はskipを使わない）
+            total_mode: 総件数の取得方法（キャッシュ時はnone以外は正確な件数）
+
+        Returns:
+            Page[MenuResponse]: メニュー一覧と総件数
+
+        Raises:
+            ValueError: カーソルが不正な場合
+        """
+        if not self.enabled:
+            page = await menu_crud.get_menus(
+                db=db,
+                skip=skip,
+                limit=limit,
+                category=category,
+                available_only=True,
+                cursor=cursor,
+                total_mode=total_mode,
+            )
+            page.items = [MenuResponse.model_validate(menu) for menu in page.items]
+            return page
+
+        snapshot = await self.get_snapshot(db)
+        menus = snapshot.by_category.get(category, ()) if category else snapshot.menus
+
+        if cursor:
+            position = decode_cursor(cursor)
+            start = next(
+                (
+                    index
+                    for index, menu in enumerate(menus)
+                    if (menu.created_at, menu.id) < position
+                ),
+                len(menus),
+            )
+        else:
+            start = skip
+
+        items = list(menus[start:start + limit])
+        return Page(
+            items=items,
+            total=None if total_mode == TotalMode.NONE else len(menus),
+            has_more=start + limit < len(menus),
+        )
+
+    async def get_menu(self, db: AsyncSession, menu_id: int) -> Optional[MenuResponse]:
+        """
+        販売可能なメニューをIDで取得
+
+        Args:
+            db: データベースセッション
+            menu_id: メニューID
+
+        Returns:
+            Optional[MenuResponse]: メニュー（存在しないか販売停止中の場合はNone）
+        """
+        if not self.enabled:
+            menu = await menu_crud.get_menu_by_id(db=db, menu_id=menu_id)
+            if menu is None or not menu.is_available:
+                return None
+            return MenuResponse.model_validate(menu)
+
+        snapshot = await self.get_snapshot(db)
+        return snapshot.by_id.get(menu_id)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        キャッシュの統計情報を取得
+
+        Returns:
+            dict[str, Any]: バージョン、スナップショットの経過秒数、ヒット率など
+        """
+        snapshot = self._snapshot
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "version": snapshot.version if snapshot else None,
+            "menus": len(snapshot.menus) if snapshot else 0,
+            "snapshot_age_seconds": snapshot.age_seconds if snapshot else None,
+            "ttl_seconds": self.ttl_seconds,
+            "max_stale_seconds": self.max_stale_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "invalidations": self.invalidations,
+        }
+
+
+# 公開メニューカタログのインスタンス
+menu_catalog = MenuCatalog(
+    ttl_seconds=settings.menu_catalog_ttl_seconds,
+    max_stale_seconds=settings.menu_catalog_max_stale_seconds,
+)
@@ -3,16 +3,217 @@
 SQLAlchemy 2.0+ asyncio対応
 """
 
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Optional
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    any_,
+    bindparam,
+    case,
+    cast,
+    desc,
+    func,
+    insert,
+    literal,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.elements import ColumnElement, Label
+from sqlalchemy.sql.selectable import ScalarSelect
 
 from app.crud.menu import menu_crud
-from app.db.models import Order, OrderDetail, OrderStatus
-from app.schemas.order import OrderCreate, OrderItemCreate
+from app.crud.order_events import OrderEventType, order_event_crud
+from app.crud.order_stats import order_stats_crud
+from app.crud.pagination import Page, TotalMode, keyset_filter, paginate
+from app.db.models import (
+    Order,
+    OrderArchive,
+    OrderDetail,
+    OrderDetailArchive,
+    OrderStatus,
+    User,
+)
+from app.schemas.admin import (
+    AdminOrderSummaryResponse,
+    BulkOrderStatusOutcome,
+    BulkOrderStatusResult,
+    OrderStatusUpdateResponse,
+)
+from app.schemas.order import (
+    OrderCreate,
+    OrderDetailResponse,
+    OrderItemCreate,
+    OrderResponse,
+    OrderSummaryResponse,
+)
+
+# これ以上変化しない（終了状態の）注文ステータス
+TERMINAL_ORDER_STATUSES = frozenset({OrderStatus.DELIVERED, OrderStatus.CANCELLED})
+
+# ステータスごとに遷移できる次のステータス（単体・一括更新で検証する）
+ORDER_STATUS_TRANSITIONS: dict[OrderStatus, frozenset[OrderStatus]] = {
+    OrderStatus.PENDING: frozenset({OrderStatus.PREPARING, OrderStatus.CANCELLED}),
+    OrderStatus.PREPARING: frozenset({OrderStatus.READY, OrderStatus.CANCELLED}),
+    OrderStatus.READY: frozenset({OrderStatus.DELIVERED, OrderStatus.CANCELLED}),
+    OrderStatus.DELIVERED: frozenset(),
+    OrderStatus.CANCELLED: frozenset(),
+}
+
+
+def can_transition(current: OrderStatus, target: OrderStatus) -> bool:
+    """現在のステータスから指定したステータスへ遷移できるかどうか"""
+    return target in ORDER_STATUS_TRANSITIONS[current]
+
+
+def build_order_response(order: Order | OrderArchive) -> OrderResponse:
+    """
+    注文詳細・メニューを読み込み済みの注文からレスポンスを構築
+    
+    Args:
+        order: order_details.menuまで読み込んだ注文（アーカイブ済みの注文も可）
+        
+    Returns:
+        OrderResponse: 注文詳細レスポンス
+    """
+    return OrderResponse(
+        id=order.id,
+        user_id=order.user_id,
+        status=order.status,
+        total_amount=order.total_amount,
+        delivery_address=order.delivery_address,
+        delivery_time=order.delivery_time,
+        notes=order.notes,
+        items=[
+            OrderDetailResponse(
+                id=detail.id,
+                menu_id=detail.menu_id,
+                menu_name=detail.menu.name,
+                quantity=detail.quantity,
+                unit_price=detail.unit_price,
+                subtotal=detail.subtotal,
+            )
+            for detail in order.order_details
+        ],
+        created_at=order.created_at,
+        updated_at=order.updated_at,
+    )
+
+
+def order_items_count(
+    order_id: ColumnElement[int],
+    created_at: ColumnElement[datetime],
+    archived: bool = False
+) -> ScalarSelect[int]:
+    """
+    注文ごとのアイテム数（数量の合計）を返す相関サブクエリ
+    
+    get_order_items_countと同じSUM(quantity)の意味で、order_details.order_idの
+    インデックスで解決される。注文日時（パーティションキー）でも対応付け、
+    注文と同じ月のパーティションだけを参照する。
+    
+    Args:
+        order_id: 外側のクエリの注文ID列
+        created_at: 外側のクエリの注文日時列
+        archived: Trueの場合はアーカイブ済みの注文詳細（order_details_archive）を数える
+    """
+    detail = OrderDetailArchive if archived else OrderDetail
+    return (
+        select(func.coalesce(func.sum(detail.quantity), 0))
+        .where(detail.order_id == order_id, detail.created_at == created_at)
+        .correlate_except(detail)
+        .scalar_subquery()
+    )
+
+
+def items_count_column() -> Label[int]:
+    """注文ごとのアイテム数（一覧クエリのSELECT句に含めて使う）"""
+    return order_items_count(Order.id, Order.created_at).label("items_count")
+
+
+# ライブフィードのイベント内容に含める注文の列（更新文のRETURNINGで取得する）
+ORDER_FEED_COLUMNS = (
+    Order.id,
+    Order.user_id,
+    Order.status,
+    Order.total_amount,
+    Order.delivery_address,
+    Order.delivery_time,
+    Order.notes,
+    Order.created_at,
+    Order.updated_at,
+)
+
+
+def order_feed_payload(order: Any, items_count: int) -> dict[str, Any]:
+    """
+    注文ライブフィードのイベント内容を、書き込んだ注文の値から組み立てる
+    
+    注文テーブルを読み直さないよう、作成時は手元の値（OrderResponse）、
+    更新時はRETURNINGで得た行（ORDER_FEED_COLUMNS）を渡す。
+    APIのJSONと同じく、ステータスは小文字の値、金額は文字列、日時はISO 8601で表す
+    
+    Args:
+        order: ORDER_FEED_COLUMNSと同じ属性を持つ注文
+        items_count: アイテム数（数量の合計）
+    
+    Returns:
+        dict[str, Any]: イベント内容
+    """
+    return {
+        "id": order.id,
+        "user_id": order.user_id,
+        "status": order.status.value,
+        "total_amount": str(order.total_amount),
+        "delivery_address": order.delivery_address,
+        "delivery_time": order.delivery_time.isoformat() if order.delivery_time else None,
+        "notes": order.notes,
+        "items_count": items_count,
+        "created_at": order.created_at.isoformat(),
+        "updated_at": order.updated_at.isoformat(),
+    }
+
+
+def day_start(day: date) -> ColumnElement[datetime]:
+    """
+    日付の0時をデータベースのタイムゾーンで表すtimestamptz式
+    
+    created_at列を関数で包まずに比較できるため、インデックスが使われる
+    """
+    return cast(literal(day, Date), DateTime(timezone=True))
+
+
+def order_filters(
+    status: Optional[OrderStatus] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+) -> list[ColumnElement[bool]]:
+    """
+    注文一覧・統計で共通のフィルタ条件を構築
+    
+    Args:
+        status: ステータスフィルタ
+        date_from: 注文日の開始日
+        date_to: 注文日の終了日（この日を含む）
+        
+    Returns:
+        list[ColumnElement[bool]]: WHERE句の条件一覧
+    """
+    filters: list[ColumnElement[bool]] = []
+    if status:
+        filters.append(Order.status == status)
+    if date_from:
+        filters.append(Order.created_at >= day_start(date_from))
+    if date_to:
+        filters.append(Order.created_at < day_start(date_to + timedelta(days=1)))
+    return filters
 
 
 class OrderCRUD:
@@ -23,74 +224,127 @@ class OrderCRUD:
         db: AsyncSession,
         order_data: OrderCreate,
         user_id: int
-    ) -> Order:
+    ) -> OrderResponse:
         """
         新規注文を作成
         
+        注文と注文詳細をそれぞれ1文のINSERTで作成し、
+        レスポンスは書き込んだ内容から構築する（再取得しない）
+        
         Args:
             db: データベースセッション
             order_data: 注文作成データ
             user_id: 注文者のユーザーID
             
         Returns:
-            Order: 作成された注文
+            OrderResponse: 作成された注文（注文詳細を含む）
             
         Raises:
             ValueError: メニューが見つからない場合やその他のバリデーションエラー
         """
+        # 同じメニューの明細は数量を合算して1行にまとめる（初出順を維持）
+        quantities: dict[int, int] = {}
+        for item in order_data.items:
+            quantities[item.menu_id] = quantities.get(item.menu_id, 0) + item.quantity
+        
+        # 注文に含まれるメニューを1クエリでまとめて取得
+        menus = await menu_crud.get_menus_by_ids(db, quantities.keys())
+        
         # 注文アイテムの検証と合計金額計算
         total_amount = Decimal('0')
         order_details_data = []
         
-        for item in order_data.items:
+        for menu_id, quantity in quantities.items():
             # メニューの存在確認
-            menu = await menu_crud.get_menu_by_id(db, item.menu_id)
+            menu = menus.get(menu_id)
             if not menu:
-                raise ValueError(f"メニューID {item.menu_id} が見つかりません")
+                raise ValueError(f"メニューID {menu_id} が見つかりません")
             
             if not menu.is_available:
                 raise ValueError(f"メニュー「{menu.name}」は現在販売されていません")
             
             # 小計計算
-            subtotal = menu.price * item.quantity
+            subtotal = menu.price * quantity
             total_amount += subtotal
             
             order_details_data.append({
-                'menu_id': item.menu_id,
+                'menu_id': menu_id,
                 'menu': menu,
-                'quantity': item.quantity,
+                'quantity': quantity,
                 'unit_price': menu.price,
                 'subtotal': subtotal
             })
         
-        # 注文レコード作成
-        db_order = Order(
+        # 注文レコード作成（RETURNINGで採番されたIDとタイムスタンプを取得）
+        order_row = (
+            await db.execute(
+                insert(Order)
+                .values(
+                    user_id=user_id,
+                    status=OrderStatus.PENDING,
+                    total_amount=total_amount,
+                    delivery_address=order_data.delivery_address,
+                    delivery_time=order_data.delivery_time,
+                    notes=order_data.notes,
+                )
+                .returning(Order.id, Order.created_at, Order.updated_at)
+            )
+        ).one()
+        
+        # 注文詳細レコードを1文でまとめて作成
+        # 明細はメニューごとに1行なので、menu_idで採番されたIDを対応付ける
+        detail_rows = await db.execute(
+            insert(OrderDetail).returning(OrderDetail.id, OrderDetail.menu_id),
+            [
+                {
+                    'order_id': order_row.id,
+                    'menu_id': detail_data['menu_id'],
+                    'quantity': detail_data['quantity'],
+                    'unit_price': detail_data['unit_price'],
+                    'subtotal': detail_data['subtotal'],
+                }
+                for detail_data in order_details_data
+            ],
+        )
+        detail_ids = {row.menu_id: row.id for row in detail_rows}
+        
+        # 日次集計を同じトランザクションで更新（書き込んだ行は再読み込みしない）
+        await order_stats_crud.apply_new_order(
+            db, order_row.created_at, total_amount, order_details_data
+        )
+        # 書き込んだ内容を再取得せず、手元のデータからレスポンスを構築
+        response = OrderResponse(
+            id=order_row.id,
             user_id=user_id,
             status=OrderStatus.PENDING,
             total_amount=total_amount,
             delivery_address=order_data.delivery_address,
             delivery_time=order_data.delivery_time,
             notes=order_data.notes,
+            items=[
+                OrderDetailResponse(
+                    id=detail_ids[detail_data['menu_id']],
+                    menu_id=detail_data['menu_id'],
+                    menu_name=detail_data['menu'].name,
+                    quantity=detail_data['quantity'],
+                    unit_price=detail_data['unit_price'],
+                    subtotal=detail_data['subtotal'],
+                )
+                for detail_data in order_details_data
+            ],
+            created_at=order_row.created_at,
+            updated_at=order_row.updated_at,
         )
         
-        db.add(db_order)
-        await db.flush()  # IDを取得するためにflush
-        
-        # 注文詳細レコード作成
-        for detail_data in order_details_data:
-            order_detail = OrderDetail(
-                order_id=db_order.id,
-                menu_id=detail_data['menu_id'],
-                quantity=detail_data['quantity'],
-                unit_price=detail_data['unit_price'],
-                subtotal=detail_data['subtotal'],
-            )
-            db.add(order_detail)
+        # ライブフィードのイベントを記録（コミット時に通知される）
+        await order_event_crud.publish(
+            db,
+            OrderEventType.CREATED,
+            [order_feed_payload(response, sum(quantities.values()))],
+        )
         
         await db.commit()
-        await db.refresh(db_order)
-        
-        return db_order
+        return response
     
     @staticmethod
     async def get_user_orders(
@@ -98,10 +352,15 @@ class OrderCRUD:
         user_id: int,
         skip: int = 0,
         limit: int = 20,
-        status: Optional[OrderStatus] = None
-    ) -> tuple[List[Order], int]:
+        status: Optional[OrderStatus] = None,
+        cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.EXACT
+    ) -> Page[OrderSummaryResponse]:
         """
-        ユーザーの注文一覧を取得
+        ユーザーの注文一覧を取得（アイテム数を含むサマリー）
+        
+        アイテム数（数量の合計）は一覧と同じクエリ内で集計する。
+        アーカイブ済みの注文もUNION ALLで同じ一覧に含める（並び順・カーソルは共通）。
         
         Args:
             db: データベースセッション
@@ -109,48 +368,162 @@ class OrderCRUD:
             skip: スキップ件数
             limit: 取得件数
             status: ステータスフィルタ
+            cursor: 前ページの最後を示すカーソル（指定時はskipを使わない）
+            total_mode: 総件数の取得方法
             
         Returns:
-            tuple[List[Order], int]: (注文一覧, 総件数)
+            Page[OrderSummaryResponse]: 注文サマリー一覧と総件数
+            
+        Raises:
+            ValueError: カーソルが不正な場合
         """
-        # ベースクエリを構築
-        query = select(Order).where(Order.user_id == user_id)
-        count_query = select(func.count(Order.id)).where(Order.user_id == user_id)
+        # 注文とアーカイブ済みの注文のそれぞれで、ユーザー・ステータスで絞り込む
+        branches = []
+        count_branches = []
+        for model, archived in ((Order, False), (OrderArchive, True)):
+            filters = [model.user_id == user_id]
+            if status:
+                filters.append(model.status == status)
+            branches.append(
+                select(
+                    model.id,
+                    model.status,
+                    model.total_amount,
+                    model.delivery_address,
+                    model.delivery_time,
+                    model.created_at,
+                    literal(archived).label("archived"),
+                ).where(*filters)
+            )
+            count_branches.append(select(model.id).where(*filters))
+        orders = union_all(*branches).subquery("user_orders")
+        # アイテム数は外側で求め、並べ替え・LIMITの後のページ分だけ集計させる
+        query = select(
+            orders.c.id,
+            orders.c.status,
+            orders.c.total_amount,
+            orders.c.delivery_address,
+            orders.c.delivery_time,
+            orders.c.created_at,
+            case(
+                (
+                    orders.c.archived,
+                    order_items_count(orders.c.id, orders.c.created_at, archived=True),
+                ),
+                else_=order_items_count(orders.c.id, orders.c.created_at),
+            ).label("items_count"),
+        )
+        count_query = select(func.count()).select_from(
+            union_all(*count_branches).subquery("user_order_ids")
+        )
+        
+        # 並び順とページネーション（カーソル指定時はキーセット方式）
+        # 条件・並び順は各テーブルの(user_id, created_at DESC, id DESC)インデックスで解決される
+        query = query.order_by(desc(orders.c.created_at), desc(orders.c.id))
+        cursor_filter = (
+            keyset_filter(orders.c.created_at, orders.c.id, cursor) if cursor else None
+        )
         
-        # ステータスフィルタ
-        if status:
-            query = query.where(Order.status == status)
-            count_query = count_query.where(Order.status == status)
+        page = await paginate(
+            db,
+            query,
+            count_query,
+            skip=skip,
+            limit=limit,
+            cursor_filter=cursor_filter,
+            total_mode=total_mode,
+        )
+        page.items = [OrderSummaryResponse.model_validate(row) for row in page.items]
+        return page
+    
+    @staticmethod
+    async def get_admin_orders(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 50,
+        status: Optional[OrderStatus] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.ESTIMATED
+    ) -> Page[AdminOrderSummaryResponse]:
+        """
+        管理者向けの注文一覧を取得
         
-        # 並び順とページネーション
-        query = query.order_by(desc(Order.created_at))
-        query = query.offset(skip).limit(limit)
+        注文者の名前・メールアドレスはusersとの結合で、アイテム数は
+        相関サブクエリで取得するため、1ページを一定数のクエリで返す
         
-        # 実行
-        result = await db.execute(query)
-        orders = result.scalars().all()
+        Args:
+            db: データベースセッション
+            skip: スキップ件数
+            limit: 取得件数
+            status: ステータスフィルタ
+            date_from: 注文日の開始日
+            date_to: 注文日の終了日（この日を含む）
+            cursor: 前ページの最後を示すカーソル（指定時はskipを使わない）
+            total_mode: 総件数の取得方法（既定は統計情報による推定値）
+            
+        Returns:
+            Page[AdminOrderSummaryResponse]: 注文サマリー一覧と総件数
+            
+        Raises:
+            ValueError: カーソルが不正な場合
+        """
+        filters = order_filters(status=status, date_from=date_from, date_to=date_to)
         
-        count_result = await db.execute(count_query)
-        total = count_result.scalar() or 0
+        query = (
+            select(
+                Order.id,
+                Order.user_id,
+                User.name.label("user_name"),
+                User.email.label("user_email"),
+                Order.status,
+                Order.total_amount,
+                Order.delivery_address,
+                Order.delivery_time,
+                Order.notes,
+                items_count_column(),
+                Order.created_at,
+                Order.updated_at,
+            )
+            .join(User, User.id == Order.user_id)
+            .where(*filters)
+            .order_by(desc(Order.created_at), desc(Order.id))
+        )
+        count_query = select(func.count(Order.id)).where(*filters)
+        # カーソル指定時はキーセット方式（総件数の条件には含めない）
+        cursor_filter = keyset_filter(Order.created_at, Order.id, cursor) if cursor else None
         
-        return list(orders), total
+        page = await paginate(
+            db,
+            query,
+            count_query,
+            skip=skip,
+            limit=limit,
+            cursor_filter=cursor_filter,
+            total_mode=total_mode,
+        )
+        page.items = [AdminOrderSummaryResponse.model_validate(row) for row in page.items]
+        return page
     
     @staticmethod
     async def get_order_by_id(
         db: AsyncSession,
         order_id: int,
         user_id: Optional[int] = None
-    ) -> Optional[Order]:
+    ) -> Optional[Order | OrderArchive]:
         """
         IDで注文を取得（注文詳細も含む）
         
+        ordersにない場合はアーカイブ済みの注文から取得する
+        
         Args:
             db: データベースセッション
             order_id: 注文ID
             user_id: ユーザーID（指定した場合、そのユーザーの注文のみ取得）
             
         Returns:
-            Optional[Order]: 注文（存在しない場合はNone）
+            Optional[Order | OrderArchive]: 注文（存在しない場合はNone）
         """
         query = select(Order).options(
             selectinload(Order.order_details).selectinload(OrderDetail.menu)
@@ -160,37 +533,227 @@ class OrderCRUD:
             query = query.where(Order.user_id == user_id)
         
         result = await db.execute(query)
+        order = result.scalar_one_or_none()
+        if order is not None:
+            return order
+        
+        archived_query = select(OrderArchive).options(
+            selectinload(OrderArchive.order_details).selectinload(OrderDetailArchive.menu)
+        ).where(OrderArchive.id == order_id)
+        
+        if user_id is not None:
+            archived_query = archived_query.where(OrderArchive.user_id == user_id)
+        
+        result = await db.execute(archived_query)
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_order_version(
+        db: AsyncSession,
+        order_id: int,
+        user_id: Optional[int] = None
+    ) -> Optional[tuple[OrderStatus, datetime]]:
+        """
+        注文のステータスと更新日時のみを取得（注文詳細は読み込まない）
+        
+        ordersにない場合はアーカイブ済みの注文から取得する
+        
+        Args:
+            db: データベースセッション
+            order_id: 注文ID
+            user_id: ユーザーID（指定した場合、そのユーザーの注文のみ取得）
+            
+        Returns:
+            Optional[tuple[OrderStatus, datetime]]: (ステータス, 更新日時)（存在しない場合はNone）
+        """
+        for model in (Order, OrderArchive):
+            query = select(model.status, model.updated_at).where(model.id == order_id)
+            
+            if user_id is not None:
+                query = query.where(model.user_id == user_id)
+            
+            row = (await db.execute(query)).one_or_none()
+            if row:
+                return row.status, row.updated_at
+        return None
+    
     @staticmethod
     async def update_order_status(
         db: AsyncSession,
         order_id: int,
         status: OrderStatus
-    ) -> Optional[Order]:
+    ) -> Optional[OrderStatusUpdateResponse]:
         """
         注文ステータスを更新（管理者用）
         
+        注文を読み込まず、1文（UPDATE ... RETURNINGを含むWITH句）で更新する。
+        変更前のステータスは同じ文の中で行ロックを取って読み、
+        ORDER_STATUS_TRANSITIONSで遷移できる場合だけ更新する（一括更新と同じ規則）。
+        変更前のステータスは日次集計の差し引きにも使う。
+        ステータスが変わらない場合は何もせず、更新日時も変えない。
+        注文詳細が必要な場合は、呼び出し元でget_order_by_idを使う。
+        
         Args:
             db: データベースセッション
             order_id: 注文ID
             status: 新しいステータス
             
         Returns:
-            Optional[Order]: 更新された注文（存在しない場合はNone）
+            Optional[OrderStatusUpdateResponse]: 更新後のステータスと更新日時
+                （存在しない場合はNone）
+        
+        Raises:
+            ValueError: 現在のステータスから遷移できない場合
         """
-        query = select(Order).where(Order.id == order_id)
-        result = await db.execute(query)
-        db_order = result.scalar_one_or_none()
+        # 新しいステータスへ遷移できる変更前のステータス
+        sources = [
+            current for current, targets in ORDER_STATUS_TRANSITIONS.items()
+            if status in targets
+        ]
+        previous = (
+            select(Order.id, Order.created_at, Order.status, Order.updated_at)
+            .where(Order.id == order_id)
+            .with_for_update()
+            .cte("previous")
+        )
+        updated = (
+            update(Order)
+            .where(
+                Order.id == previous.c.id,
+                Order.created_at == previous.c.created_at,
+                previous.c.status.in_(sources),
+            )
+            .values(status=status, updated_at=func.now())
+            .returning(*ORDER_FEED_COLUMNS, items_count_column())
+            .cte("updated")
+        )
+        # 遷移できない場合もロックした行を返し、存在しない注文と区別する
+        result = await db.execute(
+            select(
+                previous.c.status.label("previous_status"),
+                previous.c.updated_at.label("previous_updated_at"),
+                *updated.c,
+            ).select_from(previous.outerjoin(updated, updated.c.id == previous.c.id))
+        )
+        row = result.one_or_none()
         
-        if not db_order:
+        if row is None:
+            await db.rollback()
             return None
         
-        db_order.status = status
+        if row.id is None:
+            if row.previous_status == status:
+                # 行ロックを解放するだけで、変更はない
+                await db.commit()
+                return OrderStatusUpdateResponse(
+                    id=order_id, status=status, updated_at=row.previous_updated_at
+                )
+            await db.rollback()
+            raise ValueError(
+                f"ステータスを{row.previous_status.value}から{status.value}に変更できません"
+            )
+        
+        # 変更前のステータスの集計から差し引き、変更後のステータスに加算する
+        await order_stats_crud.apply_orders(
+            db, [order_id], sign=-1, status=row.previous_status
+        )
+        await order_stats_crud.apply_orders(db, [order_id])
+        await order_event_crud.publish(
+            db,
+            OrderEventType.STATUS_CHANGED,
+            [order_feed_payload(row, row.items_count)],
+        )
+        await db.commit()
+        
+        return OrderStatusUpdateResponse(
+            id=row.id, status=row.status, updated_at=row.updated_at
+        )
+    
+    @staticmethod
+    async def bulk_update_order_status(
+        db: AsyncSession,
+        order_ids: list[int],
+        status: OrderStatus
+    ) -> list[BulkOrderStatusResult]:
+        """
+        複数の注文のステータスを一括で更新（管理者用）
+        
+        対象の注文をID順にロックして現在のステータスを確認し、遷移できる注文だけを
+        1文のUPDATE ... WHERE id = ANY(...) RETURNINGで更新する。
+        日次集計とライブフィードのイベントも件数に関わらず一定数の文で更新し、
+        イベントの通知はコミット時に1回だけ送られる。
+        
+        Args:
+            db: データベースセッション
+            order_ids: 注文ID一覧（重複は1件として扱う）
+            status: 新しいステータス
+            
+        Returns:
+            list[BulkOrderStatusResult]: 注文ごとの結果（指定した順）
+        """
+        requested = list(dict.fromkeys(order_ids))
+        ids_param = bindparam("order_ids", requested, type_=ARRAY(BigInteger))
+        
+        # 同じ注文を更新する他のトランザクションとデッドロックしないようID順にロック
+        current_rows = await db.execute(
+            select(Order.id, Order.status)
+            .where(Order.id == any_(ids_param))
+            .order_by(Order.id)
+            .with_for_update()
+        )
+        current = {row.id: row.status for row in current_rows}
+        
+        changing = [
+            order_id for order_id in requested
+            if order_id in current and can_transition(current[order_id], status)
+        ]
+        
+        updated_at: dict[int, datetime] = {}
+        if changing:
+            # 変更前のステータスの集計から差し引き、変更後のステータスに加算する
+            await order_stats_crud.apply_orders(db, changing, sign=-1)
+            updated_rows = await db.execute(
+                update(Order)
+                .where(
+                    Order.id == any_(
+                        bindparam("changing_ids", changing, type_=ARRAY(BigInteger))
+                    )
+                )
+                .values(status=status, updated_at=func.now())
+                .returning(*ORDER_FEED_COLUMNS, items_count_column()),
+                execution_options={"synchronize_session": False},
+            )
+            updated = sorted(updated_rows, key=lambda row: row.id)
+            updated_at = {row.id: row.updated_at for row in updated}
+            await order_stats_crud.apply_orders(db, changing)
+            await order_event_crud.publish(
+                db,
+                OrderEventType.STATUS_CHANGED,
+                [order_feed_payload(row, row.items_count) for row in updated],
+            )
         await db.commit()
-        await db.refresh(db_order)
         
-        return db_order
+        results = []
+        for order_id in requested:
+            previous = current.get(order_id)
+            if previous is None:
+                outcome = BulkOrderStatusOutcome.NOT_FOUND
+            elif order_id in updated_at:
+                outcome = BulkOrderStatusOutcome.UPDATED
+            elif previous == status:
+                outcome = BulkOrderStatusOutcome.UNCHANGED
+            else:
+                outcome = BulkOrderStatusOutcome.INVALID_TRANSITION
+            results.append(
+                BulkOrderStatusResult(
+                    order_id=order_id,
+                    result=outcome,
+                    previous_status=previous,
+                    status=status if order_id in updated_at else previous,
+                    updated_at=updated_at.get(order_id),
+                )
+            )
+        return results
     
     @staticmethod
     async def get_order_items_count(db: AsyncSession, order_id: int) -> int:
@@ -0,0 +1,147 @@
+"""
+注文アーカイブのCRUD操作
+一定期間が経過した配達完了・キャンセル済みの注文を、注文詳細とともに
+orders・order_detailsからorders_archive・order_details_archiveへ移す
+
+1バッチを1トランザクション（1文＋コミット）で処理し、行ロックを保持する時間を
+バッチの大きさで抑える。日次集計はアーカイブ後も変わらない（移すだけのため）。
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Select, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.order import TERMINAL_ORDER_STATUSES
+from app.db.models import Order, OrderArchive, OrderDetail, OrderDetailArchive
+
+# アーカイブに移す列（archived_atはアーカイブ時の既定値）
+ORDER_COLUMNS = (
+    "id", "user_id", "status", "total_amount", "delivery_address",
+    "delivery_time", "notes", "created_at", "updated_at",
+)
+ORDER_DETAIL_COLUMNS = (
+    "id", "order_id", "menu_id", "quantity", "unit_price", "subtotal", "created_at",
+)
+
+
+@dataclass
+class ArchiveBatchResult:
+    """1バッチのアーカイブ結果と所要時間"""
+    orders: int
+    order_details: int
+    # アーカイブの文の実行時間
+    statement_seconds: float
+    # 行ロックを保持した時間（文の開始からコミット完了まで）
+    lock_seconds: float
+
+    @property
+    def orders_per_second(self) -> float:
+        """ロック保持時間あたりの注文の移動件数"""
+        return self.orders / self.lock_seconds if self.lock_seconds else 0.0
+
+    @property
+    def order_details_per_second(self) -> float:
+        """ロック保持時間あたりの注文詳細の移動件数"""
+        return self.order_details / self.lock_seconds if self.lock_seconds else 0.0
+
+
+def archive_statement(before: datetime, batch_size: int) -> Select[tuple[int, int]]:
+    """
+    終了状態でbeforeより前に作成された注文をbatch_size件までアーカイブに移す文
+
+    対象の注文を行ロックし（ロック中の注文は飛ばす）、注文と注文詳細を削除して
+    RETURNINGの行をそのままアーカイブに挿入する。注文詳細は同じ文で先に移すため、
+    ordersの削除によるON DELETE CASCADEでは何も削除されない。
+    created_atで絞り込むため、対象の月のパーティションだけを参照する。
+
+    Returns:
+        Select[tuple[int, int]]: (移した注文数, 移した注文詳細数) を返す文
+    """
+    batch = (
+        select(Order.id, Order.created_at)
+        .where(
+            Order.status.in_(TERMINAL_ORDER_STATUSES),
+            Order.created_at < before,
+        )
+        .order_by(Order.created_at, Order.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("batch")
+    )
+    moved_orders = (
+        delete(Order)
+        .where(Order.id == batch.c.id, Order.created_at == batch.c.created_at)
+        .returning(*(Order.__table__.c[name] for name in ORDER_COLUMNS))
+        .cte("moved_orders")
+    )
+    moved_details = (
+        delete(OrderDetail)
+        .where(
+            OrderDetail.order_id == batch.c.id,
+            OrderDetail.created_at == batch.c.created_at,
+        )
+        .returning(*(OrderDetail.__table__.c[name] for name in ORDER_DETAIL_COLUMNS))
+        .cte("moved_details")
+    )
+    archived_orders = (
+        insert(OrderArchive)
+        .from_select(list(ORDER_COLUMNS), select(*moved_orders.c))
+        .returning(OrderArchive.id)
+        .cte("archived_orders")
+    )
+    archived_details = (
+        insert(OrderDetailArchive)
+        .from_select(list(ORDER_DETAIL_COLUMNS), select(*moved_details.c))
+        .returning(OrderDetailArchive.id)
+        .cte("archived_details")
+    )
+    return select(
+        select(func.count()).select_from(archived_orders).scalar_subquery(),
+        select(func.count()).select_from(archived_details).scalar_subquery(),
+    )
+
+
+class OrderArchiveCRUD:
+    """注文アーカイブのCRUD操作クラス"""
+
+    @staticmethod
+    async def archive_batch(
+        db: AsyncSession,
+        before: datetime,
+        batch_size: int
+    ) -> ArchiveBatchResult:
+        """
+        終了状態の古い注文を1バッチ分アーカイブに移してコミットする
+
+        Args:
+            db: データベースセッション（トランザクションを開始していないこと）
+            before: この日時より前に作成された注文を対象にする
+            batch_size: 1バッチで移す注文の上限
+
+        Returns:
+            ArchiveBatchResult: 移した件数と所要時間（0件なら移せる注文は残っていない）
+        """
+        started = time.perf_counter()
+        try:
+            result = await db.execute(archive_statement(before, batch_size))
+            orders, order_details = result.one()
+            executed = time.perf_counter()
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        committed = time.perf_counter()
+
+        return ArchiveBatchResult(
+            orders=orders,
+            order_details=order_details,
+            statement_seconds=executed - started,
+            lock_seconds=committed - started,
+        )
+
+
+# CRUDインスタンス
+order_archive_crud = OrderArchiveCRUD()
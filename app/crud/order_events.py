@@ -0,0 +1,203 @@
+"""
+注文イベントのCRUD操作
+注文の作成・ステータス変更をorder_eventsに記録し、コミット時にNOTIFYで通知する
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import BigInteger, String, Text, cast, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models import OrderEvent
+
+# LISTEN/NOTIFYのチャネル名（通知のペイロードは最新のイベントID）
+ORDER_EVENTS_CHANNEL = "order_events"
+
+
+class OrderEventType(str, Enum):
+    """注文イベント種別"""
+    CREATED = "order_created"
+    STATUS_CHANGED = "order_status_changed"
+
+
+def xid_as_bigint(xid: ColumnElement[Any]) -> ColumnElement[int]:
+    """xid8（64ビットのトランザクションID）をbigintに変換する式"""
+    return cast(cast(xid, Text), BigInteger)
+
+
+@dataclass
+class EventBatch:
+    """
+    読み出したイベントと、読み出した時点のスナップショットの範囲
+
+    xminより前のトランザクションはすべて終了しており、
+    xmax以降のトランザクションは読み出した時点で開始していない。
+    イベントがない場合はどちらも0。
+    """
+
+    events: list[OrderEvent]
+    snapshot_xmin: int = 0
+    snapshot_xmax: int = 0
+
+
+class OrderEventCRUD:
+    """注文イベントのCRUD操作クラス"""
+
+    @staticmethod
+    async def publish(
+        db: AsyncSession,
+        event_type: OrderEventType,
+        payloads: Sequence[dict[str, Any]]
+    ) -> None:
+        """
+        注文の現在の状態をイベントとして記録し、コミット時に通知する
+
+        注文を変更したトランザクションの最後（コミット直前）に呼び出す。
+        イベント内容は呼び出し元が注文を書き込んだ文のRETURNINGで得たもの
+        （order_feed_payload）を渡し、注文テーブルは読み直さない。
+        ロックは取らないため、IDの順序とコミットの順序は一致しない。
+        取りこぼしは配信側（OrderFeed）でIDの欠番を待つことで防ぐ。
+
+        Args:
+            db: データベースセッション
+            event_type: イベント種別
+            payloads: 注文ごとのイベント内容（注文IDを"id"に持つ）
+        """
+        if not payloads:
+            return
+
+        inserted = (
+            insert(OrderEvent)
+            .values(
+                [
+                    {
+                        "order_id": payload["id"],
+                        "event_type": event_type.value,
+                        "payload": payload,
+                    }
+                    for payload in payloads
+                ]
+            )
+            .returning(OrderEvent.id)
+            .cte("inserted")
+        )
+        # NOTIFYはコミット時に配信される
+        await db.execute(
+            select(
+                func.pg_notify(
+                    ORDER_EVENTS_CHANNEL, cast(func.max(inserted.c.id), String)
+                )
+            )
+        )
+
+    @staticmethod
+    async def get_events_after(
+        db: AsyncSession,
+        after_id: int,
+        limit: int,
+        up_to: Optional[int] = None
+    ) -> list[OrderEvent]:
+        """
+        指定したIDより後のイベントをID順に取得
+
+        Args:
+            db: データベースセッション
+            after_id: 最後に受信したイベントID
+            limit: 取得件数
+            up_to: このIDまでのイベントに限る（配信済みの範囲の送り直し用）
+
+        Returns:
+            list[OrderEvent]: イベント一覧
+        """
+        query = (
+            select(OrderEvent)
+            .where(OrderEvent.id > after_id)
+            .order_by(OrderEvent.id)
+            .limit(limit)
+        )
+        if up_to is not None:
+            query = query.where(OrderEvent.id <= up_to)
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def read_new_events(
+        db: AsyncSession,
+        after_id: int,
+        limit: int
+    ) -> EventBatch:
+        """
+        指定したIDより後のイベントを、同じ文のスナップショットの範囲とともに取得
+
+        IDの欠番が未コミットのイベントか（ロールバックで）欠けたままになるかを
+        判断するために使う。
+
+        Args:
+            db: データベースセッション
+            after_id: 配信済みの最新イベントID
+            limit: 取得件数
+
+        Returns:
+            EventBatch: イベント一覧とスナップショットの範囲
+        """
+        snapshot = func.pg_current_snapshot()
+        result = await db.execute(
+            select(
+                OrderEvent,
+                xid_as_bigint(func.pg_snapshot_xmin(snapshot)).label("snapshot_xmin"),
+                xid_as_bigint(func.pg_snapshot_xmax(snapshot)).label("snapshot_xmax"),
+            )
+            .where(OrderEvent.id > after_id)
+            .order_by(OrderEvent.id)
+            .limit(limit)
+        )
+        rows = result.all()
+        if not rows:
+            return EventBatch(events=[])
+        return EventBatch(
+            events=[row.OrderEvent for row in rows],
+            snapshot_xmin=rows[0].snapshot_xmin,
+            snapshot_xmax=rows[0].snapshot_xmax,
+        )
+
+    @staticmethod
+    async def get_latest_event_id(db: AsyncSession) -> int:
+        """
+        最新のイベントIDを取得
+
+        Args:
+            db: データベースセッション
+
+        Returns:
+            int: 最新のイベントID（イベントがない場合は0）
+        """
+        result = await db.execute(
+            select(func.coalesce(func.max(OrderEvent.id), cast(0, BigInteger)))
+        )
+        return result.scalar_one()
+
+    @staticmethod
+    async def prune(db: AsyncSession, before: datetime) -> int:
+        """
+        古いイベントを削除（コミットは呼び出し元で行う）
+
+        Args:
+            db: データベースセッション
+            before: この日時より前に発生したイベントを削除する
+
+        Returns:
+            int: 削除した件数
+        """
+        result = await db.execute(
+            delete(OrderEvent).where(OrderEvent.created_at < before)
+        )
+        return result.rowcount
+
+
+# CRUD操作のインスタンス
+order_event_crud = OrderEventCRUD()
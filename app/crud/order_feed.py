@@ -0,0 +1,357 @@
+"""
+注文ライブフィードの配信
+ワーカーごとに1本のLISTEN接続でorder_eventsの通知を受け、接続中のSSEクライアントへ配信する
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.crud.order_events import ORDER_EVENTS_CHANNEL, EventBatch, order_event_crud
+from app.db.database import AsyncSessionLocal, script_engine
+from app.db.models import OrderEvent
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+# LISTEN接続が切れた場合の再接続間隔の上限（秒）
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+# SSEのretryフィールド（クライアントの再接続待ち時間、ミリ秒）
+SSE_RETRY_MILLISECONDS = 3000
+
+# イベントIDの欠番を待っている間の再確認間隔（秒）
+# ロールバックされた欠番は通知が来ないため、ポーリング間隔まで待たずに確認する
+GAP_RECHECK_SECONDS = 0.1
+
+
+@dataclass(frozen=True)
+class FeedEvent:
+    """配信する注文イベント"""
+    id: int
+    event_type: str
+    payload: dict[str, Any]
+
+    @classmethod
+    def from_model(cls, event: OrderEvent) -> "FeedEvent":
+        return cls(id=event.id, event_type=event.event_type, payload=event.payload)
+
+    def to_sse(self) -> str:
+        """Server-Sent Eventsの1イベント分の文字列"""
+        data = json.dumps(self.payload, ensure_ascii=False, separators=(",", ":"))
+        return f"id: {self.id}\nevent: {self.event_type}\ndata: {data}\n\n"
+
+
+def sse_message(event: str, data: dict[str, Any], event_id: Optional[int] = None) -> str:
+    """制御用（ready・reset）のSSEメッセージを組み立てる"""
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class FeedSubscription:
+    """1つのSSE接続の受信キュー"""
+
+    def __init__(self, queue_size: int) -> None:
+        # Noneは「配信が追いつかず切断された」ことを表す
+        self.queue: asyncio.Queue[Optional[FeedEvent]] = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def deliver(self, event: FeedEvent) -> bool:
+        """キューに追加する（満杯の場合はキューを空にして終了を通知し、Falseを返す）"""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.end()
+            return False
+
+    def end(self) -> None:
+        """未送信のイベントを破棄して終了を通知する"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class OrderFeed:
+    """
+    注文イベントのワーカー内ブロードキャスター
+
+    最初の購読時にLISTEN接続（プール外の専用接続）を開き、NOTIFYを受けるたびに
+    前回以降のイベントを1回だけ読み出して全購読者のキューへ配る。
+    接続数に関わらずデータベースへの問い合わせは通知1回につき1クエリで、
+    通知を取りこぼした場合に備えて一定間隔でも確認する。
+
+    イベントIDは採番順で、コミット順とは一致しない。先にコミットされた大きいIDを
+    配ってから小さいIDがコミットされると、Last-Event-IDからの再開で取りこぼすため、
+    イベントは必ずIDの連続した順に配り、欠番があればそこで止める。
+    欠番を採番したトランザクションは、欠番より大きいIDを読み出した時点で実行中だった
+    はずなので、その時点のスナップショットのxmaxより前のトランザクションがすべて
+    終了すれば、欠番はロールバックで欠けたままと判断して先へ進む。
+    """
+
+    def __init__(
+        self,
+        poll_seconds: float,
+        queue_size: int,
+        batch_size: int = 500,
+        session_factory: SessionFactory = AsyncSessionLocal,
+        listen_engine: AsyncEngine = script_engine,
+    ) -> None:
+        self.poll_seconds = poll_seconds
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self._session_factory = session_factory
+        self._listen_engine = listen_engine
+        self._subscribers: set[FeedSubscription] = set()
+        self._last_event_id: Optional[int] = None
+        # 待っている欠番: (欠番の次に存在したイベントID, 観測時のスナップショットのxmax)
+        self._gap: Optional[tuple[int, int]] = None
+        self._ready = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+        self.notifications = 0
+        self.delivered = 0
+        self.dropped_subscribers = 0
+        self.reconnects = 0
+        self.skipped_event_ids = 0
+
+    @property
+    def last_event_id(self) -> Optional[int]:
+        """
+        配信済みの最新イベントID
+
+        このID以下のイベントは欠番を含めて確定しており、後からコミットされることはない
+        """
+        return self._last_event_id
+
+    async def subscribe(self, timeout: float = 10.0) -> FeedSubscription:
+        """
+        購読を開始する
+
+        LISTEN接続が確立して配信の起点となるイベントIDが決まるまで待つため、
+        購読後にorder_eventsから読んだイベント以降は必ずキューに届く。
+
+        Args:
+            timeout: LISTEN接続の確立を待つ秒数
+
+        Returns:
+            FeedSubscription: 受信キュー
+
+        Raises:
+            asyncio.TimeoutError: LISTEN接続を確立できない場合
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            # 初回（またはLISTENタスクが終了した後）はイベントループごとに作り直す
+            self._ready = asyncio.Event()
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        await asyncio.wait_for(self._ready.wait(), timeout)
+
+        subscription = FeedSubscription(self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: FeedSubscription) -> None:
+        """購読を終了する"""
+        self._subscribers.discard(subscription)
+
+    async def close(self) -> None:
+        """LISTEN接続を閉じる（購読者には終了を通知する）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscription in list(self._subscribers):
+            subscription.end()
+        self._subscribers.clear()
+
+    async def _run(self) -> None:
+        """LISTEN接続を維持し、通知ごとに新しいイベントを配信する"""
+        delay = 1.0
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Order feed listener failed; reconnecting in %.0fs", delay)
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+    async def _listen(self) -> None:
+        async with self._listen_engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection
+            lost = asyncio.Event()
+
+            def on_terminate(_conn: Any) -> None:
+                lost.set()
+                self._wakeup.set()
+
+            await driver.add_listener(ORDER_EVENTS_CHANNEL, self._on_notify)
+            driver.add_termination_listener(on_terminate)
+
+            if self._last_event_id is None:
+                async with self._session_factory() as db:
+                    self._last_event_id = await order_event_crud.get_latest_event_id(db)
+            else:
+                # 再接続の間に発生したイベントに追いつく
+                await self._fetch_new()
+            self._ready.set()
+
+            while not lost.is_set():
+                timeout = self.poll_seconds if self._gap is None else GAP_RECHECK_SECONDS
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                if lost.is_set() or driver.is_closed():
+                    break
+                await self._fetch_new()
+        raise ConnectionError("LISTEN connection lost")
+
+    def _on_notify(self, _conn: Any, _pid: int, _channel: str, _payload: str) -> None:
+        self.notifications += 1
+        self._wakeup.set()
+
+    async def _fetch_new(self) -> None:
+        """前回配信以降のイベントを読み出して配る"""
+        async with self._session_factory() as db:
+            batch = await order_event_crud.read_new_events(
+                db, self._last_event_id or 0, self.batch_size
+            )
+        events = self._contiguous(batch)
+        if not events:
+            return
+
+        self._fan_out([FeedEvent.from_model(event) for event in events])
+        if len(events) == self.batch_size:
+            # まだ残っている
+            self._wakeup.set()
+
+    def _contiguous(self, batch: EventBatch) -> list[OrderEvent]:
+        """
+        読み出したイベントのうち、IDが欠番なく続く先頭部分を返す
+
+        欠番の手前で止め、欠番を採番した可能性のあるトランザクションが
+        すべて終了していれば欠番を飛ばして続ける。
+        """
+        expected = (self._last_event_id or 0) + 1
+        events: list[OrderEvent] = []
+        for event in batch.events:
+            if event.id != expected:
+                gap = self._gap
+                if (
+                    gap is not None
+                    and event.id <= gap[0]
+                    and batch.snapshot_xmin >= gap[1]
+                ):
+                    # 欠番を採番したトランザクションは終了済み（ロールバックされた）
+                    self.skipped_event_ids += event.id - expected
+                else:
+                    if gap is None or event.id > gap[0]:
+                        self._gap = (event.id, batch.snapshot_xmax)
+                    break
+            events.append(event)
+            expected = event.id + 1
+
+        if self._gap is not None and expected >= self._gap[0]:
+            self._gap = None
+        return events
+
+    def _fan_out(self, events: list[FeedEvent]) -> None:
+        for subscription in list(self._subscribers):
+            for event in events:
+                if not subscription.deliver(event):
+                    self._subscribers.discard(subscription)
+                    self.dropped_subscribers += 1
+                    logger.warning("Dropped a slow order feed subscriber")
+                    break
+        self._last_event_id = events[-1].id
+        self.delivered += len(events)
+
+    async def stream(
+        self,
+        subscription: FeedSubscription,
+        last_event_id: int,
+        backlog: list[FeedEvent],
+        reset: bool = False,
+        heartbeat_seconds: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        1つのSSE接続へ送る文字列を生成する
+
+        まず制御イベント（ready、送り直しが上限を超えた場合はreset）と
+        送り直し分を送り、以降はキューに届いたイベントを送る。
+        購読開始と送り直しの読み出しが重なった分は、IDで重複を除く。
+
+        Args:
+            subscription: subscribeで得た受信キュー
+            last_event_id: クライアントが受信済みの最新イベントID
+            backlog: last_event_idより後のイベント
+            reset: 送り直しを打ち切った場合True（クライアントは一覧を再取得する）
+            heartbeat_seconds: ハートビートの間隔
+        """
+        heartbeat = heartbeat_seconds or settings.order_feed_heartbeat_seconds
+        try:
+            yield f"retry: {SSE_RETRY_MILLISECONDS}\n\n"
+            if reset:
+                yield sse_message("reset", {"last_event_id": last_event_id}, last_event_id)
+            else:
+                yield sse_message("ready", {"last_event_id": last_event_id}, last_event_id)
+
+            for event in backlog:
+                yield event.to_sse()
+                last_event_id = event.id
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    # 配信が追いつかない場合は切断し、クライアントの再接続で追いつかせる
+                    return
+                if event.id <= last_event_id:
+                    continue
+                yield event.to_sse()
+                last_event_id = event.id
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> dict[str, Any]:
+        """配信状況の統計情報"""
+        return {
+            "listening": self._task is not None and not self._task.done(),
+            "subscribers": len(self._subscribers),
+            "last_event_id": self._last_event_id,
+            "notifications": self.notifications,
+            "delivered": self.delivered,
+            "dropped_subscribers": self.dropped_subscribers,
+            "reconnects": self.reconnects,
+            "waiting_for_gap": self._gap is not None,
+            "skipped_event_ids": self.skipped_event_ids,
+        }
+
+
+# ワーカー内で共有する注文フィード
+order_feed = OrderFeed(
+    poll_seconds=settings.order_feed_poll_seconds,
+    queue_size=settings.order_feed_queue_size,
+)
@@ -0,0 +1,372 @@
+"""
+注文統計（日次集計テーブル）のCRUD操作
+注文の作成・ステータス変更時に差分を加算し、統計は集計テーブルの合計で返す
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Mapping, Optional, Sequence
+
+from sqlalchemy import Date, DateTime, cast, delete, desc, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models import (
+    Menu,
+    Order,
+    OrderArchive,
+    OrderDailyStat,
+    OrderDetail,
+    OrderDetailArchive,
+    OrderMenuDailyStat,
+    OrderStatus,
+)
+from app.schemas.admin import OrderStatistics, PopularMenuStat
+
+# 売上・人気メニューの集計から除外するステータス
+EXCLUDED_FROM_REVENUE = (OrderStatus.CANCELLED,)
+
+
+def order_date_column() -> ColumnElement[date]:
+    """注文日（データベースのタイムゾーンでのcreated_atの日付）"""
+    return cast(Order.created_at, Date)
+
+
+def date_range_filters(
+    column: ColumnElement[date],
+    date_from: Optional[date],
+    date_to: Optional[date],
+) -> list[ColumnElement[bool]]:
+    """日付列の範囲条件（終了日を含む）"""
+    filters: list[ColumnElement[bool]] = []
+    if date_from:
+        filters.append(column >= date_from)
+    if date_to:
+        filters.append(column <= date_to)
+    return filters
+
+
+class OrderStatsCRUD:
+    """注文統計のCRUD操作クラス"""
+
+    @staticmethod
+    async def apply_new_order(
+        db: AsyncSession,
+        created_at: datetime,
+        total_amount: Decimal,
+        details: Sequence[Mapping[str, Any]]
+    ) -> None:
+        """
+        作成した注文を日次集計に加算（注文テーブルを再読み込みしない）
+
+        注文の作成時に呼び出し元が保持している値（RETURNINGで得たcreated_at・合計金額・
+        明細）をそのままVALUESで渡し、2文のUPSERTで加算する。
+        集計日はapply_ordersと同じく、データベースのタイムゾーンでのcreated_atの日付。
+
+        Args:
+            db: データベースセッション
+            created_at: 注文の作成日時
+            total_amount: 注文の合計金額
+            details: 明細の一覧（menu_id・quantity・subtotalを持つ）。menu_idは重複しないこと
+        """
+        stat_date = cast(literal(created_at, DateTime(timezone=True)), Date)
+
+        stmt = insert(OrderDailyStat).values(
+            stat_date=stat_date,
+            status=OrderStatus.PENDING,
+            order_count=1,
+            revenue=total_amount,
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[OrderDailyStat.stat_date, OrderDailyStat.status],
+                set_={
+                    "order_count": OrderDailyStat.order_count + stmt.excluded.order_count,
+                    "revenue": OrderDailyStat.revenue + stmt.excluded.revenue,
+                },
+            )
+        )
+
+        if not details:
+            return
+        # デッドロックを避けるため、集計行はapply_ordersと同じくmenu_id順に更新する
+        stmt = insert(OrderMenuDailyStat).values(
+            [
+                {
+                    "stat_date": stat_date,
+                    "status": OrderStatus.PENDING,
+                    "menu_id": detail["menu_id"],
+                    "quantity": detail["quantity"],
+                    "revenue": detail["subtotal"],
+                }
+                for detail in sorted(details, key=lambda detail: detail["menu_id"])
+            ]
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    OrderMenuDailyStat.stat_date,
+                    OrderMenuDailyStat.status,
+                    OrderMenuDailyStat.menu_id,
+                ],
+                set_={
+                    "quantity": OrderMenuDailyStat.quantity + stmt.excluded.quantity,
+                    "revenue": OrderMenuDailyStat.revenue + stmt.excluded.revenue,
+                },
+            )
+        )
+
+    @staticmethod
+    async def apply_orders(
+        db: AsyncSession,
+        order_ids: Sequence[int],
+        sign: int = 1,
+        status: Optional[OrderStatus] = None
+    ) -> None:
+        """
+        注文の現在の状態を日次集計に加算（sign=-1で減算）
+
+        ステータス変更時に、変更前の分を減算・変更後の分を加算する
+        （注文の作成時は注文テーブルを再読み込みしないapply_new_orderを使う）。
+        ステータスを更新した後で変更前の分を減算する場合は、statusに変更前のステータスを渡す。
+        呼び出し元のトランザクション内で実行されるため、注文の変更と同時にコミットされる。
+        同じ日・ステータスの行を更新する注文同士は、コミットまでその行のロックを待つ
+        （デッドロックを避けるため、集計行は常に同じ順序で更新する）。
+
+        Args:
+            db: データベースセッション
+            order_ids: 対象の注文ID一覧
+            sign: 1で加算、-1で減算
+            status: 集計するステータス（省略時は注文の現在のステータス）
+        """
+        if not order_ids:
+            return
+
+        target = Order.id.in_(list(order_ids))
+        stat_date = order_date_column()
+        if status is None:
+            order_status = Order.status
+            group_keys = [stat_date, Order.status]
+        else:
+            order_status = literal(status, Order.status.type)
+            group_keys = [stat_date]
+
+        orders_delta = (
+            select(
+                stat_date,
+                order_status,
+                func.count(Order.id) * sign,
+                func.sum(Order.total_amount) * sign,
+            )
+            .where(target)
+            .group_by(*group_keys)
+            .order_by(*group_keys)
+        )
+        stmt = insert(OrderDailyStat).from_select(
+            ["stat_date", "status", "order_count", "revenue"], orders_delta
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[OrderDailyStat.stat_date, OrderDailyStat.status],
+                set_={
+                    "order_count": OrderDailyStat.order_count + stmt.excluded.order_count,
+                    "revenue": OrderDailyStat.revenue + stmt.excluded.revenue,
+                },
+            )
+        )
+
+        menus_delta = (
+            select(
+                stat_date,
+                order_status,
+                OrderDetail.menu_id,
+                func.sum(OrderDetail.quantity) * sign,
+                func.sum(OrderDetail.subtotal) * sign,
+            )
+            .join(
+                OrderDetail,
+                (OrderDetail.order_id == Order.id)
+                & (OrderDetail.created_at == Order.created_at),
+            )
+            .where(target)
+            .group_by(*group_keys, OrderDetail.menu_id)
+            .order_by(*group_keys, OrderDetail.menu_id)
+        )
+        stmt = insert(OrderMenuDailyStat).from_select(
+            ["stat_date", "status", "menu_id", "quantity", "revenue"], menus_delta
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    OrderMenuDailyStat.stat_date,
+                    OrderMenuDailyStat.status,
+                    OrderMenuDailyStat.menu_id,
+                ],
+                set_={
+                    "quantity": OrderMenuDailyStat.quantity + stmt.excluded.quantity,
+                    "revenue": OrderMenuDailyStat.revenue + stmt.excluded.revenue,
+                },
+            )
+        )
+
+    @staticmethod
+    async def rebuild(
+        db: AsyncSession,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> tuple[int, int]:
+        """
+        注文テーブルから日次集計を作り直す（バックフィル用）
+
+        指定した期間の集計行を削除し、orders・order_detailsから再集計する。
+        アーカイブ済みの注文（orders_archive・order_details_archive）も含める。
+        コミットは呼び出し元で行う。
+
+        Args:
+            db: データベースセッション
+            date_from: 対象期間の開始日（省略時は全期間）
+            date_to: 対象期間の終了日（この日を含む、省略時は全期間）
+
+        Returns:
+            tuple[int, int]: (注文集計の行数, メニュー別集計の行数)
+        """
+        for model in (OrderDailyStat, OrderMenuDailyStat):
+            await db.execute(
+                delete(model).where(
+                    *date_range_filters(model.stat_date, date_from, date_to)
+                )
+            )
+
+        orders = union_all(
+            *(
+                select(model.created_at, model.status, model.total_amount)
+                for model in (Order, OrderArchive)
+            )
+        ).subquery("all_orders")
+        details = union_all(
+            select(
+                Order.created_at,
+                Order.status,
+                OrderDetail.menu_id,
+                OrderDetail.quantity,
+                OrderDetail.subtotal,
+            ).join(
+                OrderDetail,
+                (OrderDetail.order_id == Order.id)
+                & (OrderDetail.created_at == Order.created_at),
+            ),
+            select(
+                OrderArchive.created_at,
+                OrderArchive.status,
+                OrderDetailArchive.menu_id,
+                OrderDetailArchive.quantity,
+                OrderDetailArchive.subtotal,
+            ).join(OrderDetailArchive, OrderDetailArchive.order_id == OrderArchive.id),
+        ).subquery("all_order_details")
+
+        orders_date = cast(orders.c.created_at, Date)
+        orders_result = await db.execute(
+            insert(OrderDailyStat).from_select(
+                ["stat_date", "status", "order_count", "revenue"],
+                select(
+                    orders_date,
+                    orders.c.status,
+                    func.count(),
+                    func.sum(orders.c.total_amount),
+                )
+                .where(*date_range_filters(orders_date, date_from, date_to))
+                .group_by(orders_date, orders.c.status),
+            )
+        )
+        details_date = cast(details.c.created_at, Date)
+        menus_result = await db.execute(
+            insert(OrderMenuDailyStat).from_select(
+                ["stat_date", "status", "menu_id", "quantity", "revenue"],
+                select(
+                    details_date,
+                    details.c.status,
+                    details.c.menu_id,
+                    func.sum(details.c.quantity),
+                    func.sum(details.c.subtotal),
+                )
+                .where(*date_range_filters(details_date, date_from, date_to))
+                .group_by(details_date, details.c.status, details.c.menu_id),
+            )
+        )
+        return orders_result.rowcount, menus_result.rowcount
+
+    @staticmethod
+    async def get_statistics(
+        db: AsyncSession,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        popular_limit: int = 5
+    ) -> OrderStatistics:
+        """
+        期間内の注文統計を日次集計テーブルから取得
+
+        注文数は全ステータス、売上と人気メニューはキャンセルを除いて集計する。
+        集計テーブルの行数は「日数 × ステータス数（× メニュー数）」に比例するため、
+        注文件数に関わらず2クエリで返す。
+
+        Args:
+            db: データベースセッション
+            date_from: 注文日の開始日
+            date_to: 注文日の終了日（この日を含む）
+            popular_limit: 人気メニューの件数
+
+        Returns:
+            OrderStatistics: 注文統計
+        """
+        status_rows = await db.execute(
+            select(
+                OrderDailyStat.status,
+                func.sum(OrderDailyStat.order_count).label("order_count"),
+                func.sum(OrderDailyStat.revenue).label("revenue"),
+            )
+            .where(*date_range_filters(OrderDailyStat.stat_date, date_from, date_to))
+            .group_by(OrderDailyStat.status)
+        )
+
+        status_breakdown = {status.value: 0 for status in OrderStatus}
+        total_orders = 0
+        total_revenue = Decimal("0")
+        for row in status_rows:
+            status_breakdown[row.status.value] = int(row.order_count)
+            total_orders += int(row.order_count)
+            if row.status not in EXCLUDED_FROM_REVENUE:
+                total_revenue += row.revenue
+
+        quantity = func.sum(OrderMenuDailyStat.quantity)
+        menu_rows = await db.execute(
+            select(
+                OrderMenuDailyStat.menu_id,
+                Menu.name.label("menu_name"),
+                quantity.label("order_count"),
+                func.sum(OrderMenuDailyStat.revenue).label("revenue"),
+            )
+            .join(Menu, Menu.id == OrderMenuDailyStat.menu_id)
+            .where(
+                *date_range_filters(OrderMenuDailyStat.stat_date, date_from, date_to),
+                OrderMenuDailyStat.status.not_in(EXCLUDED_FROM_REVENUE),
+            )
+            .group_by(OrderMenuDailyStat.menu_id, Menu.name)
+            .having(quantity > 0)
+            .order_by(desc(quantity), OrderMenuDailyStat.menu_id)
+            .limit(popular_limit)
+        )
+
+        return OrderStatistics(
+            total_orders=total_orders,
+            total_revenue=total_revenue,
+            status_breakdown=status_breakdown,
+            popular_menus=[
+                PopularMenuStat.model_validate(row, from_attributes=True)
+                for row in menu_rows
+            ],
+        )
+
+
+# CRUD操作のインスタンス
+order_stats_crud = OrderStatsCRUD()
@@ -0,0 +1,233 @@
+"""
+一覧取得のページネーション
+(created_at, id) の降順で並ぶ一覧を、OFFSETまたはキーセット（カーソル）で辿り、
+総件数の取得方法（正確・推定・なし）を切り替えるためのユーティリティ
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Generic, Protocol, Sequence, TypeVar
+
+from sqlalchemy import Select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.elements import ClauseElement, ColumnElement
+
+T = TypeVar("T")
+
+
+class TotalMode(str, Enum):
+    """一覧の総件数の取得方法"""
+    EXACT = "exact"          # 一覧と同じクエリ内でウィンドウ関数により正確に数える
+    ESTIMATED = "estimated"  # プランナの統計情報による推定値（大きな管理者向けテーブル用）
+    NONE = "none"            # 総件数を返さず、has_moreのみ判定する
+
+
+@dataclass
+class Page(Generic[T]):
+    """一覧取得の結果"""
+
+    items: list[T]
+    total: int | None
+    has_more: bool
+    total_estimated: bool = False
+
+
+class CursorItem(Protocol):
+    """カーソルを生成できる一覧アイテム"""
+
+    id: int
+    created_at: datetime
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """
+    (created_at, id) を不透明なカーソル文字列にエンコード
+
+    Args:
+        created_at: 作成日時
+        item_id: ID
+
+    Returns:
+        str: URLセーフなカーソル文字列
+    """
+    raw = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    カーソル文字列を (created_at, id) にデコード
+
+    Args:
+        cursor: encode_cursorで生成したカーソル文字列
+
+    Returns:
+        tuple[datetime, int]: (作成日時, ID)
+
+    Raises:
+        ValueError: カーソルの形式が不正な場合
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at_raw, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = datetime.fromisoformat(created_at_raw)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError("カーソルが不正です") from e
+
+    if not isinstance(item_id, int) or created_at.tzinfo is None:
+        raise ValueError("カーソルが不正です")
+    return created_at, item_id
+
+
+def keyset_filter(
+    created_at_column: InstrumentedAttribute[datetime] | ColumnElement[datetime],
+    id_column: InstrumentedAttribute[int] | ColumnElement[int],
+    cursor: str,
+) -> ColumnElement[bool]:
+    """
+    カーソルより後ろ（降順で次）の行を取得する条件を構築
+
+    (created_at, id) < (カーソルの作成日時, カーソルのID) の行比較で、
+    (…, created_at DESC, id DESC) のインデックスをそのまま辿れる
+
+    Raises:
+        ValueError: カーソルの形式が不正な場合
+    """
+    created_at, item_id = decode_cursor(cursor)
+    return tuple_(created_at_column, id_column) < tuple_(created_at, item_id)
+
+
+def next_cursor(items: Sequence[Any], has_more: bool) -> str | None:
+    """
+    ページの最後のアイテムから次ページのカーソルを生成
+
+    Args:
+        items: 取得したページ（CursorItemの一覧）
+        has_more: 次ページが存在するかどうか
+
+    Returns:
+        str | None: 次ページのカーソル（次ページがない場合はNone）
+    """
+    if not has_more or not items:
+        return None
+    last: CursorItem = items[-1]
+    return encode_cursor(last.created_at, last.id)
+
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) 文
+
+    対象のクエリと同じくバインドパラメータのままコンパイルする。
+    フィルタ値をSQLに埋め込まないため、pg_stat_statementsやスロークエリログにも
+    値は残らない。
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_count(db: AsyncSession, query: Select[Any]) -> int:
+    """
+    プランナの推定行数を取得（テーブルを走査しない）
+
+    フィルタ値はバインドパラメータとして渡すため、実行時の値に応じた推定になる。
+
+    Args:
+        db: データベースセッション
+        query: 件数を推定するクエリ（ページネーション前）
+
+    Returns:
+        int: 推定行数
+    """
+    result = await db.execute(Explain(query))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select[Any],
+    count_query: Select[Any],
+    *,
+    skip: int = 0,
+    limit: int,
+    cursor_filter: ColumnElement[bool] | None = None,
+    total_mode: TotalMode = TotalMode.EXACT,
+    scalars: bool = False,
+) -> Page[Any]:
+    """
+    フィルタ・並び順を適用済みのクエリから1ページ分を取得
+
+    limit+1件を取得してhas_moreを判定する。総件数はtotal_modeに応じて
+    EXACTでは同じ文の中で（OFFSET時はCOUNT(*) OVER ()、カーソル時は
+    スカラーサブクエリ）、ESTIMATEDではEXPLAINの推定行数から求める。
+
+    Args:
+        db: データベースセッション
+        query: フィルタと並び順を適用したクエリ（OFFSET・LIMITは未適用）
+        count_query: 同じフィルタのCOUNTクエリ
+        skip: スキップ件数（カーソル指定時は無視）
+        limit: 取得件数
+        cursor_filter: keyset_filterで作成したカーソル条件
+        total_mode: 総件数の取得方法
+        scalars: Trueの場合は各行の先頭要素（ORMエンティティなど）を返す
+
+    Returns:
+        Page[Any]: 取得した行と総件数
+    """
+    page_query = query
+    if cursor_filter is not None:
+        page_query = page_query.where(cursor_filter)
+    else:
+        page_query = page_query.offset(skip)
+
+    if total_mode == TotalMode.EXACT:
+        if cursor_filter is None:
+            total_column = func.count().over()
+        else:
+            total_column = count_query.correlate(None).scalar_subquery()
+        page_query = page_query.add_columns(total_column.label("total_count"))
+
+    rows = list((await db.execute(page_query.limit(limit + 1))).all())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    total: int | None = None
+    total_estimated = False
+    if total_mode == TotalMode.EXACT:
+        if rows:
+            total = rows[0][-1]
+        elif skip or cursor_filter is not None:
+            # 範囲外のページではウィンドウ関数の値が得られないため別途数える
+            total = (await db.execute(count_query)).scalar() or 0
+        else:
+            total = 0
+    elif total_mode == TotalMode.ESTIMATED:
+        seen = skip + len(rows) if cursor_filter is None else len(rows)
+        if cursor_filter is None and not has_more and (rows or not skip):
+            # 範囲内の最終ページであれば正確な件数が分かる
+            total = seen
+        else:
+            total = max(await estimate_count(db, query), seen + int(has_more))
+            total_estimated = True
+
+    items = [row[0] for row in rows] if scalars else rows
+    return Page(items=items, total=total, has_more=has_more, total_estimated=total_estimated)
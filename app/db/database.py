@@ -3,20 +3,119 @@
 SQLAlchemy 2.0+ asyncio対応
 """
 
-from typing import AsyncGenerator
+import time
+from typing import Any, AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
 
 from app.core.config import settings
+from app.core.slow_query_log import slow_query_log
+from app.db.query_stats import instrument_engine
 
 
-# 非同期エンジンを作成
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,  # デバッグモードでクエリログを出力
-    poolclass=NullPool,   # Alembicとの互換性のため
-)
+class WaitTimedQueue(AsyncAdaptedQueue):
+    """接続の返却を待った時間（get()の所要時間）をプールに記録するキュー"""
+
+    pool: "InstrumentedAsyncQueuePool | None" = None
+
+    def get(self, block: bool = True, timeout: float | None = None) -> Any:
+        started = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            if self.pool is not None:
+                self.pool.record_wait(time.perf_counter() - started)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    接続取得の待ち時間を計測するコネクションプール
+
+    プールサイズをワーカーごとに調整できるよう、
+    チェックアウト回数・待ち時間・タイムアウト回数を記録する。
+    待ち時間はプールのキューで接続の返却を待った時間のみで、
+    新しい接続の確立にかかった時間は接続時間として別に記録する
+    """
+
+    _queue_class = WaitTimedQueue
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._pool.pool = self
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.connects = 0
+        self.total_connect_seconds = 0.0
+        self.max_connect_seconds = 0.0
+
+    def record_wait(self, waited: float) -> None:
+        """キューで接続の返却を待った時間を記録"""
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def _do_get(self) -> Any:
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.checkouts += 1
+
+    def _create_connection(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            elapsed = time.perf_counter() - started
+            self.connects += 1
+            self.total_connect_seconds += elapsed
+            self.max_connect_seconds = max(self.max_connect_seconds, elapsed)
+
+
+def create_db_engine(use_null_pool: bool = False) -> AsyncEngine:
+    """
+    非同期エンジンを作成
+
+    Args:
+        use_null_pool: Trueの場合は接続をプールしない（Alembic・スクリプト用）
+
+    Returns:
+        AsyncEngine: 非同期エンジン
+    """
+    if use_null_pool:
+        return create_async_engine(
+            settings.database_url,
+            echo=settings.debug,  # デバッグモードでクエリログを出力
+            poolclass=NullPool,
+        )
+
+    return create_async_engine(
+        settings.database_url,
+        echo=settings.debug,  # デバッグモードでクエリログを出力
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_timeout=settings.db_pool_timeout,
+    )
+
+
+# Webプロセス用の非同期エンジン（コネクションプールあり）
+engine = create_db_engine()
+# リクエストごとのSQL文の実行回数・所要時間を計測する
+instrument_engine(engine)
 
 # 非同期セッションメーカーを作成
 AsyncSessionLocal = async_sessionmaker(
@@ -25,11 +124,55 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# スクリプト用のエンジンとセッションメーカー（NullPool）
+script_engine = create_db_engine(use_null_pool=True)
+
+ScriptSessionLocal = async_sessionmaker(
+    script_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# しきい値を超えたSQL文を記録する（EXPLAINはプール外の接続で取得する）
+slow_query_log.instrument(engine, explain_engine=script_engine)
+
+
+def get_pool_stats() -> dict[str, Any]:
+    """
+    コネクションプールの統計情報を取得
+
+    Returns:
+        dict[str, Any]: プールサイズ、使用中・待機中の接続数、オーバーフロー数、
+            接続取得の待ち時間、新しい接続の確立にかかった時間など
+    """
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedAsyncQueuePool):
+        return {"pool_class": type(pool).__name__}
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.db_max_overflow,
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "total_wait_seconds": pool.total_wait_seconds,
+        "avg_wait_seconds": (
+            pool.total_wait_seconds / pool.checkouts if pool.checkouts else 0.0
+        ),
+        "max_wait_seconds": pool.max_wait_seconds,
+        "connects": pool.connects,
+        "total_connect_seconds": pool.total_connect_seconds,
+        "max_connect_seconds": pool.max_connect_seconds,
+    }
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     データベースセッションを取得する依存性注入関数
-    
+
     Yields:
         AsyncSession: データベースセッション
     """
@@ -49,8 +192,17 @@ async def init_db() -> None:
     本番環境では使用せず、開発・テスト環境でのみ使用
     """
     from app.db.models import Base
-    
-    async with engine.begin() as conn:
+    from app.db.partitions import (
+        DEFAULT_MONTHS_AHEAD,
+        create_order_partitions,
+        get_current_month,
+    )
+
+    async with script_engine.begin() as conn:
         # 全テーブルを削除して再作成（注意: 本番環境では絶対に使用しない）
         await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+        # 注文テーブルはパーティションがないと書き込めないため、当月以降の分を作成
+        await create_order_partitions(
+            conn, await get_current_month(conn), DEFAULT_MONTHS_AHEAD + 1
+        )
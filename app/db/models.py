@@ -5,15 +5,19 @@ SQLAlchemy 2.0+ + asyncio対応
 MyPy完全対応のため、全ての型ヒントを記述
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 
 from sqlalchemy import (
     BigInteger,
     Boolean,
+    Date,
     DateTime,
     ForeignKey,
+    ForeignKeyConstraint,
+    Identity,
+    Index,
     Integer,
     Numeric,
     String,
@@ -23,6 +27,7 @@ from sqlalchemy import (
 from sqlalchemy import (
     Enum as SQLEnum,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -120,10 +125,13 @@ class User(Base):
     )
 
     # リレーション
+    # 注文はFKのON DELETE CASCADEで削除する（ユーザー削除時に注文を読み込まない）
     orders: Mapped[list["Order"]] = relationship(
         "Order",
         back_populates="user",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise"
     )
 
     def __repr__(self) -> str:
@@ -200,26 +208,46 @@ class Menu(Base):
     )
 
     # リレーション
+    # 注文履歴はFKのON DELETE RESTRICTで保護する（注文されたメニューは削除できない）
     order_details: Mapped[list["OrderDetail"]] = relationship(
         "OrderDetail",
         back_populates="menu",
-        cascade="all, delete-orphan"
+        passive_deletes="all",
+        lazy="raise"
     )
 
     def __repr__(self) -> str:
         return f"<Menu(id={self.id}, name='{self.name}', price={self.price})>"
 
 
+# メニュー一覧（販売状態・カテゴリで絞り込み、作成日時・IDの降順）
+Index(
+    "ix_menus_available_category_created_at",
+    Menu.is_available,
+    Menu.category,
+    Menu.created_at.desc(),
+    Menu.id.desc(),
+)
+
+
 class Order(Base):
-    """注文モデル"""
+    """
+    注文モデル
+
+    注文日時の月ごとにレンジパーティション化する（app.db.partitionsを参照）。
+    パーティションキーを含める必要があるため、テーブルの主キーは(id, created_at)だが、
+    idは単独で一意なのでORMの同一性はidのみで管理する
+    """
 
     __tablename__ = "orders"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
+    __mapper_args__ = {"primary_key": ["id"]}
 
     # 主キー
     id: Mapped[int] = mapped_column(
         BigInteger,
+        Identity(),
         primary_key=True,
-        autoincrement=True,
         comment="注文ID"
     )
 
@@ -228,7 +256,6 @@ class Order(Base):
         BigInteger,
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
         comment="注文者ユーザーID"
     )
 
@@ -237,7 +264,6 @@ class Order(Base):
         SQLEnum(OrderStatus),
         nullable=False,
         default=OrderStatus.PENDING,
-        index=True,
         comment="注文ステータス"
     )
 
@@ -266,9 +292,10 @@ class Order(Base):
         comment="注文備考"
     )
 
-    # タイムスタンプ
+    # タイムスタンプ（パーティションキー）
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         server_default=func.now(),
         comment="注文日時"
@@ -285,36 +312,80 @@ class Order(Base):
     # リレーション
     user: Mapped["User"] = relationship(
         "User",
-        back_populates="orders"
+        back_populates="orders",
+        lazy="raise"
     )
 
+    # 注文詳細はFKのON DELETE CASCADEで削除する
     order_details: Mapped[list["OrderDetail"]] = relationship(
         "OrderDetail",
         back_populates="order",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise"
     )
 
     def __repr__(self) -> str:
         return f"<Order(id={self.id}, user_id={self.user_id}, status='{self.status}', total={self.total_amount})>"
 
 
+# 注文一覧の絞り込みと並び順（作成日時・IDの降順）に合わせたインデックス
+# ユーザーの注文履歴（user_idで絞り込み）
+Index(
+    "ix_orders_user_id_created_at",
+    Order.user_id,
+    Order.created_at.desc(),
+    Order.id.desc(),
+)
+# 管理者の注文一覧（全件・期間指定、配達完了などの件数が多いステータス）
+Index(
+    "ix_orders_created_at",
+    Order.created_at.desc(),
+    Order.id.desc(),
+)
+# キッチン画面で参照する対応中の注文（件数が少ないため部分インデックスにする）
+Index(
+    "ix_orders_active_status_created_at",
+    Order.status,
+    Order.created_at.desc(),
+    Order.id.desc(),
+    postgresql_where=Order.status.in_(
+        [OrderStatus.PENDING, OrderStatus.PREPARING, OrderStatus.READY]
+    ),
+)
+
+
 class OrderDetail(Base):
-    """注文詳細モデル（注文内の各商品）"""
+    """
+    注文詳細モデル（注文内の各商品）
+
+    注文と同じ月のパーティションに入るよう、created_atは注文のcreated_atと一致させる
+    （注文と同じトランザクションで作成するため、server_defaultのnow()で揃う）。
+    注文への外部キーは(order_id, created_at)の複合キーで、この一致をデータベースで保証する
+    """
 
     __tablename__ = "order_details"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["order_id", "created_at"],
+            ["orders.id", "orders.created_at"],
+            ondelete="CASCADE",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
 
     # 主キー
     id: Mapped[int] = mapped_column(
         BigInteger,
+        Identity(),
         primary_key=True,
-        autoincrement=True,
         comment="注文詳細ID"
     )
 
     # 外部キー
     order_id: Mapped[int] = mapped_column(
         BigInteger,
-        ForeignKey("orders.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
         comment="注文ID"
@@ -347,9 +418,10 @@ class OrderDetail(Base):
         comment="小計（円）= quantity × unit_price"
     )
 
-    # タイムスタンプ
+    # タイムスタンプ（パーティションキー。注文のcreated_atと同じ値）
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         server_default=func.now(),
         comment="作成日時"
@@ -358,18 +430,313 @@ class OrderDetail(Base):
     # リレーション
     order: Mapped["Order"] = relationship(
         "Order",
-        back_populates="order_details"
+        back_populates="order_details",
+        lazy="raise"
     )
 
     menu: Mapped["Menu"] = relationship(
         "Menu",
-        back_populates="order_details"
+        back_populates="order_details",
+        lazy="raise"
     )
 
     def __repr__(self) -> str:
         return f"<OrderDetail(id={self.id}, order_id={self.order_id}, menu_id={self.menu_id}, qty={self.quantity})>"
 
 
+class OrderArchive(Base):
+    """
+    アーカイブ済みの注文モデル
+
+    一定期間が経過した配達完了・キャンセル済みの注文をordersから移したもの。
+    列はOrderと同じで、移した日時を持つ（app.crud.order_archiveを参照）
+    """
+
+    __tablename__ = "orders_archive"
+
+    # 主キー（ordersでのIDをそのまま使う）
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=False,
+        comment="注文ID"
+    )
+
+    # 外部キー
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="注文者ユーザーID"
+    )
+
+    # 注文情報
+    status: Mapped[OrderStatus] = mapped_column(
+        SQLEnum(OrderStatus),
+        nullable=False,
+        comment="注文ステータス"
+    )
+
+    total_amount: Mapped[Decimal] = mapped_column(
+        Numeric(10, 0),  # 小数点なし、最大10桁
+        nullable=False,
+        comment="合計金額（円）"
+    )
+
+    # 配達情報
+    delivery_address: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        comment="配達先住所"
+    )
+
+    delivery_time: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="希望配達時間"
+    )
+
+    notes: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="注文備考"
+    )
+
+    # タイムスタンプ
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="注文日時"
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="更新日時"
+    )
+
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        comment="アーカイブ日時"
+    )
+
+    # リレーション
+    # 注文詳細はFKのON DELETE CASCADEで削除する
+    order_details: Mapped[list["OrderDetailArchive"]] = relationship(
+        "OrderDetailArchive",
+        back_populates="order",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise"
+    )
+
+    def __repr__(self) -> str:
+        return f"<OrderArchive(id={self.id}, user_id={self.user_id}, status='{self.status}', total={self.total_amount})>"
+
+
+# ユーザーの注文履歴（user_idで絞り込み、作成日時・IDの降順）
+Index(
+    "ix_orders_archive_user_id_created_at",
+    OrderArchive.user_id,
+    OrderArchive.created_at.desc(),
+    OrderArchive.id.desc(),
+)
+
+
+class OrderDetailArchive(Base):
+    """アーカイブ済みの注文詳細モデル（列はOrderDetailと同じ）"""
+
+    __tablename__ = "order_details_archive"
+
+    # 主キー（order_detailsでのIDをそのまま使う）
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=False,
+        comment="注文詳細ID"
+    )
+
+    # 外部キー
+    order_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("orders_archive.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="注文ID"
+    )
+
+    # アーカイブ済みの注文履歴も、メニューの削除をON DELETE RESTRICTで防ぐ
+    menu_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("menus.id", ondelete="RESTRICT"),
+        nullable=False,
+        index=True,
+        comment="メニューID"
+    )
+
+    # 注文詳細情報
+    quantity: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="数量"
+    )
+
+    unit_price: Mapped[Decimal] = mapped_column(
+        Numeric(10, 0),  # 小数点なし、最大10桁
+        nullable=False,
+        comment="注文時の単価（円）"
+    )
+
+    subtotal: Mapped[Decimal] = mapped_column(
+        Numeric(10, 0),  # 小数点なし、最大10桁
+        nullable=False,
+        comment="小計（円）= quantity × unit_price"
+    )
+
+    # タイムスタンプ
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="作成日時"
+    )
+
+    # リレーション
+    order: Mapped["OrderArchive"] = relationship(
+        "OrderArchive",
+        back_populates="order_details",
+        lazy="raise"
+    )
+
+    menu: Mapped["Menu"] = relationship(
+        "Menu",
+        lazy="raise"
+    )
+
+    def __repr__(self) -> str:
+        return f"<OrderDetailArchive(id={self.id}, order_id={self.order_id}, menu_id={self.menu_id}, qty={self.quantity})>"
+
+
+class OrderDailyStat(Base):
+    """注文の日次集計（注文日・ステータスごと）"""
+
+    __tablename__ = "order_daily_stats"
+
+    stat_date: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True,
+        comment="注文日"
+    )
+
+    status: Mapped[OrderStatus] = mapped_column(
+        SQLEnum(OrderStatus),
+        primary_key=True,
+        comment="注文ステータス"
+    )
+
+    order_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="注文数"
+    )
+
+    revenue: Mapped[Decimal] = mapped_column(
+        Numeric(14, 0),
+        nullable=False,
+        default=0,
+        comment="合計金額（円）"
+    )
+
+    def __repr__(self) -> str:
+        return f"<OrderDailyStat(date={self.stat_date}, status='{self.status}', orders={self.order_count})>"
+
+
+class OrderMenuDailyStat(Base):
+    """メニュー別の注文日次集計（注文日・ステータス・メニューごと）"""
+
+    __tablename__ = "order_menu_daily_stats"
+
+    stat_date: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True,
+        comment="注文日"
+    )
+
+    status: Mapped[OrderStatus] = mapped_column(
+        SQLEnum(OrderStatus),
+        primary_key=True,
+        comment="注文ステータス"
+    )
+
+    menu_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("menus.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="メニューID"
+    )
+
+    quantity: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="数量の合計"
+    )
+
+    revenue: Mapped[Decimal] = mapped_column(
+        Numeric(14, 0),
+        nullable=False,
+        default=0,
+        comment="小計の合計（円）"
+    )
+
+    def __repr__(self) -> str:
+        return f"<OrderMenuDailyStat(date={self.stat_date}, status='{self.status}', menu_id={self.menu_id}, qty={self.quantity})>"
+
+
+class OrderEvent(Base):
+    """注文イベント（管理画面のライブフィード用。作成・ステータス変更を記録）"""
+
+    __tablename__ = "order_events"
+
+    # 主キー（単調増加。SSEのイベントIDとして使用）
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="イベントID"
+    )
+
+    order_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="注文ID"
+    )
+
+    event_type: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        comment="イベント種別"
+    )
+
+    payload: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        comment="注文の内容（JSON）"
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        comment="発生日時"
+    )
+
+    def __repr__(self) -> str:
+        return f"<OrderEvent(id={self.id}, order_id={self.order_id}, type='{self.event_type}')>"
+
+
 # 型ヒント用の追加定義（MyPy対応）
 __all__ = [
     "Base",
@@ -377,6 +744,11 @@ __all__ = [
     "Menu",
     "Order",
     "OrderDetail",
+    "OrderArchive",
+    "OrderDetailArchive",
+    "OrderDailyStat",
+    "OrderMenuDailyStat",
+    "OrderEvent",
     "UserRole",
     "OrderStatus",
     "MenuCategory",
@@ -0,0 +1,186 @@
+"""
+注文テーブルのパーティション管理
+orders・order_detailsを注文日時（created_at）の月ごとにレンジパーティション化する
+
+パーティション名は「テーブル名_pYYYY_MM」、範囲外の行を受けるデフォルトパーティションは
+「テーブル名_default」とする。月の境界はday_start（app.crud.order）と同じく
+データベースのタイムゾーンで解釈される。
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+# パーティション化するテーブル（注文詳細は注文と同じ月に入る）
+PARTITIONED_TABLES = ("orders", "order_details")
+
+# 当月から何か月先までパーティションを作成しておくか
+DEFAULT_MONTHS_AHEAD = 3
+
+# パーティション作成時にテーブルロックを待つ上限（稼働中の注文処理を止め続けない）
+PARTITION_LOCK_TIMEOUT = "5s"
+
+_PARTITION_NAME = re.compile(
+    r"^(?P<table>%s)_(?:p\d{4}_\d{2}|default)$" % "|".join(PARTITIONED_TABLES)
+)
+
+
+def month_start(day: date) -> date:
+    """日付が属する月の1日を返す"""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """月の1日にmonthsか月を加えた月の1日を返す"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """月パーティションのテーブル名"""
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def default_partition_name(table: str) -> str:
+    """デフォルトパーティションのテーブル名"""
+    return f"{table}_default"
+
+
+def partition_parent(name: str) -> str | None:
+    """
+    パーティションのテーブル名から親テーブル名を取得
+
+    Args:
+        name: テーブル名
+
+    Returns:
+        str | None: 親テーブル名（パーティションでない場合はNone）
+    """
+    match = _PARTITION_NAME.match(name)
+    return match.group("table") if match else None
+
+
+def month_partition_ddl(table: str, month: date) -> str:
+    """月パーティションを作成するDDL（作成済みの場合は何もしない）"""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def default_partition_ddl(table: str) -> str:
+    """デフォルトパーティションを作成するDDL（作成済みの場合は何もしない）"""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {default_partition_name(table)} "
+        f"PARTITION OF {table} DEFAULT"
+    )
+
+
+@dataclass
+class PartitionReport:
+    """パーティション作成の結果"""
+    created: list[str] = field(default_factory=list)
+    existing: list[str] = field(default_factory=list)
+    # デフォルトパーティションに行があるため作成できなかった月
+    blocked: list[date] = field(default_factory=list)
+
+
+async def get_current_month(db: AsyncSession | AsyncConnection) -> date:
+    """データベースのタイムゾーンでの当月の1日を取得"""
+    result = await db.execute(text("SELECT CAST(date_trunc('month', now()) AS date)"))
+    return result.scalar_one()
+
+
+async def get_partitions(db: AsyncSession | AsyncConnection, table: str) -> set[str]:
+    """
+    テーブルに接続済みのパーティション名を取得
+
+    Args:
+        db: データベースセッションまたは接続
+        table: 親テーブル名
+
+    Returns:
+        set[str]: パーティションのテーブル名
+    """
+    result = await db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )
+    return set(result.scalars().all())
+
+
+async def count_default_rows(
+    db: AsyncSession | AsyncConnection, table: str, month: date
+) -> int:
+    """デフォルトパーティションに入っている、指定した月の行数を取得"""
+    result = await db.execute(
+        text(
+            f"SELECT count(*) FROM {default_partition_name(table)} "
+            "WHERE created_at >= CAST(CAST(:start AS date) AS timestamptz) "
+            "AND created_at < CAST(CAST(:end AS date) AS timestamptz)"
+        ),
+        {"start": month, "end": add_months(month, 1)},
+    )
+    return result.scalar_one()
+
+
+async def create_order_partitions(
+    db: AsyncSession | AsyncConnection, start: date, months: int
+) -> PartitionReport:
+    """
+    startの月からmonthsか月分の月パーティションを作成（作成済みの月は何もしない）
+
+    デフォルトパーティションがなければ合わせて作成する。デフォルトパーティションに
+    その月の行が入っている場合は、PostgreSQLが作成を拒否するため作成せずに報告する。
+    コミットは呼び出し側で行う。
+
+    Args:
+        db: データベースセッションまたは接続
+        start: 最初の月（月の途中の日付でもよい）
+        months: 作成する月数
+
+    Returns:
+        PartitionReport: 作成したパーティション、作成済みのパーティション、作成できなかった月
+    """
+    report = PartitionReport()
+    await db.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+
+    existing: set[str] = set()
+    for table in PARTITIONED_TABLES:
+        existing |= await get_partitions(db, table)
+        if default_partition_name(table) not in existing:
+            await db.execute(text(default_partition_ddl(table)))
+            report.created.append(default_partition_name(table))
+
+    first = month_start(start)
+    for offset in range(months):
+        month = add_months(first, offset)
+        missing = [
+            table for table in PARTITIONED_TABLES
+            if partition_name(table, month) not in existing
+        ]
+        report.existing.extend(
+            partition_name(table, month) for table in PARTITIONED_TABLES
+            if table not in missing
+        )
+        # 注文と注文詳細は同じ月に入るため、どちらかが作成できない月は両方とも作成しない
+        blocked = False
+        for table in missing:
+            if default_partition_name(table) in existing:
+                blocked = blocked or await count_default_rows(db, table, month) > 0
+        if blocked:
+            report.blocked.append(month)
+            continue
+        for table in missing:
+            await db.execute(text(month_partition_ddl(table, month)))
+            report.created.append(partition_name(table, month))
+
+    return report
@@ -0,0 +1,101 @@
+"""
+SQL文の実行回数・所要時間の計測
+エンジンのイベントで、実行中のリクエスト（またはブロック）ごとにSQL文を数える
+"""
+
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class QueryStats:
+    """SQL文の実行回数と所要時間"""
+
+    count: int = 0
+    # DBでの所要時間（カーソルの実行開始から終了まで）の合計
+    seconds: float = 0.0
+    # SQL文ごとの実行回数（同じ文の繰り返し＝N+1の検出用）
+    statements: Counter[str] = field(default_factory=Counter)
+    # 外側で計測中のQueryStats（入れ子の場合、外側にも加算する）
+    parent: "QueryStats | None" = field(default=None, repr=False)
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        """最も多く実行されたSQL文とその回数（実行がなければNone）"""
+        if not self.statements:
+            return None
+        return self.statements.most_common(1)[0]
+
+
+# 計測中のQueryStats（計測していない場合はNone）
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    ブロック内で（計測対象のエンジンに）実行されたSQL文を数えるコンテキストマネージャ
+
+    入れ子にした場合、内側で実行されたSQL文は外側の計測結果にも含まれる。
+
+    Yields:
+        QueryStats: 計測結果（ブロック内で更新される）
+    """
+    stats = QueryStats(parent=current_query_stats.get())
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    stats = current_query_stats.get()
+    if stats is None:
+        return
+    while stats is not None:
+        stats.count += 1
+        stats.statements[statement] += 1
+        stats = stats.parent
+    context._query_stats_started = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    stats = current_query_stats.get()
+    started = getattr(context, "_query_stats_started", None)
+    if stats is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+    while stats is not None:
+        stats.seconds += elapsed
+        stats = stats.parent
+
+
+def instrument_engine(engine: AsyncEngine | Engine) -> None:
+    """
+    エンジンにSQL文の計測用のイベントを登録（登録済みの場合は何もしない）
+
+    計測はtrack_queries()のブロック内（リクエスト単位）でのみ行い、
+    それ以外では計測中かどうかの確認だけで戻る
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        if not event.contains(sync_engine, name, listener):
+            event.listen(sync_engine, name, listener)
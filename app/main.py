@@ -7,13 +7,25 @@ import logging
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, PlainTextResponse
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    MetricsMiddleware,
+    render_pool_metrics,
+    request_metrics,
+)
+from app.core.query_budget import QueryBudgetMiddleware
+from app.core.security import password_hash_executor
+from app.crud.auth import principal_cache
+from app.crud.menu_catalog import menu_catalog
+from app.crud.order_feed import order_feed
+from app.db.database import get_pool_stats
 
 # ロギング設定
 logging.basicConfig(level=logging.DEBUG)
@@ -28,6 +40,8 @@ def create_application() -> FastAPI:
         version=settings.app_version,
         description="弁当注文管理システムのAPI",
         debug=True,  # 強制的にデバッグモードを有効化
+        # JSONの生成をorjsonで行う（出力はJSONResponseと同じ）
+        default_response_class=ORJSONResponse,
     )
 
 
@@ -41,6 +55,20 @@ def create_application() -> FastAPI:
     )
 
 
+    # リクエストごとのSQL文の計測（デバッグモードではレスポンスヘッダーに出力）
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        budget=settings.query_budget,
+        repeat_threshold=settings.query_repeat_threshold,
+        expose_headers=settings.debug,
+    )
+
+
+    # リクエストのメトリクス（最も外側で計測する）
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
+
     # 静的ファイル設定
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -73,7 +101,24 @@ async def root():
 @app.get("/health")
 async def health_check():
     """ヘルスチェックエンドポイント"""
-    return {"status": "healthy", "app": settings.app_name}
+    return {
+        "status": "healthy",
+        "app": settings.app_name,
+        "db_pool": get_pool_stats(),
+        "principal_cache": principal_cache.stats(),
+        "menu_catalog": menu_catalog.stats(),
+        "order_feed": order_feed.stats(),
+        "password_hash": password_hash_executor.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """メトリクスエンドポイント（Prometheusのテキスト形式、ワーカーごとの値）"""
+    return PlainTextResponse(
+        request_metrics.render() + render_pool_metrics(get_pool_stats()),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
 
 
 @app.get("/menus", response_class=HTMLResponse)
@@ -36,6 +36,7 @@ from app.schemas.user import (
     UserCreate,
     UserInDB,
     UserLogin,
+    UserPrincipal,
     UserRegisterResponse,
     UserResponse,
 )
@@ -46,6 +47,7 @@ __all__ = [
     "UserLogin",
     "UserResponse",
     "UserInDB",
+    "UserPrincipal",
     "Token",
     "TokenData",
     "UserRegisterResponse",
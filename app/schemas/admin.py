@@ -5,6 +5,8 @@
 
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
+from typing import Any
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
@@ -66,9 +68,18 @@ class AdminOrderListResponse(BaseModel):
     """管理者用注文一覧レスポンススキーマ"""
 
     items: list[AdminOrderSummaryResponse] = Field(..., description="注文一覧")
-    total: int = Field(..., ge=0, description="総件数")
+    total: int | None = Field(
+        ..., ge=0, description="総件数（total_mode=noneの場合はnull）"
+    )
     limit: int = Field(..., ge=1, description="取得件数")
     offset: int = Field(..., ge=0, description="開始位置")
+    has_more: bool = Field(False, description="次ページが存在するかどうか")
+    total_estimated: bool = Field(
+        False, description="totalが統計情報による推定値かどうか"
+    )
+    next_cursor: str | None = Field(
+        None, description="次ページのカーソル（キーセットページネーション用）"
+    )
 
 
 class OrderStatusUpdate(BaseModel):
@@ -87,6 +98,47 @@ class OrderStatusUpdateResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class BulkOrderStatusUpdate(BaseModel):
+    """注文ステータス一括更新用スキーマ"""
+
+    order_ids: list[int] = Field(
+        ..., min_length=1, max_length=200, description="注文ID一覧（最大200件）"
+    )
+    status: OrderStatus = Field(..., description="新しい注文ステータス")
+
+
+class BulkOrderStatusOutcome(str, Enum):
+    """注文ステータス一括更新の注文ごとの結果"""
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+    NOT_FOUND = "not_found"
+    INVALID_TRANSITION = "invalid_transition"
+
+
+class BulkOrderStatusResult(BaseModel):
+    """注文ステータス一括更新の注文ごとの結果スキーマ"""
+
+    order_id: int = Field(..., description="注文ID")
+    result: BulkOrderStatusOutcome = Field(..., description="結果")
+    previous_status: OrderStatus | None = Field(
+        None, description="更新前のステータス（注文が存在しない場合はnull）"
+    )
+    status: OrderStatus | None = Field(
+        None, description="現在のステータス（注文が存在しない場合はnull）"
+    )
+    updated_at: datetime | None = Field(None, description="更新日時（更新した場合のみ）")
+
+
+class BulkOrderStatusResponse(BaseModel):
+    """注文ステータス一括更新レスポンススキーマ"""
+
+    status: OrderStatus = Field(..., description="指定した注文ステータス")
+    updated: int = Field(..., ge=0, description="更新した注文数")
+    results: list[BulkOrderStatusResult] = Field(
+        ..., description="注文ごとの結果（指定した順）"
+    )
+
+
 class PopularMenuStat(BaseModel):
     """人気メニュー統計スキーマ"""
 
@@ -105,6 +157,34 @@ class OrderStatistics(BaseModel):
     popular_menus: list[PopularMenuStat] = Field(..., description="人気メニュー一覧")
 
 
+class SlowQueryResponse(BaseModel):
+    """スロークエリレスポンススキーマ"""
+
+    recorded_at: datetime = Field(..., description="記録日時")
+    duration_ms: float = Field(..., description="実行時間（ミリ秒）")
+    statement: str = Field(..., description="SQL文")
+    parameters: list[str] = Field(..., description="パラメータの型名（値は記録しない）")
+    endpoint: str | None = Field(
+        None, description="呼び出し元のリクエスト（メソッドとルート）"
+    )
+    plan: Any | None = Field(
+        None, description="EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) の結果"
+    )
+    plan_error: str | None = Field(None, description="EXPLAINを取得できなかった理由")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SlowQueryLogResponse(BaseModel):
+    """スロークエリログレスポンススキーマ"""
+
+    threshold_ms: float = Field(..., description="記録するしきい値（ミリ秒、0は無効）")
+    explain: bool = Field(..., description="EXPLAINを取得するかどうか")
+    max_entries: int = Field(..., description="保持する記録の上限")
+    recorded: int = Field(..., description="これまでに記録した件数（破棄した分を含む）")
+    items: list[SlowQueryResponse] = Field(..., description="スロークエリ一覧（新しい順）")
+
+
 # 型ヒント用のエイリアス
 __all__ = [
     "AdminOrderSummaryResponse",
@@ -113,6 +193,12 @@ __all__ = [
     "AdminOrderListResponse",
     "OrderStatusUpdate",
     "OrderStatusUpdateResponse",
+    "BulkOrderStatusUpdate",
+    "BulkOrderStatusOutcome",
+    "BulkOrderStatusResult",
+    "BulkOrderStatusResponse",
     "PopularMenuStat",
     "OrderStatistics",
+    "SlowQueryResponse",
+    "SlowQueryLogResponse",
 ]
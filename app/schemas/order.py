@@ -79,9 +79,18 @@ class OrderListResponse(BaseModel):
     """注文一覧レスポンス用スキーマ"""
 
     items: list[OrderSummaryResponse] = Field(..., description="注文一覧")
-    total: int = Field(..., ge=0, description="総件数")
+    total: int | None = Field(
+        ..., ge=0, description="総件数（total_mode=noneの場合はnull）"
+    )
     limit: int = Field(..., ge=1, description="取得件数")
     offset: int = Field(..., ge=0, description="開始位置")
+    has_more: bool = Field(False, description="次ページが存在するかどうか")
+    total_estimated: bool = Field(
+        False, description="totalが統計情報による推定値かどうか"
+    )
+    next_cursor: str | None = Field(
+        None, description="次ページのカーソル（キーセットページネーション用）"
+    )
 
 
 # カート関連のスキーマ
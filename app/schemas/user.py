@@ -48,6 +48,17 @@ class UserInDB(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserPrincipal(BaseModel):
+    """認証済みユーザー（プリンシパル）スキーマ"""
+
+    id: int = Field(..., description="ユーザーID")
+    email: str = Field(..., description="メールアドレス")
+    role: UserRole = Field(..., description="ユーザーロール")
+    is_active: bool = Field(..., description="アカウント有効フラグ")
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
 class Token(BaseModel):
     """トークンレスポンス用スキーマ"""
 
@@ -75,6 +86,7 @@ __all__ = [
     "UserLogin",
     "UserResponse",
     "UserInDB",
+    "UserPrincipal",
     "Token",
     "TokenData",
     "UserRegisterResponse",
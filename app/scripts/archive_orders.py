@@ -0,0 +1,117 @@
+"""
+注文のアーカイブスクリプト
+一定期間が経過した配達完了・キャンセル済みの注文を、注文詳細とともに
+アーカイブテーブル（orders_archive・order_details_archive）へバッチ単位で移す
+
+バッチごとに移した件数・処理速度・行ロックの保持時間を出力する。
+稼働中に実行する場合は、--pause-secondsでバッチの間に間隔を空ける。
+
+使い方:
+    python -m app.scripts.archive_orders
+    python -m app.scripts.archive_orders --older-than-days 90 --batch-size 1000
+    python -m app.scripts.archive_orders --max-batches 10 --pause-seconds 0.5
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.crud.order_archive import ArchiveBatchResult, order_archive_crud
+from app.db.database import ScriptSessionLocal
+
+# ロガーの設定
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def archive_orders(
+    older_than_days: int,
+    batch_size: int,
+    max_batches: Optional[int],
+    pause_seconds: float,
+) -> list[ArchiveBatchResult]:
+    """
+    対象の注文がなくなるまで（またはmax_batchesに達するまで）バッチを繰り返す
+
+    Returns:
+        list[ArchiveBatchResult]: 注文を移したバッチの結果
+    """
+    before = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    logger.info(
+        "Archiving delivered/cancelled orders created before %s (batch size %d)",
+        before.isoformat(),
+        batch_size,
+    )
+
+    results: list[ArchiveBatchResult] = []
+    async with ScriptSessionLocal() as db:
+        while max_batches is None or len(results) < max_batches:
+            result = await order_archive_crud.archive_batch(db, before, batch_size)
+            if not result.orders:
+                break
+            results.append(result)
+            logger.info(
+                "Batch %d: %d orders, %d order details in %.1f ms "
+                "(lock held %.1f ms, %.0f orders/s, %.0f order details/s)",
+                len(results),
+                result.orders,
+                result.order_details,
+                result.statement_seconds * 1000,
+                result.lock_seconds * 1000,
+                result.orders_per_second,
+                result.order_details_per_second,
+            )
+            if result.orders < batch_size:
+                break
+            if pause_seconds:
+                await asyncio.sleep(pause_seconds)
+
+    orders = sum(result.orders for result in results)
+    order_details = sum(result.order_details for result in results)
+    lock_seconds = sum(result.lock_seconds for result in results)
+    logger.info(
+        "Archived %d orders and %d order details in %d batches "
+        "(%.0f orders/s while locked, max lock held %.1f ms)",
+        orders,
+        order_details,
+        len(results),
+        orders / lock_seconds if lock_seconds else 0.0,
+        max((result.lock_seconds for result in results), default=0.0) * 1000,
+    )
+    return results
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="古い注文をアーカイブテーブルへ移す")
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=settings.order_archive_after_days,
+        help=f"この日数より前の注文を移す（既定: {settings.order_archive_after_days}）",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.order_archive_batch_size,
+        help=f"1トランザクションで移す注文の上限（既定: {settings.order_archive_batch_size}）",
+    )
+    parser.add_argument(
+        "--max-batches", type=int, default=None, help="実行するバッチ数の上限"
+    )
+    parser.add_argument(
+        "--pause-seconds", type=float, default=0.0, help="バッチの間に待つ秒数"
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        archive_orders(
+            args.older_than_days, args.batch_size, args.max_batches, args.pause_seconds
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
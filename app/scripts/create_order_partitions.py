@@ -0,0 +1,92 @@
+"""
+注文パーティションの作成スクリプト
+orders・order_detailsの月パーティションを事前に作成する（作成済みの月は何もしない）
+
+月が変わる前に作成しておかないと、その月の注文はデフォルトパーティションに入り、
+後からその月のパーティションを作成できなくなる。cronなどで定期的に実行すること。
+
+使い方:
+    python -m app.scripts.create_order_partitions
+    python -m app.scripts.create_order_partitions --months-ahead 6
+    python -m app.scripts.create_order_partitions --start 2024-01-01 --months-ahead 0
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import date
+from typing import Optional
+
+from app.db.database import ScriptSessionLocal
+from app.db.partitions import (
+    DEFAULT_MONTHS_AHEAD,
+    add_months,
+    create_order_partitions,
+    get_current_month,
+)
+
+# ロガーの設定
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def create_partitions(start: Optional[date], months_ahead: int) -> bool:
+    """
+    startの月から当月のmonths_ahead先の月までのパーティションを作成する
+
+    Returns:
+        bool: 全ての月を作成できた（または作成済みだった）場合True
+    """
+    async with ScriptSessionLocal() as db:
+        try:
+            current = await get_current_month(db)
+            first = start or current
+            months = max(
+                (current.year - first.year) * 12 + current.month - first.month, 0
+            ) + months_ahead + 1
+            report = await create_order_partitions(db, first, months)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+    for name in report.created:
+        logger.info("Created partition %s", name)
+    logger.info(
+        "Partitions for %s to %s: %d created, %d already existed",
+        first.strftime("%Y-%m"),
+        add_months(first, months - 1).strftime("%Y-%m"),
+        len(report.created),
+        len(report.existing),
+    )
+    for month in report.blocked:
+        logger.error(
+            "Partition for %s was not created: the default partition already has rows "
+            "for that month. Move them out of the default partition before retrying.",
+            month.strftime("%Y-%m"),
+        )
+    return not report.blocked
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="注文テーブルの月パーティションを作成")
+    parser.add_argument(
+        "--start",
+        type=date.fromisoformat,
+        default=None,
+        help="最初の月（YYYY-MM-DD、既定: 当月）",
+    )
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=DEFAULT_MONTHS_AHEAD,
+        help=f"当月から何か月先まで作成するか（既定: {DEFAULT_MONTHS_AHEAD}）",
+    )
+    args = parser.parse_args()
+    ok = asyncio.run(create_partitions(args.start, args.months_ahead))
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
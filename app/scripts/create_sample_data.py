@@ -9,14 +9,14 @@ from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.database import AsyncSessionLocal
+from app.db.database import ScriptSessionLocal
 from app.db.models import Menu, MenuCategory, User, UserRole
 from app.core.security import get_password_hash
 
 
 async def create_sample_data():
     """サンプルデータを作成"""
-    async with AsyncSessionLocal() as db:
+    async with ScriptSessionLocal() as db:
         try:
             # サンプルメニューデータ
             sample_menus = [
@@ -7,7 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_password_hash
-from app.db.database import AsyncSessionLocal
+from app.db.database import ScriptSessionLocal
 from app.db.models import User, UserRole
 
 # ロガーの設定
@@ -46,7 +46,7 @@ async def create_store_user(db: AsyncSession):
 
 async def main():
     """メイン処理"""
-    async with AsyncSessionLocal() as db:
+    async with ScriptSessionLocal() as db:
         await create_store_user(db)
 
 if __name__ == "__main__":
@@ -0,0 +1,297 @@
+"""
+CRUD クエリの実行計画確認スクリプト
+生成した注文データに対して各CRUD操作を実行し、発行されたSELECTを
+EXPLAIN (ANALYZE, BUFFERS) して使われたインデックスを表示する
+
+データの生成から確認までを1トランザクションで行い、最後にロールバックする
+（--keepを指定した場合のみコミットする）。
+
+使い方:
+    python -m app.scripts.explain_queries
+    python -m app.scripts.explain_queries --orders 200000 --users 2000 --verbose
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.menu import menu_crud
+from app.crud.menu_catalog import load_available_menus
+from app.crud.order import order_crud
+from app.crud.order_events import order_event_crud
+from app.crud.order_stats import order_stats_crud
+from app.crud.pagination import TotalMode, next_cursor
+from app.db.database import ScriptSessionLocal, script_engine
+from app.db.models import MenuCategory, OrderStatus
+from app.db.partitions import add_months, create_order_partitions, get_current_month, partition_parent
+
+# ロガーの設定
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# シーケンシャルスキャンを許容しないテーブル（件数が多くなるもの）
+LARGE_TABLES = frozenset({"orders", "order_details"})
+
+# パーティションのインデックス名の接頭辞（orders_p2024_01_、orders_default_など）
+_PARTITION_PREFIX = re.compile(r"^(orders|order_details)_(?:p\d{4}_\d{2}|default)_")
+
+
+@dataclass
+class ExplainResult:
+    """1クエリ分の実行計画の要約"""
+    label: str
+    statement: str
+    execution_ms: float
+    indexes: list[str] = field(default_factory=list)
+    seq_scans: list[str] = field(default_factory=list)
+    # 参照した注文パーティション（日付範囲で絞り込めていれば一部だけになる）
+    partitions: list[str] = field(default_factory=list)
+    plan: dict[str, Any] = field(default_factory=dict)
+
+
+def collect_plan_nodes(node: dict[str, Any], result: ExplainResult) -> None:
+    """実行計画のノードを辿り、使われたインデックスとシーケンシャルスキャンを記録"""
+    if "Index Name" in node:
+        # パーティションごとのインデックスは「orders_*_...」にまとめて表示する
+        index = _PARTITION_PREFIX.sub(r"\1_*_", node["Index Name"])
+        if index not in result.indexes:
+            result.indexes.append(index)
+    relation = node.get("Relation Name")
+    if relation and partition_parent(relation) == "orders" and relation not in result.partitions:
+        result.partitions.append(relation)
+    # 空のパーティション（先の月・デフォルト）は行を読まないため対象外
+    rows_read = node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)
+    if node.get("Node Type") == "Seq Scan" and rows_read:
+        # パーティションは親テーブル名で判定する
+        result.seq_scans.append(partition_parent(relation or "") or relation or "?")
+    for child in node.get("Plans", []):
+        collect_plan_nodes(child, result)
+
+
+async def generate_data(db: AsyncSession, users: int, menus: int, orders: int) -> None:
+    """
+    注文データを生成（ユーザー・メニュー・注文・注文詳細）
+
+    注文は過去1年に分散させ、大半を配達完了、直近の一部を対応中のステータスにする。
+    生成する期間の月パーティションも作成する（ロールバックすれば一緒に消える）。
+    """
+    current = await get_current_month(db)
+    await create_order_partitions(db, add_months(current, -12), 13)
+    await db.execute(
+        text(
+            """
+            INSERT INTO users (email, name, hashed_password, role, is_active)
+            SELECT 'explain-' || g || '@example.com', 'user' || g, 'x', 'CUSTOMER', true
+            FROM generate_series(1, :users) AS g
+            """
+        ),
+        {"users": users},
+    )
+    await db.execute(
+        text(
+            """
+            INSERT INTO menus (name, price, category, is_available, created_at)
+            SELECT 'menu' || g, 400 + (g % 10) * 50,
+                   (ARRAY['MEAT', 'FISH', 'VEGETABLE', 'OTHER'])[1 + g % 4]::menucategory,
+                   g % 5 <> 0,
+                   now() - make_interval(days => g)
+            FROM generate_series(1, :menus) AS g
+            """
+        ),
+        {"menus": menus},
+    )
+    await db.execute(
+        text(
+            """
+            INSERT INTO orders (user_id, status, total_amount, delivery_address, created_at, updated_at)
+            SELECT u.id,
+                   CASE
+                       WHEN g.age < interval '1 hour' THEN
+                           (ARRAY['PENDING', 'PREPARING', 'READY'])[1 + g.n % 3]::orderstatus
+                       WHEN g.n % 20 = 0 THEN 'CANCELLED'::orderstatus
+                       ELSE 'DELIVERED'::orderstatus
+                   END,
+                   500, '東京都', now() - g.age, now() - g.age
+            FROM (
+                SELECT n, (:orders - n) * (interval '365 days' / :orders) AS age,
+                       1 + (n * 7919) % :users AS user_no
+                FROM generate_series(1, :orders) AS n
+            ) AS g
+            JOIN (
+                SELECT id, row_number() OVER (ORDER BY id) AS user_no
+                FROM users WHERE email LIKE 'explain-%'
+            ) AS u ON u.user_no = g.user_no
+            """
+        ),
+        {"orders": orders, "users": users},
+    )
+    await db.execute(
+        text(
+            """
+            INSERT INTO order_details (order_id, menu_id, quantity, unit_price, subtotal, created_at)
+            SELECT o.id, m.id, 1, m.price, m.price, o.created_at
+            FROM orders o
+            CROSS JOIN LATERAL (
+                SELECT id, price FROM menus
+                ORDER BY id OFFSET o.id % :menus LIMIT 1 + o.id % 2
+            ) AS m
+            """
+        ),
+        {"menus": menus},
+    )
+    await order_stats_crud.rebuild(db)
+    await db.execute(text("ANALYZE users, menus, orders, order_details"))
+
+
+async def explain_crud_queries(db: AsyncSession) -> list[ExplainResult]:
+    """各CRUD操作を実行し、発行されたSELECTをEXPLAIN ANALYZEする"""
+    captured: list[tuple[str, str, Any]] = []
+    label = ""
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((label, statement, parameters))
+
+    user_id = (
+        await db.execute(
+            text("SELECT user_id FROM orders GROUP BY user_id ORDER BY count(*) DESC LIMIT 1")
+        )
+    ).scalar_one()
+    order_id = (await db.execute(text("SELECT max(id) FROM orders"))).scalar_one()
+    today = date.today()
+
+    async def user_orders_second_page() -> None:
+        page = await order_crud.get_user_orders(db, user_id, limit=20)
+        await order_crud.get_user_orders(
+            db, user_id, limit=20, cursor=next_cursor(page.items, page.has_more)
+        )
+
+    async def admin_orders_second_page() -> None:
+        page = await order_crud.get_admin_orders(db, limit=50)
+        await order_crud.get_admin_orders(
+            db, limit=50, cursor=next_cursor(page.items, page.has_more)
+        )
+
+    cases: list[tuple[str, Callable[[], Awaitable[Any]]]] = [
+        ("menus: available", lambda: menu_crud.get_menus(db)),
+        ("menus: available + category", lambda: menu_crud.get_menus(db, category=MenuCategory.FISH)),
+        ("menus: catalog snapshot", lambda: load_available_menus(db)),
+        ("orders(user): first page", lambda: order_crud.get_user_orders(db, user_id)),
+        (
+            "orders(user): status",
+            lambda: order_crud.get_user_orders(db, user_id, status=OrderStatus.DELIVERED),
+        ),
+        ("orders(user): cursor page", user_orders_second_page),
+        ("orders(admin): all", lambda: order_crud.get_admin_orders(db)),
+        (
+            "orders(admin): pending",
+            lambda: order_crud.get_admin_orders(
+                db, status=OrderStatus.PENDING, total_mode=TotalMode.EXACT
+            ),
+        ),
+        (
+            "orders(admin): delivered",
+            lambda: order_crud.get_admin_orders(db, status=OrderStatus.DELIVERED),
+        ),
+        (
+            "orders(admin): last 7 days",
+            lambda: order_crud.get_admin_orders(
+                db, date_from=today - timedelta(days=7), date_to=today
+            ),
+        ),
+        ("orders(admin): cursor page", admin_orders_second_page),
+        ("order detail", lambda: order_crud.get_order_by_id(db, order_id)),
+        ("order stats: 30 days", lambda: order_stats_crud.get_statistics(
+            db, date_from=today - timedelta(days=30), date_to=today
+        )),
+        ("order events", lambda: order_event_crud.get_events_after(db, 0, 500)),
+    ]
+
+    listen_target = script_engine.sync_engine
+    event.listen(listen_target, "before_cursor_execute", capture)
+    try:
+        for case_label, run in cases:
+            label = case_label
+            await run()
+    finally:
+        event.remove(listen_target, "before_cursor_execute", capture)
+
+    conn = await db.connection()
+    results: list[ExplainResult] = []
+    for case_label, statement, parameters in captured:
+        explained = await conn.exec_driver_sql(
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters
+        )
+        plan = explained.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        result = ExplainResult(
+            label=case_label,
+            statement=statement,
+            execution_ms=plan[0]["Execution Time"],
+            plan=plan[0]["Plan"],
+        )
+        collect_plan_nodes(result.plan, result)
+        results.append(result)
+    return results
+
+
+async def explain_queries(
+    users: int, menus: int, orders: int, keep: bool, verbose: bool
+) -> bool:
+    """データを生成して実行計画を表示する（大きなテーブルのシーケンシャルスキャンがなければTrue）"""
+    async with ScriptSessionLocal() as db:
+        try:
+            logger.info("Generating %d users, %d menus, %d orders", users, menus, orders)
+            await generate_data(db, users=users, menus=menus, orders=orders)
+            results = await explain_crud_queries(db)
+            if keep:
+                await db.commit()
+            else:
+                await db.rollback()
+        except Exception:
+            await db.rollback()
+            raise
+
+    ok = True
+    for result in results:
+        large_seq_scans = sorted(set(result.seq_scans) & LARGE_TABLES)
+        ok = ok and not large_seq_scans
+        print(
+            f"{'NG' if large_seq_scans else 'OK'}  {result.label:<30} "
+            f"{result.execution_ms:8.2f} ms  "
+            f"partitions={len(result.partitions) or '-'}  "
+            f"index={','.join(result.indexes) or '-'}"
+            + (f"  seq_scan={','.join(large_seq_scans)}" if large_seq_scans else "")
+        )
+        if verbose:
+            print("    " + " ".join(result.statement.split()))
+            print(json.dumps(result.plan, indent=2, ensure_ascii=False))
+    return ok
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="CRUDクエリの実行計画を確認")
+    parser.add_argument("--users", type=int, default=1000, help="生成するユーザー数")
+    parser.add_argument("--menus", type=int, default=50, help="生成するメニュー数")
+    parser.add_argument("--orders", type=int, default=100000, help="生成する注文数")
+    parser.add_argument("--keep", action="store_true", help="生成したデータをコミットする")
+    parser.add_argument("--verbose", action="store_true", help="SQLと実行計画を表示する")
+    args = parser.parse_args()
+    ok = asyncio.run(
+        explain_queries(args.users, args.menus, args.orders, args.keep, args.verbose)
+    )
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+注文イベントの削除スクリプト
+ライブフィードの送り直しに使わなくなった古いorder_eventsを削除する
+
+使い方:
+    python -m app.scripts.prune_order_events
+    python -m app.scripts.prune_order_events --keep-hours 48
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app.crud.order_events import order_event_crud
+from app.db.database import ScriptSessionLocal
+
+# ロガーの設定
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def prune_order_events(keep_hours: float) -> None:
+    """指定時間より前に発生したイベントを削除する"""
+    before = datetime.now(timezone.utc) - timedelta(hours=keep_hours)
+    async with ScriptSessionLocal() as db:
+        try:
+            deleted = await order_event_crud.prune(db, before)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+    logger.info("Pruned %d order events created before %s", deleted, before.isoformat())
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="古い注文イベントを削除")
+    parser.add_argument(
+        "--keep-hours", type=float, default=24.0, help="残す時間（既定: 24時間）"
+    )
+    args = parser.parse_args()
+    asyncio.run(prune_order_events(args.keep_hours))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+注文統計の日次集計テーブル再構築スクリプト
+orders・order_details（アーカイブ済みの注文を含む）から日次集計をバックフィル・再計算する
+
+使い方:
+    python -m app.scripts.rebuild_order_stats
+    python -m app.scripts.rebuild_order_stats --date-from 2024-01-01 --date-to 2024-01-31
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import date
+
+from app.crud.order_stats import order_stats_crud
+from app.db.database import ScriptSessionLocal
+
+# ロガーの設定
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_order_stats(date_from: date | None, date_to: date | None) -> None:
+    """指定期間（省略時は全期間）の日次集計を1トランザクションで作り直す"""
+    async with ScriptSessionLocal() as db:
+        try:
+            order_rows, menu_rows = await order_stats_crud.rebuild(
+                db, date_from=date_from, date_to=date_to
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+    logger.info(
+        "Rebuilt order stats (%s - %s): %d order rows, %d menu rows",
+        date_from or "*",
+        date_to or "*",
+        order_rows,
+        menu_rows,
+    )
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="注文統計の日次集計を再構築")
+    parser.add_argument("--date-from", type=date.fromisoformat, help="開始日（YYYY-MM-DD）")
+    parser.add_argument("--date-to", type=date.fromisoformat, help="終了日（YYYY-MM-DD）")
+    args = parser.parse_args()
+    asyncio.run(rebuild_order_stats(args.date_from, args.date_to))
+
+
+if __name__ == "__main__":
+    main()
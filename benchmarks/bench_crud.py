@@ -0,0 +1,354 @@
+"""
+CRUD層のマイクロベンチマーク
+
+MenuCRUD・OrderCRUD・crud.authの各メソッドを、注文件数を変えたデータセットで
+個別に実行し、所要時間（中央値・p95）とSQL文の数を計測する。
+テーブルの件数に対する各操作の伸び方を確認し、性能の劣化を操作単位で検出するためのもの。
+
+あわせて、データベースを使用しないレスポンスの構築（MenuResponse.model_validateと、
+明細1・10・100件の注文のbuild_order_response）の所要時間を計測する。
+
+実行方法:
+    TEST_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_crud
+    python -m benchmarks.bench_crud --orders 1000 10000 100000 --repeat 30 --output crud.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.security import get_password_hash
+from app.crud import auth as auth_crud
+from app.crud.menu import menu_crud
+from app.crud.order import build_order_response, order_crud
+from app.db.models import MenuCategory, Order, OrderStatus, User
+from app.schemas.menu import MenuCreate, MenuResponse, MenuUpdate
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.schemas.user import UserCreate
+from benchmarks.common import (
+    count_queries,
+    create_benchmark_engine,
+    create_benchmark_sessionmaker,
+    reset_schema,
+    seed_menus,
+    seed_orders,
+    seed_user,
+)
+
+# crud.authのログイン・登録に使うパスワード
+PASSWORD = "benchmark-password"
+
+# レスポンスの構築を計測する注文の明細数
+LINE_ITEM_COUNTS = (1, 10, 100)
+
+
+@dataclass
+class Case:
+    """計測する操作（setupは計測前に毎回実行し、所要時間に含めない）"""
+
+    name: str
+    run: Callable[[AsyncSession], Awaitable[Any]]
+    setup: Callable[[AsyncSession], Awaitable[Any]] | None = None
+
+
+@dataclass
+class Dataset:
+    """シード済みのデータ"""
+
+    menu_ids: list[int]
+    user_ids: list[int]
+    order_ids: list[int]
+    # パスワードを設定したユーザー（crud.authの計測に使う）
+    email: str
+
+
+async def seed_dataset(
+    session_maker: async_sessionmaker[AsyncSession],
+    menus: int,
+    users: int,
+    orders: int,
+    seed: int,
+) -> Dataset:
+    """メニュー・ユーザー・注文をシード"""
+    async with session_maker() as db:
+        menu_ids = await seed_menus(db, menus)
+        user_ids = [
+            await seed_user(db, email=f"bench{i}@example.com") for i in range(users)
+        ]
+        email = "bench0@example.com"
+        await db.execute(
+            update(User)
+            .where(User.email == email)
+            .values(hashed_password=get_password_hash(PASSWORD))
+        )
+        await db.commit()
+        order_ids = await seed_orders(db, user_ids, menu_ids, orders, seed=seed)
+    return Dataset(menu_ids, user_ids, order_ids, email)
+
+
+def build_cases(data: Dataset) -> list[Case]:
+    """計測する操作の一覧"""
+    menu_id = data.menu_ids[0]
+    user_id = data.user_ids[0]
+    order_id = data.order_ids[len(data.order_ids) // 2]
+    batch = data.order_ids[:20]
+    new_user_numbers = itertools.count()
+    disposable_menu_ids: list[int] = []
+
+    order_data = OrderCreate(
+        items=[OrderItemCreate(menu_id=menu_id, quantity=1) for menu_id in data.menu_ids[:3]],
+        delivery_address="ベンチマーク",
+    )
+    menu_data = MenuCreate(name="ベンチマーク追加", price=Decimal(500), category=MenuCategory.OTHER)
+
+    async def reset_status(db: AsyncSession, order_ids: list[int]) -> None:
+        # 毎回同じ遷移（pending → preparing）を計測するため、ステータスを戻す
+        await db.execute(
+            update(Order).where(Order.id.in_(order_ids)).values(status=OrderStatus.PENDING)
+        )
+        await db.commit()
+
+    async def add_disposable_menu(db: AsyncSession) -> None:
+        # 注文されていないメニューのみ削除できるため、削除用のメニューを作成する
+        disposable_menu_ids.extend(await seed_menus(db, 1))
+
+    async def evict_principal(db: AsyncSession) -> None:
+        auth_crud.invalidate_principal(data.email)
+
+    async def warm_principal(db: AsyncSession) -> None:
+        await auth_crud.get_principal_by_email(db, data.email)
+
+    def new_user() -> UserCreate:
+        return UserCreate(
+            email=f"new{next(new_user_numbers)}@example.com", password=PASSWORD, name="新規"
+        )
+
+    return [
+        # MenuCRUD
+        Case("menu.get_menus", lambda db: menu_crud.get_menus(db, limit=20)),
+        Case("menu.get_menus_version", lambda db: menu_crud.get_menus_version(db)),
+        Case("menu.get_menu_by_id", lambda db: menu_crud.get_menu_by_id(db, menu_id)),
+        Case(
+            "menu.get_menus_by_ids(10)",
+            lambda db: menu_crud.get_menus_by_ids(db, data.menu_ids[:10]),
+        ),
+        Case("menu.create_menu", lambda db: menu_crud.create_menu(db, menu_data)),
+        Case(
+            "menu.update_menu",
+            lambda db: menu_crud.update_menu(db, menu_id, MenuUpdate(description="更新")),
+        ),
+        Case(
+            "menu.delete_menu",
+            lambda db: menu_crud.delete_menu(db, disposable_menu_ids.pop()),
+            setup=add_disposable_menu,
+        ),
+        # OrderCRUD
+        Case(
+            "order.create_order(3 items)",
+            lambda db: order_crud.create_order(db, order_data, user_id),
+        ),
+        Case("order.get_user_orders", lambda db: order_crud.get_user_orders(db, user_id)),
+        Case("order.get_admin_orders", lambda db: order_crud.get_admin_orders(db)),
+        Case(
+            "order.get_admin_orders(status)",
+            lambda db: order_crud.get_admin_orders(db, status=OrderStatus.READY),
+        ),
+        Case("order.get_order_by_id", lambda db: order_crud.get_order_by_id(db, order_id)),
+        Case(
+            "order.get_order_version",
+            lambda db: order_crud.get_order_version(db, order_id),
+        ),
+        Case(
+            "order.get_order_items_count",
+            lambda db: order_crud.get_order_items_count(db, order_id),
+        ),
+        Case(
+            "order.update_order_status",
+            lambda db: order_crud.update_order_status(db, order_id, OrderStatus.PREPARING),
+            setup=lambda db: reset_status(db, [order_id]),
+        ),
+        Case(
+            "order.bulk_update_order_status(20)",
+            lambda db: order_crud.bulk_update_order_status(db, batch, OrderStatus.PREPARING),
+            setup=lambda db: reset_status(db, batch),
+        ),
+        # crud.auth
+        Case("auth.get_user_by_email", lambda db: auth_crud.get_user_by_email(db, data.email)),
+        Case(
+            "auth.get_principal_by_email(miss)",
+            lambda db: auth_crud.get_principal_by_email(db, data.email),
+            setup=evict_principal,
+        ),
+        Case(
+            "auth.get_principal_by_email(hit)",
+            lambda db: auth_crud.get_principal_by_email(db, data.email),
+            setup=warm_principal,
+        ),
+        Case("auth.create_user", lambda db: auth_crud.create_user(db, new_user())),
+        Case(
+            "auth.authenticate_user",
+            lambda db: auth_crud.authenticate_user(db, data.email, PASSWORD),
+        ),
+    ]
+
+
+async def measure(
+    engine: AsyncEngine,
+    session_maker: async_sessionmaker[AsyncSession],
+    case: Case,
+    repeat: int,
+) -> dict[str, Any]:
+    """
+    操作をrepeat回（それぞれ新しいセッションで）実行して計測
+
+    Returns:
+        dict[str, Any]: 所要時間の中央値・p95（ミリ秒）とSQL文の数
+            （操作が例外を送出した場合は例外の内容のみ）
+    """
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        async with session_maker() as db:
+            if case.setup is not None:
+                await case.setup(db)
+            with count_queries(engine) as counter:
+                started = time.perf_counter()
+                try:
+                    await case.run(db)
+                except Exception as e:
+                    # 1つの操作の失敗で他の操作の計測を止めない
+                    return {"error": f"{type(e).__name__}: {str(e).splitlines()[0]}"}
+                timings.append(time.perf_counter() - started)
+            queries = counter.count
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "p95_ms": round(timings[int((len(timings) - 1) * 0.95)] * 1000, 3),
+        "queries": queries,
+    }
+
+
+def measure_conversion(convert: Callable[[], Any], loops: int, repeat: int) -> float:
+    """変換をloops回実行する計測をrepeat回行い、1回あたりの中央値（マイクロ秒）を返す"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            convert()
+        timings.append((time.perf_counter() - started) / loops)
+    return round(statistics.median(timings) * 1_000_000, 2)
+
+
+async def bench_conversions(
+    session_maker: async_sessionmaker[AsyncSession],
+    data: Dataset,
+    loops: int,
+    repeat: int,
+) -> dict[str, float]:
+    """
+    レスポンスの構築（データベースを使用しない部分）を計測
+
+    Returns:
+        dict[str, float]: 変換ごとの1回あたりの所要時間（マイクロ秒）
+    """
+    results = {}
+    async with session_maker() as db:
+        menu = await menu_crud.get_menu_by_id(db, data.menu_ids[0])
+        results["MenuResponse.model_validate"] = measure_conversion(
+            lambda: MenuResponse.model_validate(menu), loops, repeat
+        )
+
+        for lines in LINE_ITEM_COUNTS:
+            created = await order_crud.create_order(
+                db,
+                OrderCreate(
+                    items=[
+                        OrderItemCreate(menu_id=menu_id, quantity=1)
+                        for menu_id in data.menu_ids[:lines]
+                    ],
+                    delivery_address="ベンチマーク",
+                ),
+                data.user_ids[0],
+            )
+            order = await order_crud.get_order_by_id(db, created.id)
+            results[f"build_order_response({lines} items)"] = measure_conversion(
+                lambda: build_order_response(order), max(loops // lines, 10), repeat
+            )
+    return results
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.menus < max(LINE_ITEM_COUNTS):
+        raise SystemExit(f"--menus must be at least {max(LINE_ITEM_COUNTS)}")
+
+    engine = create_benchmark_engine()
+    session_maker = create_benchmark_sessionmaker(engine)
+    report: dict[str, Any] = {"crud": {}, "conversions_us": {}}
+
+    print(f"{'orders':>7} | {'operation':<36} | {'median ms':>9} | {'p95 ms':>8} | {'queries':>7}")
+    print("-" * 80)
+    for orders in args.orders:
+        await reset_schema(engine)
+        auth_crud.principal_cache.clear()
+        data = await seed_dataset(session_maker, args.menus, args.users, orders, args.seed)
+
+        results = {}
+        for case in build_cases(data):
+            result = await measure(engine, session_maker, case, args.repeat)
+            results[case.name] = result
+            if "error" in result:
+                print(f"{orders:>7} | {case.name:<36} | error: {result['error']}")
+                continue
+            print(
+                f"{orders:>7} | {case.name:<36} | {result['median_ms']:>9.3f} | "
+                f"{result['p95_ms']:>8.3f} | {result['queries']:>7}"
+            )
+        report["crud"][str(orders)] = results
+    print()
+
+    report["conversions_us"] = await bench_conversions(
+        session_maker, data, args.loops, args.repeat
+    )
+    print(f"{'conversion':<36} | {'median us':>9}")
+    print("-" * 48)
+    for name, micros in report["conversions_us"].items():
+        print(f"{name:<36} | {micros:>9.2f}")
+
+    await engine.dispose()
+
+    if args.output:
+        report["config"] = {
+            "orders": args.orders,
+            "menus": args.menus,
+            "users": args.users,
+            "repeat": args.repeat,
+            "loops": args.loops,
+            "seed": args.seed,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--orders", type=int, nargs="+", default=[1000, 10000], help="シードする注文の件数"
+    )
+    parser.add_argument("--menus", type=int, default=100, help="シードするメニューの件数")
+    parser.add_argument("--users", type=int, default=50, help="シードするユーザーの人数")
+    parser.add_argument("--repeat", type=int, default=30, help="操作ごとの計測回数")
+    parser.add_argument("--loops", type=int, default=1000, help="変換の計測1回あたりの実行回数")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    parser.add_argument("--output", help="結果のJSONの出力先（省略時は出力しない）")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,139 @@
+"""
+メトリクスミドルウェアのオーバーヘッドのベンチマーク
+
+データベースを使わない最小のエンドポイントをASGIで直接呼び出し、
+MetricsMiddlewareの有無で1リクエストあたりの処理時間を比較する。
+ミドルウェア自体のコストは、何もしないASGIアプリケーションを包んだ場合の差で求める。
+HTTPサーバー・ネットワークを含まないため、実際のリクエストに対する割合はこれより小さい。
+/metricsの出力にかかる時間も計測する。データベースは使用しない。
+
+実行方法:
+    python -m benchmarks.bench_metrics_overhead --requests 20000 --routes 40
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import MetricsMiddleware, RequestMetrics
+
+
+def build_app(metrics: RequestMetrics | None) -> FastAPI:
+    """最小のエンドポイントを持つアプリケーションを作成"""
+    app = FastAPI()
+
+    @app.get("/api/v1/orders/{order_id}")
+    async def get_order(order_id: int) -> dict[str, Any]:
+        return {"id": order_id, "status": "pending"}
+
+    if metrics is not None:
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return app
+
+
+async def plain_app(scope: Scope, receive: Receive, send: Send) -> None:
+    """ルーティングもJSON生成もしない最小のASGIアプリケーション"""
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def call(app: ASGIApp, path: str) -> None:
+    """ASGIアプリケーションをGETリクエストで直接呼び出す"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(apps: list[ASGIApp], requests: int, rounds: int) -> list[float]:
+    """
+    各アプリケーションの1リクエストあたりの処理時間の中央値（マイクロ秒）
+
+    実行環境の揺らぎの影響を揃えるため、ラウンドごとに交互に計測する
+    """
+    paths = [f"/api/v1/orders/{i}" for i in range(requests)]
+    for app in apps:
+        for path in paths[:200]:
+            await call(app, path)
+    timings: list[list[float]] = [[] for _ in apps]
+    for _ in range(rounds):
+        for app, app_timings in zip(apps, timings):
+            started = time.perf_counter()
+            for path in paths:
+                await call(app, path)
+            app_timings.append((time.perf_counter() - started) / requests)
+    return [statistics.median(app_timings) * 1_000_000 for app_timings in timings]
+
+
+def measure_render(routes: int) -> tuple[float, int]:
+    """routes個のルート×3ステータスの系列がある場合の/metrics出力の時間（ミリ秒）とサイズ"""
+    metrics = RequestMetrics()
+    for route in range(routes):
+        for status in ("200", "404", "500"):
+            metrics.latency.observe(("GET", f"/api/v1/route{route}/{{id}}", status), 0.01)
+    started = time.perf_counter()
+    body = metrics.render()
+    return (time.perf_counter() - started) * 1000, len(body)
+
+
+async def main(requests: int, rounds: int, routes: int) -> None:
+    plain, plain_instrumented, baseline, instrumented = await measure(
+        [
+            plain_app,
+            MetricsMiddleware(plain_app, RequestMetrics()),
+            build_app(None),
+            build_app(RequestMetrics()),
+        ],
+        requests,
+        rounds,
+    )
+    print(f"{'app':>20} | {'no metrics':>10} | {'with metrics':>12} | {'overhead':>8}")
+    print("-" * 60)
+    for label, without, with_metrics in (
+        ("bare ASGI app", plain, plain_instrumented),
+        ("FastAPI route", baseline, instrumented),
+    ):
+        print(
+            f"{label:>20} | {without:>8.1f}us | {with_metrics:>10.1f}us | "
+            f"{with_metrics - without:>6.1f}us"
+        )
+    overhead = plain_instrumented - plain
+    print(
+        f"middleware cost: {overhead:.1f} us/request "
+        f"({overhead / baseline * 100:.1f}% of a minimal FastAPI request)"
+    )
+
+    render_ms, size = measure_render(routes)
+    print(f"/metrics render: {render_ms:.2f} ms for {routes * 3} series ({size} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--routes", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.rounds, args.routes))
@@ -0,0 +1,87 @@
+"""
+注文作成時のメニュー解決ベンチマーク
+
+明細ごとにget_menu_by_idを呼ぶ従来方式と、get_menus_by_idsで
+1クエリにまとめる方式のラウンドトリップ数と所要時間を比較する。
+
+実行方法:
+    TEST_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_order_menu_lookup
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.menu import menu_crud
+from app.crud.order import order_crud
+from app.schemas.order import OrderCreate, OrderItemCreate
+from benchmarks.common import (
+    count_queries,
+    create_benchmark_engine,
+    create_benchmark_sessionmaker,
+    reset_schema,
+    seed_menus,
+    seed_user,
+)
+
+
+async def resolve_per_item(db: AsyncSession, order_data: OrderCreate) -> None:
+    """従来方式: 明細ごとにメニューを取得"""
+    for item in order_data.items:
+        await menu_crud.get_menu_by_id(db, item.menu_id)
+
+
+async def resolve_batched(db: AsyncSession, order_data: OrderCreate) -> None:
+    """新方式: 注文内のメニューを1クエリで取得"""
+    await menu_crud.get_menus_by_ids(db, (item.menu_id for item in order_data.items))
+
+
+async def main(line_counts: list[int], repeat: int) -> None:
+    engine = create_benchmark_engine()
+    session_maker = create_benchmark_sessionmaker(engine)
+    await reset_schema(engine)
+
+    async with session_maker() as db:
+        menu_ids = await seed_menus(db, max(line_counts))
+        user_id = await seed_user(db)
+
+    print(f"{'lines':>5} | {'lookup':>8} | {'round trips':>11} | {'median ms':>9}")
+    print("-" * 45)
+    for lines in line_counts:
+        order_data = OrderCreate(
+            items=[OrderItemCreate(menu_id=menu_id, quantity=1) for menu_id in menu_ids[:lines]],
+            delivery_address="ベンチマーク",
+        )
+        for label, resolver in (("per-item", resolve_per_item), ("batched", resolve_batched)):
+            timings = []
+            round_trips = 0
+            for _ in range(repeat):
+                async with session_maker() as db:
+                    started = time.perf_counter()
+                    with count_queries(engine) as counter:
+                        await resolver(db, order_data)
+                    timings.append(time.perf_counter() - started)
+                    round_trips = counter.count
+            print(
+                f"{lines:>5} | {label:>8} | {round_trips:>11} | "
+                f"{statistics.median(timings) * 1000:>9.2f}"
+            )
+
+        # create_order全体のラウンドトリップ数
+        async with session_maker() as db:
+            with count_queries(engine) as counter:
+                await order_crud.create_order(db, order_data, user_id)
+        print(f"{lines:>5} | {'create':>8} | {counter.count:>11} | {counter.elapsed_seconds * 1000:>9.2f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.lines, args.repeat))
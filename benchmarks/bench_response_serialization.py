@@ -0,0 +1,134 @@
+"""
+レスポンスのJSONシリアライズのベンチマーク
+
+response_modelを指定したエンドポイントと同じ処理（レスポンスモデルの検証・
+JSON互換の値への変換）の後、JSONResponse（標準のjson）とORJSONResponse（orjson）で
+JSONを生成する時間を比較する。両者の出力が同じバイト列であることも確認する。
+データベースは使用しない。
+
+実行方法:
+    python -m benchmarks.bench_response_serialization --orders 50 200 1000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from app.db.models import OrderStatus
+from app.schemas.admin import AdminOrderListResponse, AdminOrderSummaryResponse
+from app.schemas.order import OrderDetailResponse, OrderResponse
+
+STATUSES = list(OrderStatus)
+
+
+def build_admin_order_list(count: int) -> AdminOrderListResponse:
+    """管理者用注文一覧（count件）のレスポンスを作成"""
+    now = datetime.now(timezone.utc)
+    return AdminOrderListResponse(
+        items=[
+            AdminOrderSummaryResponse(
+                id=i + 1,
+                user_id=i % 100 + 1,
+                user_name=f"ベンチマーク太郎{i % 100}",
+                user_email=f"bench{i % 100}@example.com",
+                status=STATUSES[i % len(STATUSES)],
+                total_amount=Decimal(500 + i % 20 * 50),
+                delivery_address="東京都渋谷区神南1-2-3",
+                delivery_time=now + timedelta(hours=1),
+                notes="辛さ控えめでお願いします" if i % 3 == 0 else None,
+                items_count=i % 5 + 1,
+                created_at=now - timedelta(minutes=i),
+                updated_at=now,
+            )
+            for i in range(count)
+        ],
+        total=count,
+        limit=count,
+        offset=0,
+        has_more=False,
+    )
+
+
+def build_order(items: int) -> OrderResponse:
+    """注文詳細（items明細）のレスポンスを作成"""
+    now = datetime.now(timezone.utc)
+    return OrderResponse(
+        id=1,
+        user_id=1,
+        status=OrderStatus.PREPARING,
+        total_amount=Decimal(600 * items),
+        delivery_address="東京都渋谷区神南1-2-3",
+        delivery_time=None,
+        notes=None,
+        items=[
+            OrderDetailResponse(
+                id=i + 1,
+                menu_id=i + 1,
+                menu_name=f"ベンチマーク弁当{i}",
+                quantity=1,
+                unit_price=Decimal("600"),
+                subtotal=Decimal("600"),
+            )
+            for i in range(items)
+        ],
+        created_at=now,
+        updated_at=now,
+    )
+
+
+async def render(
+    field: Any, model: BaseModel, response_class: type[JSONResponse]
+) -> bytes:
+    """エンドポイントと同じ手順でレスポンスのJSONを生成"""
+    content = await serialize_response(field=field, response_content=model)
+    return response_class(content).body
+
+
+async def measure(
+    model: BaseModel, response_class: type[JSONResponse], repeat: int
+) -> float:
+    """JSON生成の所要時間の中央値（ミリ秒）"""
+    field = create_response_field(name="response", type_=type(model))
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await render(field, model, response_class)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def main(order_counts: list[int], repeat: int) -> None:
+    cases = [(f"admin list x{count}", build_admin_order_list(count)) for count in order_counts]
+    cases += [(f"order x{count} items", build_order(count)) for count in order_counts]
+
+    print(f"{'payload':>22} | {'bytes':>8} | {'json ms':>8} | {'orjson ms':>9} | {'speedup':>7}")
+    print("-" * 67)
+    for label, model in cases:
+        field = create_response_field(name="response", type_=type(model))
+        expected = await render(field, model, JSONResponse)
+        if await render(field, model, ORJSONResponse) != expected:
+            raise SystemExit(f"{label}: ORJSONResponse output differs from JSONResponse")
+
+        json_ms = await measure(model, JSONResponse, repeat)
+        orjson_ms = await measure(model, ORJSONResponse, repeat)
+        print(
+            f"{label:>22} | {len(expected):>8} | {json_ms:>8.2f} | "
+            f"{orjson_ms:>9.2f} | {json_ms / orjson_ms:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.orders, args.repeat))
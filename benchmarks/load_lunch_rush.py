@@ -0,0 +1,462 @@
+"""
+昼のピーク時間帯を想定した負荷試験
+
+app.main.appをASGIで直接呼び出し（ネットワークを介さない）、次の操作を混在させて実行する。
+
+- 顧客: メニューの閲覧・ログイン・注文（カートの送信）・注文履歴のページング
+- 店舗管理者: 注文一覧の確認とステータスの更新
+
+乱数のシードと操作回数を固定しているため、同じ引数であれば同じ順序で操作を行う。
+ルートごとのスループット・レイテンシ（p50/p95/p99）・1リクエストあたりのSQL文の数・
+エラー率をJSONに出力する（キーを整列して出力するため、コミット間でdiffを取れる）。
+
+データベースはTEST_DATABASE_URL（docker-composeのdbなど）を使用し、実行のたびに
+全テーブルを削除して再作成する。--embeddedを指定した場合は、pgserverで起動した
+ローカルのPostgreSQLを使用する（pip install pgserver）。
+
+実行方法:
+    TEST_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.load_lunch_rush
+    python -m benchmarks.load_lunch_rush --embedded /tmp/bento_pgdata --output lunch_rush.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+
+from benchmarks.common import (
+    create_benchmark_sessionmaker,
+    get_benchmark_database_url,
+    reset_schema,
+    seed_menus,
+)
+
+# 顧客のログインに使うパスワード（全員共通）
+CUSTOMER_PASSWORD = "lunch-rush-password"
+
+# 顧客の操作と重み（昼のピークはメニューの閲覧が大半で、注文・履歴の確認が続く）
+CUSTOMER_ACTIONS = (
+    ("browse_menus", 40),
+    ("view_menu", 15),
+    ("submit_cart", 20),
+    ("page_history", 15),
+    ("login", 10),
+)
+
+# 店舗管理者が進める注文ステータス（キャンセルは行わない）
+ADMIN_STATUS_FLOW = {
+    "pending": "preparing",
+    "preparing": "ready",
+    "ready": "delivered",
+}
+
+
+@dataclass
+class RouteStats:
+    """ルートごとの計測結果"""
+
+    latencies: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    db_seconds: list[float] = field(default_factory=list)
+    status_codes: Counter[str] = field(default_factory=Counter)
+    errors: int = 0
+
+
+@dataclass
+class LoadTestContext:
+    """仮想ユーザー間で共有する状態"""
+
+    client: httpx.AsyncClient
+    menu_ids: list[int]
+    customers: list[tuple[str, str]]  # (メールアドレス, アクセストークン)
+    admin_token: str
+    track_queries: Callable[[], Any]
+    routes: dict[str, RouteStats] = field(default_factory=dict)
+
+    async def request(
+        self, route: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response | None:
+        """
+        リクエストを送信し、ルートのテンプレートごとに計測結果を記録
+
+        Args:
+            route: 集計に使うルートの表記（メソッドとルートのテンプレート）
+            method: HTTPメソッド
+            url: リクエストURL
+            **kwargs: httpx.AsyncClient.requestに渡す引数
+
+        Returns:
+            httpx.Response | None: レスポンス（アプリケーションが例外を送出した場合はNone）
+        """
+        stats = self.routes.setdefault(route, RouteStats())
+        response: httpx.Response | None = None
+        # httpxのASGI転送は同じタスク内でアプリケーションを呼ぶため、
+        # アプリケーション内で実行されたSQL文もこのブロックで数えられる
+        with self.track_queries() as query_stats:
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except Exception as e:
+                stats.status_codes[type(e).__name__] += 1
+            elapsed = time.perf_counter() - started
+
+        stats.latencies.append(elapsed)
+        stats.queries.append(query_stats.count)
+        stats.db_seconds.append(query_stats.seconds)
+        if response is None or response.status_code >= 400:
+            stats.errors += 1
+        if response is not None:
+            stats.status_codes[str(response.status_code)] += 1
+        return response
+
+
+def auth_headers(token: str) -> dict[str, str]:
+    """Bearerトークンの認証ヘッダー"""
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def run_customer(
+    ctx: LoadTestContext, rng: random.Random, iterations: int
+) -> None:
+    """顧客の仮想ユーザー（重みに従って操作を選ぶ）"""
+    email, token = rng.choice(ctx.customers)
+    actions = [name for name, _ in CUSTOMER_ACTIONS]
+    weights = [weight for _, weight in CUSTOMER_ACTIONS]
+
+    for _ in range(iterations):
+        action = rng.choices(actions, weights)[0]
+        if action == "browse_menus":
+            offset = rng.choice((0, 10, 20))
+            await ctx.request(
+                "GET /api/v1/menus/", "GET", f"/api/v1/menus/?limit=10&offset={offset}"
+            )
+        elif action == "view_menu":
+            menu_id = rng.choice(ctx.menu_ids)
+            await ctx.request(
+                "GET /api/v1/menus/{menu_id}", "GET", f"/api/v1/menus/{menu_id}"
+            )
+        elif action == "submit_cart":
+            lines = rng.sample(ctx.menu_ids, rng.randint(1, 4))
+            await ctx.request(
+                "POST /api/v1/orders/",
+                "POST",
+                "/api/v1/orders/",
+                json={
+                    "items": [
+                        {"menu_id": menu_id, "quantity": rng.randint(1, 3)}
+                        for menu_id in lines
+                    ],
+                    "delivery_address": "東京都千代田区1-1-1",
+                },
+                headers=auth_headers(token),
+            )
+        elif action == "page_history":
+            # 1ページ目を取得し、続きがあればカーソルで次のページへ進む
+            url = "/api/v1/orders/?per_page=10"
+            for _ in range(rng.randint(1, 3)):
+                response = await ctx.request(
+                    "GET /api/v1/orders/", "GET", url, headers=auth_headers(token)
+                )
+                if response is None or response.status_code != 200:
+                    break
+                cursor = response.json().get("next_cursor")
+                if not cursor:
+                    break
+                url = f"/api/v1/orders/?per_page=10&cursor={cursor}"
+        else:
+            await ctx.request(
+                "POST /api/v1/auth/token",
+                "POST",
+                "/api/v1/auth/token",
+                data={"username": email, "password": CUSTOMER_PASSWORD},
+            )
+
+
+async def run_admin(ctx: LoadTestContext, rng: random.Random, iterations: int) -> None:
+    """店舗管理者の仮想ユーザー（注文一覧を確認し、ステータスを1段階進める）"""
+    headers = auth_headers(ctx.admin_token)
+    for _ in range(iterations):
+        current = rng.choice(list(ADMIN_STATUS_FLOW))
+        response = await ctx.request(
+            "GET /api/v1/admin/orders/",
+            "GET",
+            f"/api/v1/admin/orders/?status={current}&limit=20",
+            headers=headers,
+        )
+        if response is None or response.status_code != 200:
+            continue
+        orders = response.json()["items"]
+        if not orders:
+            continue
+        order_id = rng.choice(orders)["id"]
+        await ctx.request(
+            "PATCH /api/v1/admin/orders/{order_id}",
+            "PATCH",
+            f"/api/v1/admin/orders/{order_id}?status={ADMIN_STATUS_FLOW[current]}",
+            headers=headers,
+        )
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """昇順に並べた値のq分位点（線形補間）"""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (
+        position - lower
+    )
+
+
+def summarize_route(stats: RouteStats, duration: float) -> dict[str, Any]:
+    """ルートの計測結果をJSONに出力する形式にまとめる"""
+    latencies_ms = sorted(latency * 1000 for latency in stats.latencies)
+    requests = len(latencies_ms)
+    return {
+        "requests": requests,
+        "errors": stats.errors,
+        "error_rate": round(stats.errors / requests, 4),
+        "status_codes": dict(sorted(stats.status_codes.items())),
+        "throughput_rps": round(requests / duration, 2),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies_ms), 2),
+            "p50": round(percentile(latencies_ms, 0.50), 2),
+            "p95": round(percentile(latencies_ms, 0.95), 2),
+            "p99": round(percentile(latencies_ms, 0.99), 2),
+            "max": round(latencies_ms[-1], 2),
+        },
+        "db_queries_per_request": {
+            "mean": round(statistics.fmean(stats.queries), 2),
+            "max": max(stats.queries),
+        },
+        "db_time_ms_per_request": round(statistics.fmean(stats.db_seconds) * 1000, 2),
+    }
+
+
+def git_revision() -> str | None:
+    """実行時のコミット（gitで管理されていない場合はNone）"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def start_embedded_database(data_dir: str) -> str:
+    """
+    pgserverでローカルのPostgreSQLを起動し、非同期エンジン用のURLを返す
+
+    Args:
+        data_dir: PostgreSQLのデータディレクトリ（なければ作成される）
+
+    Returns:
+        str: データベースURL
+    """
+    try:
+        import pgserver
+    except ImportError as e:
+        raise SystemExit(
+            "--embedded requires pgserver (pip install pgserver)"
+        ) from e
+
+    server = pgserver.get_server(data_dir, cleanup_mode=None)
+    return server.get_uri().replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+async def seed(args: argparse.Namespace) -> tuple[list[int], list[tuple[str, str]], str]:
+    """
+    メニュー・顧客・店舗管理者・注文履歴を作成
+
+    Returns:
+        tuple: メニューIDの一覧、顧客の(メールアドレス, アクセストークン)の一覧、
+            店舗管理者のアクセストークン
+    """
+    from app.core.security import create_access_token, get_password_hash
+    from app.crud.order import order_crud
+    from app.db.database import engine
+    from app.db.models import User, UserRole
+    from app.schemas.order import OrderCreate, OrderItemCreate
+
+    await reset_schema(engine)
+    session_maker = create_benchmark_sessionmaker(engine)
+    rng = random.Random(args.seed)
+    # bcryptは遅いため、全員同じパスワードのハッシュを使い回す
+    hashed_password = get_password_hash(CUSTOMER_PASSWORD)
+
+    async with session_maker() as db:
+        menu_ids = await seed_menus(db, args.menus)
+        users = [
+            User(
+                email=f"customer{i}@example.com",
+                name=f"顧客{i}",
+                hashed_password=hashed_password,
+                role=UserRole.CUSTOMER,
+            )
+            for i in range(args.customers)
+        ]
+        admin = User(
+            email="store@example.com",
+            name="店舗",
+            hashed_password=hashed_password,
+            role=UserRole.STORE,
+        )
+        db.add_all([*users, admin])
+        await db.commit()
+        customer_ids = [user.id for user in users]
+        customer_emails = [user.email for user in users]
+
+        # 履歴のページングで複数ページになるよう、過去の注文を作成
+        for user_id in customer_ids:
+            for _ in range(args.history):
+                order_data = OrderCreate(
+                    items=[
+                        OrderItemCreate(menu_id=menu_id, quantity=1)
+                        for menu_id in rng.sample(menu_ids, rng.randint(1, 3))
+                    ],
+                    delivery_address="東京都千代田区1-1-1",
+                )
+                await order_crud.create_order(db, order_data, user_id)
+
+    customers = [
+        (email, create_access_token(data={"sub": email})) for email in customer_emails
+    ]
+    return menu_ids, customers, create_access_token(data={"sub": admin.email})
+
+
+async def main(args: argparse.Namespace) -> None:
+    # アプリケーションの設定は読み込み時に確定するため、appの読み込み前にURLを設定する
+    database_url = (
+        start_embedded_database(args.embedded)
+        if args.embedded
+        else get_benchmark_database_url()
+    )
+    os.environ["DATABASE_URL"] = database_url
+    # デバッグモードのSQLログ出力で計測結果が歪まないよう無効にする
+    os.environ["DEBUG"] = "false"
+
+    from app.db.database import engine
+    from app.db.query_stats import track_queries
+    from app.main import app
+
+    # リクエストごとのログ出力（スロークエリの警告など）で計測結果が歪まないよう、
+    # エラー以上のみ出力する（スロークエリは管理者用APIと同じくslow_query_logに残る）
+    logging.getLogger().setLevel(logging.ERROR)
+
+    menu_ids, customers, admin_token = await seed(args)
+
+    # アプリケーションの例外は500として記録する（例外で負荷試験を止めない）
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        ctx = LoadTestContext(
+            client=client,
+            menu_ids=menu_ids,
+            customers=customers,
+            admin_token=admin_token,
+            track_queries=track_queries,
+        )
+        workers: list[Awaitable[None]] = [
+            run_customer(ctx, random.Random(f"{args.seed}-customer-{i}"), args.iterations)
+            for i in range(args.users)
+        ]
+        workers += [
+            run_admin(ctx, random.Random(f"{args.seed}-admin-{i}"), args.iterations)
+            for i in range(args.admins)
+        ]
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        await asyncio.gather(*workers)
+        duration = time.perf_counter() - started
+
+    await engine.dispose()
+
+    routes = {
+        route: summarize_route(stats, duration)
+        for route, stats in sorted(ctx.routes.items())
+    }
+    total_requests = sum(route["requests"] for route in routes.values())
+    total_errors = sum(route["errors"] for route in routes.values())
+    report = {
+        "meta": {
+            "git_revision": git_revision(),
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": "embedded" if args.embedded else "TEST_DATABASE_URL",
+        },
+        "config": {
+            "users": args.users,
+            "admins": args.admins,
+            "iterations": args.iterations,
+            "seed": args.seed,
+            "menus": args.menus,
+            "customers": args.customers,
+            "history": args.history,
+        },
+        "summary": {
+            "requests": total_requests,
+            "errors": total_errors,
+            "error_rate": round(total_errors / total_requests, 4),
+            "duration_seconds": round(duration, 3),
+            "throughput_rps": round(total_requests / duration, 2),
+        },
+        "routes": routes,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+    print(
+        f"{'route':<38} | {'reqs':>5} | {'err%':>6} | {'p50 ms':>7} | "
+        f"{'p95 ms':>7} | {'p99 ms':>7} | {'queries':>7}"
+    )
+    print("-" * 94)
+    for route, summary in routes.items():
+        latency = summary["latency_ms"]
+        print(
+            f"{route:<38} | {summary['requests']:>5} | "
+            f"{summary['error_rate'] * 100:>6.1f} | {latency['p50']:>7.2f} | "
+            f"{latency['p95']:>7.2f} | {latency['p99']:>7.2f} | "
+            f"{summary['db_queries_per_request']['mean']:>7.2f}"
+        )
+    summary = report["summary"]
+    print(
+        f"\n{summary['requests']} requests in {summary['duration_seconds']:.1f}s "
+        f"({summary['throughput_rps']:.1f} req/s), "
+        f"error rate {summary['error_rate'] * 100:.1f}% -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=20, help="同時に操作する顧客の数")
+    parser.add_argument("--admins", type=int, default=2, help="同時に操作する店舗管理者の数")
+    parser.add_argument("--iterations", type=int, default=50, help="仮想ユーザーごとの操作回数")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    parser.add_argument("--menus", type=int, default=30, help="メニューの件数")
+    parser.add_argument("--customers", type=int, default=100, help="顧客の人数")
+    parser.add_argument("--history", type=int, default=5, help="顧客ごとの過去の注文数")
+    parser.add_argument("--output", default="lunch_rush.json", help="結果のJSONの出力先")
+    parser.add_argument(
+        "--embedded",
+        metavar="DATA_DIR",
+        help="pgserverでローカルのPostgreSQLを起動して使用する",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -17,14 +17,27 @@ function formatDateTime(dateString) {
 
 // ステータスの日本語表示
 const statusMapping = {
-    'PENDING': '保留中',
-    'PREPARING': '準備中',
-    'READY': '準備完了',
-    'DELIVERING': '配達中',
-    'DELIVERED': '配達完了',
-    'CANCELLED': 'キャンセル'
+    'pending': '保留中',
+    'preparing': '準備中',
+    'ready': '準備完了',
+    'delivered': '配達完了',
+    'cancelled': 'キャンセル'
 };
 
+// 表示中の注文（注文ID → 注文）。一覧の取得とライブフィードのイベントで更新する
+const orders = new Map();
+
+// ライブフィードで受信済みの最新イベントID（再接続時にLast-Event-IDとして送る）
+let lastEventId = null;
+
+// 注文一覧を取得済みかどうか
+let ordersLoaded = false;
+
+// 金額の表示（APIは金額を文字列で返す）
+function formatAmount(amount) {
+    return Number(amount).toLocaleString();
+}
+
 // 注文一覧の取得
 async function fetchOrders() {
     try {
@@ -34,7 +47,7 @@ async function fetchOrders() {
             return;
         }
 
-        const response = await fetch('/api/v1/admin/orders/', {
+        const response = await fetch('/api/v1/admin/orders/?limit=100&total_mode=none', {
             headers: {
                 'Authorization': `Bearer ${token}`
             }
@@ -49,15 +62,15 @@ async function fetchOrders() {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
 
-        const orders = await response.json();
-        return orders;
+        const data = await response.json();
+        return data.items;
     } catch (error) {
         console.error('注文の取得に失敗しました:', error);
         showError('注文の取得に失敗しました。');
     }
 }
 
-// 注文ステータスの更新
+// 注文ステータスの更新（表示はライブフィードのイベントで更新される）
 async function updateOrderStatus(orderId, newStatus) {
     try {
         const token = getToken();
@@ -66,14 +79,15 @@ async function updateOrderStatus(orderId, newStatus) {
             return;
         }
 
-        const response = await fetch(`/api/v1/admin/orders/${orderId}`, {
-            method: 'PATCH',
-            headers: {
-                'Authorization': `Bearer ${token}`,
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ status: newStatus })
-        });
+        const response = await fetch(
+            `/api/v1/admin/orders/${orderId}/status?order_status=${encodeURIComponent(newStatus)}`,
+            {
+                method: 'PUT',
+                headers: {
+                    'Authorization': `Bearer ${token}`
+                }
+            }
+        );
 
         if (response.status === 401) {
             window.location.href = '/login';
@@ -84,7 +98,6 @@ async function updateOrderStatus(orderId, newStatus) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
 
-        await refreshOrders();
         showSuccess('注文ステータスを更新しました。');
     } catch (error) {
         console.error('ステータスの更新に失敗しました:', error);
@@ -92,15 +105,29 @@ async function updateOrderStatus(orderId, newStatus) {
     }
 }
 
+// 注文を表示中の一覧に反映（同じ注文は更新日時が新しい方を残す）
+function mergeOrder(order) {
+    const current = orders.get(order.id);
+    if (current && new Date(current.updated_at) > new Date(order.updated_at)) {
+        return;
+    }
+    orders.set(order.id, { ...current, ...order });
+}
+
 // 注文テーブルの更新
-function updateOrderTable(orders) {
+function updateOrderTable() {
     const tableBody = document.getElementById('orderTableBody');
     const statusFilter = document.getElementById('statusFilter').value;
 
+    // 新しい注文から順に表示
+    const sortedOrders = Array.from(orders.values()).sort((a, b) =>
+        new Date(b.created_at) - new Date(a.created_at) || b.id - a.id
+    );
+
     // フィルタリング
     const filteredOrders = statusFilter
-        ? orders.filter(order => order.status === statusFilter)
-        : orders;
+        ? sortedOrders.filter(order => order.status === statusFilter)
+        : sortedOrders;
 
     // テーブル内容のクリア
     tableBody.innerHTML = '';
@@ -113,7 +140,7 @@ function updateOrderTable(orders) {
             <td>${formatDateTime(order.created_at)}</td>
             <td>${order.delivery_address}</td>
             <td>${statusMapping[order.status] || order.status}</td>
-            <td>¥${order.total_amount.toLocaleString()}</td>
+            <td>¥${formatAmount(order.total_amount)}</td>
             <td>
                 <div class="btn-group">
                     <button class="btn btn-info btn-sm" onclick="showOrderDetail(${order.id})">
@@ -139,11 +166,125 @@ function updateOrderTable(orders) {
     });
 }
 
-// 注文一覧の更新
+// 注文一覧の再取得
 async function refreshOrders() {
-    const orders = await fetchOrders();
-    if (orders) {
-        updateOrderTable(orders);
+    const items = await fetchOrders();
+    if (items) {
+        items.forEach(mergeOrder);
+        updateOrderTable();
+    }
+}
+
+// Server-Sent Eventsの1イベント分のテキストを解析
+function parseSseMessage(block) {
+    const message = { id: null, event: 'message', data: '' };
+    const dataLines = [];
+    block.split('\n').forEach(line => {
+        if (!line || line.startsWith(':')) {
+            return;
+        }
+        const index = line.indexOf(':');
+        const field = index === -1 ? line : line.slice(0, index);
+        const value = index === -1 ? '' : line.slice(index + 1).replace(/^ /, '');
+        if (field === 'id') {
+            message.id = value;
+        } else if (field === 'event') {
+            message.event = value;
+        } else if (field === 'data') {
+            dataLines.push(value);
+        }
+    });
+    message.data = dataLines.join('\n');
+    return message;
+}
+
+// ライブフィードのイベントを反映
+async function handleFeedMessage(message) {
+    if (message.id !== null) {
+        lastEventId = message.id;
+    }
+
+    switch (message.event) {
+        case 'ready':
+            // 最初の接続時だけ一覧を取得し、以降（再接続を含む）は差分だけを反映する
+            if (!ordersLoaded) {
+                ordersLoaded = true;
+                await refreshOrders();
+            }
+            break;
+        case 'reset':
+            // 送り直しが上限を超えたため一覧を取り直す
+            orders.clear();
+            await refreshOrders();
+            break;
+        case 'order_created':
+        case 'order_status_changed':
+            mergeOrder(JSON.parse(message.data));
+            updateOrderTable();
+            break;
+    }
+}
+
+// ライブフィードに接続（EventSourceは認証ヘッダーを送れないためfetchで読む）
+async function connectOrderFeed() {
+    const token = getToken();
+    if (!token) {
+        window.location.href = '/login';
+        return false;
+    }
+
+    const headers = { 'Authorization': `Bearer ${token}` };
+    if (lastEventId !== null) {
+        headers['Last-Event-ID'] = lastEventId;
+    }
+
+    const response = await fetch('/api/v1/admin/orders/events', { headers });
+
+    if (response.status === 401) {
+        window.location.href = '/login';
+        return false;
+    }
+
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            return true;
+        }
+        buffer += decoder.decode(value, { stream: true }).replace(/\r\n?/g, '\n');
+
+        let separator;
+        while ((separator = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, separator);
+            buffer = buffer.slice(separator + 2);
+            await handleFeedMessage(parseSseMessage(block));
+        }
+    }
+}
+
+// 切断されたら待ち時間を延ばしながら再接続する
+async function startOrderFeed() {
+    let delay = 1000;
+    while (true) {
+        const startedAt = Date.now();
+        try {
+            const keepGoing = await connectOrderFeed();
+            if (keepGoing === false) {
+                return;
+            }
+        } catch (error) {
+            console.error('注文のライブフィードが切断されました:', error);
+        }
+        // しばらく接続できていた場合は待ち時間を戻す
+        delay = Date.now() - startedAt > 30000 ? 1000 : Math.min(delay * 2, 30000);
+        await new Promise(resolve => setTimeout(resolve, delay));
     }
 }
 
@@ -197,17 +338,17 @@ async function showOrderDetail(orderId) {
                     <tbody>
                         ${order.items.map(item => `
                             <tr>
-                                <td>${item.menu_item.name}</td>
+                                <td>${item.menu_name}</td>
                                 <td>${item.quantity}</td>
-                                <td>¥${item.menu_item.price.toLocaleString()}</td>
-                                <td>¥${(item.quantity * item.menu_item.price).toLocaleString()}</td>
+                                <td>¥${formatAmount(item.unit_price)}</td>
+                                <td>¥${formatAmount(item.subtotal)}</td>
                             </tr>
                         `).join('')}
                     </tbody>
                 </table>
                 
                 <div class="text-end mt-3">
-                    <h5>合計金額: ¥${order.total_amount.toLocaleString()}</h5>
+                    <h5>合計金額: ¥${formatAmount(order.total_amount)}</h5>
                 </div>
             </div>
         `;
@@ -245,12 +386,12 @@ function showSuccess(message) {
     document.querySelector('.container').insertBefore(alertDiv, document.querySelector('.container').firstChild);
 }
 
-// フィルター適用
+// フィルター適用（表示中の注文を絞り込む）
 function filterOrders() {
-    refreshOrders();
+    updateOrderTable();
 }
 
-// ページ読み込み時に注文一覧を取得
+// ページ読み込み時にライブフィードへ接続（接続後に注文一覧を取得する）
 document.addEventListener('DOMContentLoaded', () => {
-    refreshOrders();
+    startOrderFeed();
 });
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+テスト共通のフィクスチャ
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+
+import pytest
+
+from app.db.query_stats import QueryStats, track_queries
+
+
+@pytest.fixture
+def max_queries() -> Callable[[int], AbstractContextManager[QueryStats]]:
+    """
+    ブロック内で実行されたSQL文がlimit以下であることを検証するコンテキストマネージャ
+
+    計測対象はinstrument_engine()を登録したエンジン。N+1の回帰を検出するため、
+    エンドポイントごとのSQL文の上限を固定する用途で使う。
+
+    使い方:
+        with max_queries(3):
+            response = await client.get("/api/v1/orders/1")
+    """
+
+    @contextmanager
+    def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        executed = "\n".join(
+            f"  {count}x {statement}" for statement, count in stats.statements.most_common()
+        )
+        assert stats.count <= limit, (
+            f"{stats.count} SQL statements executed (limit {limit}):\n{executed}"
+        )
+
+    return assert_max_queries
@@ -0,0 +1,97 @@
+"""
+PostgreSQLのテスト用データベース
+日次集計のUPSERT・イベントの通知など、SQLiteでは実行できない書き込みの検証に使う
+"""
+
+import os
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.crud.auth import principal_cache
+from app.crud.order import order_crud
+from app.db.models import Base, Menu, MenuCategory, User, UserRole
+from app.db.partitions import (
+    DEFAULT_MONTHS_AHEAD,
+    create_order_partitions,
+    get_current_month,
+)
+from app.db.query_stats import instrument_engine
+from app.schemas.order import OrderCreate, OrderItemCreate
+
+CUSTOMER_EMAIL = "postgres-customer@example.com"
+STORE_EMAIL = "postgres-store@example.com"
+
+
+@asynccontextmanager
+async def postgres_database() -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    """
+    TEST_DATABASE_URLのデータベースの全テーブルを作り直し、セッションメーカーを返す
+
+    テスト専用のデータベースを指定すること。
+    TEST_DATABASE_URLが未設定、または接続できない場合はテストをスキップする。
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+            # 注文テーブルはパーティションがないと書き込めないため、init_dbと同様に作成
+            await create_order_partitions(
+                conn, await get_current_month(conn), DEFAULT_MONTHS_AHEAD + 1
+            )
+    except (OSError, DBAPIError) as e:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL is not available: {e}")
+
+    instrument_engine(engine)
+    principal_cache.clear()
+    try:
+        yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    finally:
+        principal_cache.clear()
+        await engine.dispose()
+
+
+@asynccontextmanager
+async def order_database() -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    """顧客（ID 1）・店舗管理者（ID 2）・メニュー2件を登録したデータベース"""
+    async with postgres_database() as session_factory:
+        async with session_factory() as db:
+            db.add_all([
+                User(id=1, email=CUSTOMER_EMAIL, name="顧客", hashed_password="x",
+                     role=UserRole.CUSTOMER, is_active=True),
+                User(id=2, email=STORE_EMAIL, name="店舗", hashed_password="x",
+                     role=UserRole.STORE, is_active=True),
+                Menu(id=1, name="唐揚げ弁当", price=Decimal("500"),
+                     category=MenuCategory.MEAT, is_available=True),
+                Menu(id=2, name="鮭弁当", price=Decimal("600"),
+                     category=MenuCategory.FISH, is_available=True),
+            ])
+            await db.commit()
+        yield session_factory
+
+
+async def create_sample_order(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    """唐揚げ弁当2個・鮭弁当1個（合計1600円）の注文を作成し、IDを返す"""
+    async with session_factory() as db:
+        order = await order_crud.create_order(
+            db,
+            OrderCreate(
+                items=[
+                    OrderItemCreate(menu_id=1, quantity=2),
+                    OrderItemCreate(menu_id=2, quantity=1),
+                ],
+                delivery_address="東京都渋谷区1-1",
+            ),
+            user_id=1,
+        )
+    return order.id
@@ -0,0 +1,107 @@
+"""
+インプロセスキャッシュのテスト
+TTL・サイズ上限・統計情報を検証
+"""
+
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.crud.auth import principal_cache
+from app.db.models import User, UserRole
+from app.schemas.user import UserPrincipal
+
+
+class TestTTLCache:
+    """TTLCacheのテスト"""
+
+    def test_get_set(self):
+        """保存した値を取得できる"""
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_expired_entry_is_miss(self):
+        """期限切れのエントリはミスになる"""
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+    def test_lru_eviction(self):
+        """サイズ上限を超えると最も古く使われたエントリが破棄される"""
+        cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate(self):
+        """明示的に破棄できる"""
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.invalidate("a")
+        assert cache.get("a") is None
+
+    def test_disabled(self):
+        """TTLが0の場合はキャッシュしない"""
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=0)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+
+
+class TestPrincipalCacheInvalidation:
+    """認証済みユーザーのキャッシュの破棄のテスト"""
+
+    def setup_method(self):
+        self.engine = create_engine("sqlite://")
+        User.__table__.create(self.engine)
+        with Session(self.engine) as db:
+            db.add(User(id=1, email="a@example.com", name="A", hashed_password="x"))
+            db.commit()
+        principal_cache.clear()
+
+    def teardown_method(self):
+        principal_cache.clear()
+        self.engine.dispose()
+
+    def cache_old_principal(self):
+        """変更前の行を読んだ他のリクエストがキャッシュした状態を作る"""
+        principal_cache.set(
+            "a@example.com",
+            UserPrincipal(id=1, email="a@example.com", role=UserRole.CUSTOMER, is_active=True),
+        )
+
+    def test_evicts_after_commit(self):
+        """コミット前に古い値がキャッシュし直されても、コミット後に破棄されること"""
+        self.cache_old_principal()
+        with Session(self.engine) as db:
+            user = db.get(User, 1)
+            user.role = UserRole.STORE
+            assert principal_cache.get("a@example.com") is None
+
+            self.cache_old_principal()
+            db.commit()
+
+        assert principal_cache.get("a@example.com") is None
+
+    def test_rollback_keeps_cache(self):
+        """ロールバックした変更ではコミット後の破棄を行わないこと"""
+        with Session(self.engine) as db:
+            user = db.get(User, 1)
+            user.is_active = False
+            self.cache_old_principal()
+            db.rollback()
+            assert "principal_invalidations" not in db.info
+
+        assert principal_cache.get("a@example.com") is not None
@@ -0,0 +1,43 @@
+"""
+HTTPキャッシュユーティリティのテスト
+ETagの生成とIf-None-Matchの判定を検証
+"""
+
+import pytest
+
+from app.core.http_cache import etag_matches, make_etag, not_modified
+
+
+class TestETag:
+    """ETag関連のテスト"""
+
+    def test_make_etag_is_stable(self):
+        """同じ値からは同じETag、異なる値からは異なるETag"""
+        etag = make_etag("menus", "2024-01-01T00:00:00+00:00", 3)
+        assert etag == make_etag("menus", "2024-01-01T00:00:00+00:00", 3)
+        assert etag != make_etag("menus", "2024-01-01T00:00:00+00:00", 4)
+        assert etag.startswith('"') and etag.endswith('"')
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            (None, False),
+            ("", False),
+            ('"abc"', True),
+            ('W/"abc"', True),
+            ('"xyz", "abc"', True),
+            ('"xyz"', False),
+            ("*", True),
+        ],
+    )
+    def test_etag_matches(self, header, expected):
+        """If-None-Matchの判定（弱い比較・複数指定・*）"""
+        assert etag_matches(header, '"abc"') is expected
+
+    def test_not_modified(self):
+        """304レスポンスは本文を持たずETagを返す"""
+        response = not_modified('"abc"', "public, no-cache")
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == '"abc"'
+        assert response.headers["cache-control"] == "public, no-cache"
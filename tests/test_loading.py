@@ -0,0 +1,254 @@
+"""
+リレーションの読み込み方針のテスト
+全リレーションがlazy="raise"であること、APIの処理中に暗黙の遅延読み込みが
+発生しないことを、SQLite（インメモリ）のデータベースで検証
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import RelationshipDirection
+from sqlalchemy.pool import StaticPool
+
+from app.core.security import create_access_token
+from app.crud.auth import principal_cache
+from app.db.database import get_db
+from app.db.models import (
+    Base,
+    Menu,
+    MenuCategory,
+    Order,
+    OrderArchive,
+    OrderDetail,
+    OrderDetailArchive,
+    OrderStatus,
+    User,
+    UserRole,
+)
+from app.db.query_stats import instrument_engine
+from app.main import app
+
+CUSTOMER_EMAIL = "loading-customer@example.com"
+STORE_EMAIL = "loading-store@example.com"
+
+
+@asynccontextmanager
+async def loading_database():
+    """テスト用のデータベース（users・menus・注文・アーカイブ済みの注文のみ）"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+    )
+    instrument_engine(engine)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    tables = [
+        model.__table__
+        for model in (User, Menu, Order, OrderDetail, OrderArchive, OrderDetailArchive)
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    now = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    async with factory() as db:
+        db.add_all([
+            User(id=1, email=CUSTOMER_EMAIL, name="顧客", hashed_password="x",
+                 role=UserRole.CUSTOMER, is_active=True),
+            User(id=2, email=STORE_EMAIL, name="店舗", hashed_password="x",
+                 role=UserRole.STORE, is_active=True),
+            Menu(id=1, name="唐揚げ弁当", price=Decimal("500"),
+                 category=MenuCategory.MEAT, is_available=True),
+            Menu(id=2, name="鮭弁当", price=Decimal("600"),
+                 category=MenuCategory.FISH, is_available=True),
+            Menu(id=3, name="未注文の弁当", price=Decimal("700"),
+                 category=MenuCategory.OTHER, is_available=True),
+        ])
+        await db.flush()
+        db.add(Order(id=1, user_id=1, status=OrderStatus.PREPARING,
+                     total_amount=Decimal("1600"), delivery_address="東京都",
+                     created_at=now, updated_at=now))
+        await db.flush()
+        db.add_all([
+            OrderDetail(id=1, order_id=1, menu_id=1, quantity=2,
+                        unit_price=Decimal("500"), subtotal=Decimal("1000"), created_at=now),
+            OrderDetail(id=2, order_id=1, menu_id=2, quantity=1,
+                        unit_price=Decimal("600"), subtotal=Decimal("600"), created_at=now),
+        ])
+        # アーカイブ済みの注文（注文1より前の配達完了分）
+        archived_at = datetime(2023, 11, 1, 12, 0, tzinfo=timezone.utc)
+        db.add(OrderArchive(id=2, user_id=1, status=OrderStatus.DELIVERED,
+                            total_amount=Decimal("1800"), delivery_address="東京都",
+                            created_at=archived_at, updated_at=archived_at))
+        await db.flush()
+        db.add(OrderDetailArchive(id=3, order_id=2, menu_id=2, quantity=3,
+                                  unit_price=Decimal("600"), subtotal=Decimal("1800"),
+                                  created_at=archived_at))
+        await db.commit()
+
+    principal_cache.clear()
+    try:
+        yield factory
+    finally:
+        principal_cache.clear()
+        await engine.dispose()
+
+
+@asynccontextmanager
+async def api_client(session_factory):
+    """get_dbをテスト用データベースに差し替えたクライアント"""
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def auth_headers(email: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def test_all_relationships_raise_on_lazy_load():
+    """全リレーションがlazy="raise"で、暗黙の遅延読み込みをしないこと"""
+    for mapper in Base.registry.mappers:
+        for relationship in mapper.relationships:
+            assert relationship.lazy == "raise", f"{mapper.class_.__name__}.{relationship.key}"
+
+
+def test_passive_deletes_match_foreign_keys():
+    """一対多のリレーションのpassive_deletesが外部キーのON DELETEと一致すること"""
+    expected = {"CASCADE": True, "RESTRICT": "all"}
+    for mapper in Base.registry.mappers:
+        for relationship in mapper.relationships:
+            if relationship.direction is not RelationshipDirection.ONETOMANY:
+                continue
+            (ondelete,) = {
+                fk.ondelete for column in relationship.remote_side for fk in column.foreign_keys
+            }
+            assert relationship.passive_deletes == expected[ondelete], (
+                f"{mapper.class_.__name__}.{relationship.key}"
+            )
+
+
+async def test_unloaded_relationship_raises():
+    """読み込んでいないリレーションへのアクセスはエラーになること"""
+    async with loading_database() as session_factory, session_factory() as db:
+        order = (await db.execute(select(Order).where(Order.id == 1))).scalar_one()
+        assert "order_details" in inspect(order).unloaded
+        with pytest.raises(InvalidRequestError):
+            order.order_details
+
+
+async def test_order_detail_paths_have_no_lazy_loads():
+    """注文詳細APIが必要なリレーションを明示的に読み込むこと"""
+    async with loading_database() as session_factory, api_client(session_factory) as client:
+        response = await client.get(
+            "/api/v1/orders/1", headers=auth_headers(CUSTOMER_EMAIL)
+        )
+        assert response.status_code == 200
+        assert [item["menu_name"] for item in response.json()["items"]] == [
+            "唐揚げ弁当",
+            "鮭弁当",
+        ]
+
+        response = await client.get(
+            "/api/v1/admin/orders/1", headers=auth_headers(STORE_EMAIL)
+        )
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == 2
+
+
+async def test_archived_orders_are_included_in_history():
+    """アーカイブ済みの注文も注文履歴・注文詳細で参照できること"""
+    async with loading_database() as session_factory, api_client(session_factory) as client:
+        headers = auth_headers(CUSTOMER_EMAIL)
+
+        response = await client.get("/api/v1/orders/", headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        assert [(order["id"], order["items_count"]) for order in body["items"]] == [
+            (1, 3),
+            (2, 3),
+        ]
+        assert body["total"] == 2
+
+        response = await client.get(
+            "/api/v1/orders/", headers=headers, params={"order_status": "delivered"}
+        )
+        assert [order["id"] for order in response.json()["items"]] == [2]
+
+        response = await client.get("/api/v1/orders/2", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["status"] == "delivered"
+        assert [item["menu_name"] for item in response.json()["items"]] == ["鮭弁当"]
+
+        # 他のユーザーのアーカイブ済みの注文は参照できない
+        response = await client.get("/api/v1/orders/2", headers=auth_headers(STORE_EMAIL))
+        assert response.status_code == 404
+
+
+async def test_estimated_total_is_admin_only():
+    """推定件数は管理者向け一覧のみで指定でき、公開・顧客向け一覧では422になること"""
+    async with loading_database() as session_factory, api_client(session_factory) as client:
+        params = {"total_mode": "estimated"}
+        response = await client.get(
+            "/api/v1/orders/", headers=auth_headers(CUSTOMER_EMAIL), params=params
+        )
+        assert response.status_code == 422
+
+        response = await client.get("/api/v1/menus/", params=params)
+        assert response.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "method,path,email,limit",
+    [
+        # 認証ユーザーの取得（キャッシュなし）を含む
+        ("GET", "/api/v1/orders/", CUSTOMER_EMAIL, 2),
+        ("GET", "/api/v1/orders/1", CUSTOMER_EMAIL, 4),
+        # アーカイブ済みの注文は注文テーブルを確認してからアーカイブを参照する
+        ("GET", "/api/v1/orders/2", CUSTOMER_EMAIL, 5),
+        ("GET", "/api/v1/admin/orders/", STORE_EMAIL, 2),
+        ("GET", "/api/v1/admin/orders/1", STORE_EMAIL, 4),
+        # ステータス更新は日次集計・イベントを書き込むため、PostgreSQLで検証する
+        # （tests/test_write_budgets.py）
+    ],
+)
+async def test_endpoint_query_budgets(max_queries, method, path, email, limit):
+    """エンドポイントごとのSQL文の数が上限以下であること（N+1の回帰を検出する）"""
+    async with loading_database() as session_factory, api_client(session_factory) as client:
+        with max_queries(limit):
+            response = await client.request(method, path, headers=auth_headers(email))
+        assert response.status_code == 200, response.text
+
+
+async def test_delete_menu_does_not_load_order_history():
+    """メニューの削除は注文履歴を読み込まず、注文されたメニューは削除できないこと"""
+    async with loading_database() as session_factory:
+        async with api_client(session_factory) as client:
+            response = await client.delete("/api/v1/admin/menus/1")
+            assert response.status_code == 409
+
+            response = await client.delete("/api/v1/admin/menus/3")
+            assert response.status_code == 204
+
+        async with session_factory() as db:
+            details = await db.execute(select(func.count(OrderDetail.id)))
+            assert details.scalar_one() == 2
+            menu_ids = await db.execute(select(Menu.id).order_by(Menu.id))
+            assert menu_ids.scalars().all() == [1, 2]
@@ -0,0 +1,146 @@
+"""
+公開メニューカタログキャッシュのテスト
+データベースの代わりに読み込み関数を差し替えて検証
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from app.crud.menu_catalog import MenuCatalog
+from app.crud.pagination import TotalMode, next_cursor
+from app.db.models import MenuCategory
+from app.schemas.menu import MenuResponse
+
+
+def make_menu(menu_id: int, category: MenuCategory = MenuCategory.MEAT) -> MenuResponse:
+    """テスト用メニューを作成"""
+    created_at = datetime(2024, 1, menu_id, tzinfo=timezone.utc)
+    return MenuResponse(
+        id=menu_id,
+        name=f"弁当{menu_id}",
+        price=Decimal("500"),
+        category=category,
+        is_available=True,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+
+class FakeLoader:
+    """呼び出し回数を記録する読み込み関数"""
+
+    def __init__(self, menus: list[MenuResponse]) -> None:
+        self.menus = menus
+        self.calls = 0
+
+    async def __call__(self, db) -> list[MenuResponse]:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return list(self.menus)
+
+
+@asynccontextmanager
+async def fake_session():
+    yield None
+
+
+def make_catalog(loader: FakeLoader, ttl_seconds: float = 60, max_stale_seconds: float = 60):
+    return MenuCatalog(
+        ttl_seconds=ttl_seconds,
+        max_stale_seconds=max_stale_seconds,
+        loader=loader,
+        session_factory=fake_session,
+    )
+
+
+MENUS = [make_menu(5), make_menu(4, MenuCategory.FISH), make_menu(3), make_menu(2), make_menu(1)]
+
+
+class TestMenuCatalog:
+    """MenuCatalogのテスト"""
+
+    async def test_snapshot_is_reused(self):
+        """TTL内は読み込みを繰り返さない"""
+        loader = FakeLoader(MENUS)
+        catalog = make_catalog(loader)
+        await catalog.get_menus(None)
+        await catalog.get_menu(None, 3)
+        assert loader.calls == 1
+        stats = catalog.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["version"] == 1
+
+    async def test_concurrent_cold_loads_are_single_flight(self):
+        """同時のキャッシュミスでも読み込みは1回"""
+        loader = FakeLoader(MENUS)
+        catalog = make_catalog(loader)
+        await asyncio.gather(*(catalog.get_menus(None) for _ in range(5)))
+        assert loader.calls == 1
+
+    async def test_pagination_matches_crud(self):
+        """オフセット・カーソル・カテゴリの結果"""
+        catalog = make_catalog(FakeLoader(MENUS))
+        page = await catalog.get_menus(None, skip=1, limit=2)
+        assert [menu.id for menu in page.items] == [4, 3]
+        assert page.total == 5
+        assert page.has_more
+
+        cursor = next_cursor(page.items, page.has_more)
+        page = await catalog.get_menus(None, limit=2, cursor=cursor, total_mode=TotalMode.NONE)
+        assert [menu.id for menu in page.items] == [2, 1]
+        assert page.total is None
+        assert not page.has_more
+
+        page = await catalog.get_menus(None, category=MenuCategory.FISH)
+        assert [menu.id for menu in page.items] == [4]
+        page = await catalog.get_menus(None, category=MenuCategory.OTHER)
+        assert page.items == []
+        assert page.total == 0
+
+    async def test_invalidate_reloads(self):
+        """invalidate後は次の取得で読み込み直す"""
+        loader = FakeLoader(MENUS)
+        catalog = make_catalog(loader)
+        await catalog.get_menus(None)
+        loader.menus = MENUS[:2]
+        catalog.invalidate()
+        page = await catalog.get_menus(None)
+        assert [menu.id for menu in page.items] == [5, 4]
+        assert await catalog.get_menu(None, 1) is None
+        assert catalog.stats()["version"] == 2
+
+    async def test_invalidate_discards_in_flight_load(self):
+        """読み込み中にinvalidateされた結果はスナップショットにしない"""
+        loader = FakeLoader(MENUS)
+        catalog = make_catalog(loader)
+        load = asyncio.create_task(catalog.get_menus(None))
+        await asyncio.sleep(0)
+        catalog.invalidate()
+        await load
+        assert catalog.stats()["version"] is None
+
+    async def test_stale_while_revalidate(self):
+        """TTL経過後は古いスナップショットを返し、バックグラウンドで読み込む"""
+        loader = FakeLoader(MENUS)
+        catalog = make_catalog(loader, ttl_seconds=0.01)
+        await catalog.get_menus(None)
+        await asyncio.sleep(0.02)
+
+        loader.menus = MENUS[:1]
+        page = await catalog.get_menus(None)
+        assert len(page.items) == 5
+        assert catalog.stats()["stale_hits"] == 1
+
+        await catalog._refresh_task
+        assert catalog.stats()["refreshes"] == 1
+        page = await catalog.get_menus(None)
+        assert [menu.id for menu in page.items] == [5]
+
+    def test_disabled_stats(self):
+        """TTLが0の場合は無効"""
+        catalog = make_catalog(FakeLoader(MENUS), ttl_seconds=0)
+        assert not catalog.enabled
+        assert catalog.stats()["snapshot_age_seconds"] is None
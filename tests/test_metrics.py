@@ -0,0 +1,110 @@
+"""
+リクエストメトリクスのテスト
+ヒストグラム・Prometheusのテキスト形式・ミドルウェアの記録内容を検証
+"""
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app.core.metrics import (
+    UNMATCHED_ROUTE,
+    Histogram,
+    MetricsMiddleware,
+    RequestMetrics,
+    escape_label_value,
+    render_pool_metrics,
+)
+
+
+class TestHistogram:
+    """ヒストグラムのテスト"""
+
+    def test_buckets_are_cumulative(self):
+        """バケットは上限以下の累積件数で、+Infは全件数になる"""
+        histogram = Histogram("latency", "Latency.", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(("/a",), value)
+
+        assert histogram.render() == [
+            "# HELP latency Latency.",
+            "# TYPE latency histogram",
+            'latency_bucket{route="/a",le="0.1"} 2',
+            'latency_bucket{route="/a",le="1"} 3',
+            'latency_bucket{route="/a",le="+Inf"} 4',
+            'latency_sum{route="/a"} 3.65',
+            'latency_count{route="/a"} 4',
+        ]
+
+    def test_without_labels(self):
+        histogram = Histogram("latency", "Latency.", (), buckets=(1.0,))
+        histogram.observe((), 2.0)
+        assert histogram.render()[2:] == [
+            'latency_bucket{le="1"} 0',
+            'latency_bucket{le="+Inf"} 1',
+            "latency_sum 2",
+            "latency_count 1",
+        ]
+
+
+def test_escape_label_value():
+    assert escape_label_value('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+
+def test_render_pool_metrics():
+    """プールの統計情報をゲージ・カウンタとして出力し、統計のないプールでは何も出力しない"""
+    body = render_pool_metrics({"pool_class": "InstrumentedAsyncQueuePool", "size": 5,
+                                "checked_out": 2, "checkouts": 10,
+                                "total_wait_seconds": 0.25})
+    assert "# TYPE db_pool_size gauge\ndb_pool_size 5\n" in body
+    assert "# TYPE db_pool_checkouts_total counter\ndb_pool_checkouts_total 10\n" in body
+    assert "db_pool_wait_seconds_total 0.25" in body
+    assert render_pool_metrics({"pool_class": "NullPool"}) == ""
+
+
+@pytest.fixture
+def metrics():
+    return RequestMetrics(buckets=(0.1,))
+
+
+def build_app(metrics: RequestMetrics) -> FastAPI:
+    """テスト用のルートを持つアプリケーション"""
+    app = FastAPI()
+
+    @app.get("/orders/{order_id}")
+    async def get_order(order_id: int):
+        if order_id == 0:
+            raise HTTPException(status_code=404, detail="not found")
+        if order_id < 0:
+            raise RuntimeError("boom")
+        return {"id": order_id}
+
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return app
+
+
+async def test_middleware_records_route_template_and_status(metrics):
+    """パスではなくルートのテンプレートとステータスごとに記録すること"""
+    app = build_app(metrics)
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        await client.get("/orders/1")
+        await client.get("/orders/2")
+        await client.get("/orders/0")
+        await client.get("/unknown/path")
+
+    body = metrics.render()
+    assert 'http_request_duration_seconds_count{method="GET",route="/orders/{order_id}",status="200"} 2' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/orders/{order_id}",status="404"} 1' in body
+    assert f'http_request_duration_seconds_count{{method="GET",route="{UNMATCHED_ROUTE}",status="404"}} 1' in body
+    assert 'http_requests_in_flight{method="GET"} 0' in body
+
+
+async def test_middleware_records_unhandled_errors_as_500(metrics):
+    """例外で終了したリクエストも500として記録し、処理中の数を戻すこと"""
+    app = build_app(metrics)
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        with pytest.raises(RuntimeError):
+            await client.get("/orders/-1")
+
+    assert 'route="/orders/{order_id}",status="500"} 1' in metrics.render()
+    assert metrics.in_flight.value(("GET",)) == 0
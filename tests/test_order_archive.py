@@ -0,0 +1,52 @@
+"""
+注文アーカイブのテスト
+アーカイブの文・列の対応・バッチ結果を検証
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud.order_archive import (
+    ORDER_COLUMNS,
+    ORDER_DETAIL_COLUMNS,
+    ArchiveBatchResult,
+    archive_statement,
+)
+from app.db.models import Order, OrderArchive, OrderDetail, OrderDetailArchive
+
+
+def test_archive_columns_cover_live_tables():
+    """アーカイブに移す列が注文・注文詳細の全列と一致すること"""
+    for columns, live, archive in (
+        (ORDER_COLUMNS, Order, OrderArchive),
+        (ORDER_DETAIL_COLUMNS, OrderDetail, OrderDetailArchive),
+    ):
+        assert set(columns) == set(live.__table__.c.keys())
+        assert set(archive.__table__.c.keys()) - set(columns) <= {"archived_at"}
+
+
+def test_archive_statement_locks_and_moves_in_one_statement():
+    """対象の注文をSKIP LOCKEDでロックし、削除と挿入を1文で行うこと"""
+    statement = archive_statement(datetime(2024, 1, 1, tzinfo=timezone.utc), 500)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "DELETE FROM orders " in sql
+    assert "DELETE FROM order_details " in sql
+    assert "INSERT INTO orders_archive " in sql
+    assert "INSERT INTO order_details_archive " in sql
+    # 注文詳細もパーティションキーで絞り込む
+    assert "order_details.created_at = batch.created_at" in sql
+
+
+def test_archive_batch_rates():
+    """処理速度はロック保持時間あたりの件数で、0秒の場合は0になること"""
+    result = ArchiveBatchResult(
+        orders=500, order_details=1500, statement_seconds=0.2, lock_seconds=0.25
+    )
+    assert result.orders_per_second == 2000
+    assert result.order_details_per_second == 6000
+
+    empty = ArchiveBatchResult(orders=0, order_details=0, statement_seconds=0, lock_seconds=0)
+    assert empty.orders_per_second == 0.0
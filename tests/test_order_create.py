@@ -0,0 +1,47 @@
+"""
+注文作成のテスト
+INSERT ... RETURNINGで書き込んだ内容から組み立てたレスポンスが、
+再取得した注文と一致することをPostgreSQL（TEST_DATABASE_URL）のデータベースで検証
+"""
+
+from app.crud.order import build_order_response, order_crud
+from app.schemas.order import OrderCreate, OrderItemCreate
+from tests.postgres import order_database
+
+
+async def test_create_order_response_matches_stored_order(max_queries):
+    """作成時のレスポンスが再取得した注文と一致し、書き込んだ行を読み直さないこと"""
+    async with order_database() as session_factory:
+        async with session_factory() as db:
+            # メニュー取得・注文・注文詳細・日次集計（2文）・イベント
+            with max_queries(6) as stats:
+                created = await order_crud.create_order(
+                    db,
+                    OrderCreate(
+                        items=[
+                            OrderItemCreate(menu_id=2, quantity=1),
+                            OrderItemCreate(menu_id=1, quantity=2),
+                            OrderItemCreate(menu_id=2, quantity=3),
+                        ],
+                        delivery_address="東京都渋谷区1-1",
+                        notes="玄関前に置いてください",
+                    ),
+                    user_id=1,
+                )
+            # INSERT ... SELECTを含め、注文・注文詳細を読む文がないこと
+            assert not [
+                statement for statement in stats.statements
+                if "FROM orders" in statement
+                or "FROM order_details" in statement
+                or "JOIN order_details" in statement
+            ]
+
+        # 同じメニューの明細は数量を合算して1行になる（初出順）
+        assert [
+            (item.menu_id, item.quantity, item.subtotal) for item in created.items
+        ] == [(2, 4, 2400), (1, 2, 1000)]
+        assert created.total_amount == 3400
+
+        async with session_factory() as db:
+            stored = await order_crud.get_order_by_id(db, created.id)
+            assert created == build_order_response(stored)
@@ -0,0 +1,140 @@
+"""
+注文ライブフィードのテスト
+LISTEN接続を使わず、購読キューとSSEの生成を検証
+"""
+
+import asyncio
+import json
+
+from app.crud.order_events import EventBatch
+from app.crud.order_feed import FeedEvent, FeedSubscription, OrderFeed, sse_message
+from app.db.models import OrderEvent
+
+
+def make_event(event_id: int, status: str = "pending") -> FeedEvent:
+    """テスト用イベントを作成"""
+    return FeedEvent(
+        id=event_id,
+        event_type="order_status_changed",
+        payload={"id": 1, "status": status, "delivery_address": "東京都"},
+    )
+
+
+def make_batch(event_ids: list[int], xmin: int, xmax: int) -> EventBatch:
+    """テスト用の読み出し結果を作成"""
+    return EventBatch(
+        events=[OrderEvent(id=event_id) for event_id in event_ids],
+        snapshot_xmin=xmin,
+        snapshot_xmax=xmax,
+    )
+
+
+def parse(message: str) -> dict[str, str]:
+    """SSEの1メッセージをフィールドごとに分解"""
+    return dict(line.split(": ", 1) for line in message.strip().split("\n"))
+
+
+def test_feed_event_to_sse():
+    """イベントがid・event・dataの3行で出力されること"""
+    fields = parse(make_event(7, "ready").to_sse())
+
+    assert fields["id"] == "7"
+    assert fields["event"] == "order_status_changed"
+    assert json.loads(fields["data"]) == {"id": 1, "status": "ready", "delivery_address": "東京都"}
+
+
+def test_sse_message_without_id():
+    """IDなしの制御メッセージにはid行を含めないこと"""
+    message = sse_message("reset", {"last_event_id": 3})
+
+    assert message == 'event: reset\ndata: {"last_event_id":3}\n\n'
+
+
+async def test_subscription_overflow_ends_stream():
+    """キューが満杯になると未送信分を破棄して終了を通知すること"""
+    subscription = FeedSubscription(queue_size=2)
+
+    assert subscription.deliver(make_event(1))
+    assert subscription.deliver(make_event(2))
+    assert not subscription.deliver(make_event(3))
+    assert subscription.overflowed
+    assert subscription.queue.qsize() == 1
+    assert await subscription.queue.get() is None
+
+
+async def test_fan_out_drops_slow_subscriber():
+    """追いつかない購読者だけが外され、他の購読者には配信が続くこと"""
+    feed = OrderFeed(poll_seconds=60, queue_size=1)
+    fast = FeedSubscription(queue_size=10)
+    slow = FeedSubscription(queue_size=1)
+    feed._subscribers.update({fast, slow})
+
+    feed._fan_out([make_event(1), make_event(2)])
+
+    assert feed.last_event_id == 2
+    assert feed.dropped_subscribers == 1
+    assert feed._subscribers == {fast}
+    assert fast.queue.qsize() == 2
+
+
+def test_contiguous_waits_for_uncommitted_gap():
+    """IDの欠番はコミットされるまで待ち、その手前までだけを返すこと"""
+    feed = OrderFeed(poll_seconds=60, queue_size=10)
+    feed._last_event_id = 10
+
+    # 11は未コミット（12が先にコミットされた）
+    assert [e.id for e in feed._contiguous(make_batch([12, 13], xmin=100, xmax=105))] == []
+    # 欠番を採番したトランザクション（xmax=105より前）がまだ実行中
+    assert [e.id for e in feed._contiguous(make_batch([12, 13], xmin=103, xmax=106))] == []
+    # 11がコミットされた
+    events = feed._contiguous(make_batch([11, 12, 13], xmin=103, xmax=106))
+    assert [e.id for e in events] == [11, 12, 13]
+    assert feed._gap is None
+    assert feed.skipped_event_ids == 0
+
+
+def test_contiguous_skips_rolled_back_gap():
+    """欠番の観測時に実行中だったトランザクションが終了すれば、欠番を飛ばすこと"""
+    feed = OrderFeed(poll_seconds=60, queue_size=10)
+    feed._last_event_id = 10
+
+    assert feed._contiguous(make_batch([13, 14], xmin=100, xmax=105)) == []
+    # 観測後に始まった欠番は、別の欠番として改めて待つ
+    events = feed._contiguous(make_batch([13, 14, 16], xmin=105, xmax=107))
+    assert [e.id for e in events] == [13, 14]
+    assert feed.skipped_event_ids == 2
+    assert feed._gap == (16, 107)
+
+
+async def test_stream_skips_events_already_sent_in_backlog():
+    """送り直し分と購読キューが重なった場合、同じイベントを2回送らないこと"""
+    feed = OrderFeed(poll_seconds=60, queue_size=10)
+    subscription = FeedSubscription(queue_size=10)
+    feed._subscribers.add(subscription)
+    for event_id in (4, 5, 6):
+        subscription.deliver(make_event(event_id))
+    subscription.queue.put_nowait(None)
+
+    backlog = [make_event(4), make_event(5)]
+    messages = [
+        message
+        async for message in feed.stream(subscription, 3, backlog, heartbeat_seconds=1)
+    ]
+
+    assert messages[0].startswith("retry: ")
+    assert parse(messages[1]) == {"id": "3", "event": "ready", "data": '{"last_event_id":3}'}
+    assert [parse(message)["id"] for message in messages[2:]] == ["4", "5", "6"]
+    # 終了時に購読を解除する
+    assert subscription not in feed._subscribers
+
+
+async def test_stream_sends_heartbeat_while_idle():
+    """イベントがない間はコメント行でハートビートを送ること"""
+    feed = OrderFeed(poll_seconds=60, queue_size=10)
+    subscription = FeedSubscription(queue_size=10)
+
+    stream = feed.stream(subscription, 0, [], reset=True, heartbeat_seconds=0.01)
+    await stream.__anext__()  # retry
+    assert parse(await stream.__anext__())["event"] == "reset"
+    assert await asyncio.wait_for(stream.__anext__(), 1) == ": keep-alive\n\n"
+    await stream.aclose()
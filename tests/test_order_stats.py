@@ -0,0 +1,75 @@
+"""
+注文統計（日次集計テーブル）のテスト
+作成時・ステータス変更時の差分の加算が、注文からの再集計と一致することを
+PostgreSQL（TEST_DATABASE_URL）のデータベースで検証
+"""
+
+from sqlalchemy import select
+
+from app.crud.order import order_crud
+from app.crud.order_stats import order_stats_crud
+from app.db.models import OrderDailyStat, OrderMenuDailyStat, OrderStatus
+from app.schemas.order import OrderCreate, OrderItemCreate
+from tests.postgres import create_sample_order, order_database
+
+
+async def rollup_rows(db) -> tuple[set[tuple], set[tuple]]:
+    """日次集計の行（差し引きで0になった行を除く）"""
+    orders = await db.execute(
+        select(
+            OrderDailyStat.stat_date,
+            OrderDailyStat.status,
+            OrderDailyStat.order_count,
+            OrderDailyStat.revenue,
+        ).where(OrderDailyStat.order_count != 0)
+    )
+    menus = await db.execute(
+        select(
+            OrderMenuDailyStat.stat_date,
+            OrderMenuDailyStat.status,
+            OrderMenuDailyStat.menu_id,
+            OrderMenuDailyStat.quantity,
+            OrderMenuDailyStat.revenue,
+        ).where(OrderMenuDailyStat.quantity != 0)
+    )
+    return {tuple(row) for row in orders}, {tuple(row) for row in menus}
+
+
+async def test_incremental_rollups_match_rebuild():
+    """作成時の加算とステータス変更時の付け替えの結果が、再集計と一致すること"""
+    async with order_database() as session_factory:
+        order_ids = [await create_sample_order(session_factory) for _ in range(3)]
+        async with session_factory() as db:
+            # 同じメニューの明細は1行にまとめて加算される
+            order = await order_crud.create_order(
+                db,
+                OrderCreate(
+                    items=[
+                        OrderItemCreate(menu_id=2, quantity=1),
+                        OrderItemCreate(menu_id=1, quantity=1),
+                        OrderItemCreate(menu_id=2, quantity=2),
+                    ],
+                    delivery_address="東京都渋谷区1-1",
+                ),
+                user_id=1,
+            )
+            order_ids.append(order.id)
+
+            # 単体の更新（apply_ordersで差し引き・加算）
+            await order_crud.update_order_status(db, order_ids[0], OrderStatus.PREPARING)
+            await order_crud.update_order_status(db, order_ids[1], OrderStatus.CANCELLED)
+            # 一括更新（変更前のステータスごとに差し引き）
+            await order_crud.bulk_update_order_status(
+                db, [order_ids[0], order_ids[3]], OrderStatus.CANCELLED
+            )
+
+            incremental = await rollup_rows(db)
+            await order_stats_crud.rebuild(db)
+            rebuilt = await rollup_rows(db)
+
+        assert incremental == rebuilt
+        orders, _ = rebuilt
+        assert {(status, count) for _, status, count, _ in orders} == {
+            (OrderStatus.PENDING, 1),
+            (OrderStatus.CANCELLED, 3),
+        }
@@ -0,0 +1,58 @@
+"""
+注文ステータス遷移のテスト
+遷移表と一括更新リクエストのバリデーションを検証
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.crud.order import (
+    ORDER_STATUS_TRANSITIONS,
+    TERMINAL_ORDER_STATUSES,
+    can_transition,
+)
+from app.db.models import OrderStatus
+from app.schemas.admin import BulkOrderStatusUpdate
+
+
+class TestBulkOrderStatusUpdate:
+    """注文ステータス一括更新リクエストのテスト"""
+
+    def test_bulk_order_status_update(self):
+        """注文ステータス一括更新"""
+        update = BulkOrderStatusUpdate(order_ids=[1, 2, 3], status="ready")
+        assert update.order_ids == [1, 2, 3]
+        assert update.status == OrderStatus.READY
+
+    def test_bulk_order_status_update_limits(self):
+        """注文ID一覧は1件以上200件以下"""
+        with pytest.raises(ValidationError):
+            BulkOrderStatusUpdate(order_ids=[], status=OrderStatus.READY)
+        with pytest.raises(ValidationError):
+            BulkOrderStatusUpdate(order_ids=list(range(1, 202)), status=OrderStatus.READY)
+
+
+class TestOrderStatusTransitions:
+    """注文ステータス遷移のテスト"""
+
+    def test_every_status_has_transitions(self):
+        """全ステータスの遷移先が定義されていること"""
+        assert set(ORDER_STATUS_TRANSITIONS) == set(OrderStatus)
+
+    def test_forward_transitions(self):
+        """調理の流れに沿った遷移とキャンセルは許可されること"""
+        assert can_transition(OrderStatus.PENDING, OrderStatus.PREPARING)
+        assert can_transition(OrderStatus.PREPARING, OrderStatus.READY)
+        assert can_transition(OrderStatus.READY, OrderStatus.DELIVERED)
+        assert can_transition(OrderStatus.PREPARING, OrderStatus.CANCELLED)
+
+    def test_invalid_transitions(self):
+        """逆戻り・飛び越し・同じステータスへの遷移は許可されないこと"""
+        assert not can_transition(OrderStatus.READY, OrderStatus.PREPARING)
+        assert not can_transition(OrderStatus.PENDING, OrderStatus.READY)
+        assert not can_transition(OrderStatus.PREPARING, OrderStatus.PREPARING)
+
+    def test_terminal_statuses_have_no_transitions(self):
+        """終了状態からは遷移できないこと"""
+        for status in TERMINAL_ORDER_STATUSES:
+            assert not ORDER_STATUS_TRANSITIONS[status]
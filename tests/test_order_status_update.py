@@ -0,0 +1,163 @@
+"""
+注文ステータス更新（単体）のテスト
+1文のUPDATEによる遷移の検証・日次集計の付け替え・イベントの記録を、
+PostgreSQL（TEST_DATABASE_URL）のデータベースで検証
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.crud.order import build_order_response, order_crud
+from app.db.models import OrderDailyStat, OrderEvent, OrderMenuDailyStat, OrderStatus
+from tests.postgres import STORE_EMAIL, create_sample_order, order_database
+from tests.test_loading import api_client, auth_headers
+
+
+async def order_rollups(db) -> dict[OrderStatus, tuple[int, Decimal, int]]:
+    """ステータスごとの (注文数, 売上, 数量) の日次集計の合計"""
+    orders = await db.execute(
+        select(
+            OrderDailyStat.status,
+            func.sum(OrderDailyStat.order_count),
+            func.sum(OrderDailyStat.revenue),
+        ).group_by(OrderDailyStat.status)
+    )
+    quantities = dict(
+        (
+            await db.execute(
+                select(OrderMenuDailyStat.status, func.sum(OrderMenuDailyStat.quantity))
+                .group_by(OrderMenuDailyStat.status)
+            )
+        ).all()
+    )
+    return {
+        status: (int(count), revenue, int(quantities.get(status, 0)))
+        for status, count, revenue in orders
+        if count
+    }
+
+
+async def order_events(db) -> list[tuple[str, str]]:
+    """記録されたイベントの (種別, ステータス) の一覧（ID順）"""
+    result = await db.execute(
+        select(OrderEvent.event_type, OrderEvent.payload["status"].astext)
+        .order_by(OrderEvent.id)
+    )
+    return [tuple(row) for row in result]
+
+
+async def test_status_change_moves_rollups_and_publishes_event():
+    """変更前のステータスの集計から変更後へ付け替え、イベントを1件記録すること"""
+    async with order_database() as session_factory:
+        order_id = await create_sample_order(session_factory)
+
+        async with session_factory() as db:
+            before = await order_crud.get_order_by_id(db, order_id)
+            updated = await order_crud.update_order_status(db, order_id, OrderStatus.PREPARING)
+
+            assert updated.id == order_id
+            assert updated.status == OrderStatus.PREPARING
+            assert updated.updated_at > before.updated_at
+
+            assert await order_rollups(db) == {
+                OrderStatus.PREPARING: (1, Decimal("1600"), 3),
+            }
+            assert await order_events(db) == [
+                ("order_created", "pending"),
+                ("order_status_changed", "preparing"),
+            ]
+
+
+async def test_same_status_is_a_no_op():
+    """同じステータスの指定では更新日時・集計・イベントを変えないこと"""
+    async with order_database() as session_factory:
+        order_id = await create_sample_order(session_factory)
+
+        async with session_factory() as db:
+            before = await order_crud.get_order_by_id(db, order_id)
+            updated = await order_crud.update_order_status(db, order_id, OrderStatus.PENDING)
+
+            assert updated.status == OrderStatus.PENDING
+            assert updated.updated_at == before.updated_at
+            order = await order_crud.get_order_by_id(db, order_id)
+            assert order.updated_at == before.updated_at
+            assert await order_rollups(db) == {OrderStatus.PENDING: (1, Decimal("1600"), 3)}
+            assert await order_events(db) == [("order_created", "pending")]
+
+
+async def test_invalid_transition_is_rejected():
+    """遷移表にない変更は拒否し、注文・集計・イベントを変えないこと"""
+    async with order_database() as session_factory:
+        order_id = await create_sample_order(session_factory)
+
+        async with session_factory() as db:
+            for status in (OrderStatus.PREPARING, OrderStatus.READY, OrderStatus.DELIVERED):
+                await order_crud.update_order_status(db, order_id, status)
+
+            with pytest.raises(ValueError):
+                await order_crud.update_order_status(db, order_id, OrderStatus.PENDING)
+
+            order = await order_crud.get_order_by_id(db, order_id)
+            assert order.status == OrderStatus.DELIVERED
+            assert await order_rollups(db) == {OrderStatus.DELIVERED: (1, Decimal("1600"), 3)}
+            assert len(await order_events(db)) == 4
+
+
+async def test_missing_order_returns_none():
+    """存在しない注文はNoneを返すこと"""
+    async with order_database() as session_factory:
+        async with session_factory() as db:
+            assert await order_crud.update_order_status(db, 999, OrderStatus.READY) is None
+
+
+@pytest.mark.parametrize(
+    "method,path",
+    [
+        ("PATCH", "/api/v1/admin/orders/{order_id}?status={status}"),
+        ("PUT", "/api/v1/admin/orders/{order_id}/status?order_status={status}"),
+    ],
+)
+async def test_endpoints_enforce_transitions(method, path):
+    """PATCH・PUTとも遷移できない変更は409、存在しない注文は404を返すこと"""
+    async with order_database() as session_factory:
+        order_id = await create_sample_order(session_factory)
+        headers = auth_headers(STORE_EMAIL)
+
+        async with api_client(session_factory) as client:
+            response = await client.request(
+                method, path.format(order_id=order_id, status="ready"), headers=headers
+            )
+            assert response.status_code == 409
+
+            response = await client.request(
+                method, path.format(order_id=order_id, status="preparing"), headers=headers
+            )
+            assert response.status_code == 200
+            assert response.json()["status"] == "preparing"
+
+            response = await client.request(
+                method, path.format(order_id=999, status="ready"), headers=headers
+            )
+            assert response.status_code == 404
+
+
+async def test_patch_include_details_returns_order():
+    """include_details=trueでは更新後の注文詳細を返すこと"""
+    async with order_database() as session_factory:
+        order_id = await create_sample_order(session_factory)
+
+        async with api_client(session_factory) as client:
+            response = await client.patch(
+                f"/api/v1/admin/orders/{order_id}",
+                params={"status": "cancelled", "include_details": "true"},
+                headers=auth_headers(STORE_EMAIL),
+            )
+        assert response.status_code == 200
+
+        async with session_factory() as db:
+            order = await order_crud.get_order_by_id(db, order_id)
+        expected = build_order_response(order)
+        assert expected.status == OrderStatus.CANCELLED
+        assert response.json() == expected.model_dump(mode="json")
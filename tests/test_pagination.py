@@ -0,0 +1,57 @@
+"""
+キーセットページネーションのテスト
+カーソルのエンコード・デコードを検証
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.crud.pagination import Explain, decode_cursor, encode_cursor, next_cursor
+from app.db.models import Order
+from app.schemas.order import OrderSummaryResponse
+
+
+class TestCursor:
+    """カーソルのテスト"""
+
+    def test_round_trip(self):
+        """エンコードしたカーソルを元の値に戻せる"""
+        created_at = datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+        cursor = encode_cursor(created_at, 42)
+        assert decode_cursor(cursor) == (created_at, 42)
+
+    @pytest.mark.parametrize("cursor", ["garbage", "", "WyJ4IiwxXQ", "WzEsMl0"])
+    def test_invalid_cursor(self, cursor):
+        """不正なカーソル"""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+    def test_next_cursor(self):
+        """次ページが存在する場合のみカーソルを返す"""
+        items = [
+            OrderSummaryResponse(
+                id=i,
+                status="pending",
+                total_amount=500,
+                delivery_address="東京都渋谷区",
+                created_at=datetime(2024, 1, i, tzinfo=timezone.utc),
+                items_count=1,
+            )
+            for i in (3, 2, 1)
+        ]
+        assert next_cursor(items, has_more=False) is None
+        assert next_cursor([], has_more=True) is None
+        assert decode_cursor(next_cursor(items, has_more=True)) == (items[-1].created_at, 1)
+
+
+def test_explain_keeps_bind_parameters():
+    """推定件数のEXPLAINはフィルタ値をSQLに埋め込まずバインドパラメータで渡すこと"""
+    query = select(Order.id).where(Order.delivery_address == "x' OR '1'='1")
+    compiled = Explain(query).compile(dialect=postgresql.asyncpg.dialect())
+    sql = str(compiled)
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "OR '1'='1" not in sql
+    assert "x' OR '1'='1" in compiled.params.values()
@@ -0,0 +1,91 @@
+"""
+注文テーブルのパーティション管理のテスト
+月の計算・パーティション名・DDLを検証
+"""
+
+from datetime import date
+
+import pytest
+
+from app.db.models import Order, OrderDetail
+from app.db.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    default_partition_ddl,
+    month_partition_ddl,
+    month_start,
+    partition_name,
+    partition_parent,
+)
+
+
+class TestMonths:
+    """月の計算のテスト"""
+
+    def test_month_start(self):
+        """月の途中の日付から月の1日を求める"""
+        assert month_start(date(2024, 2, 29)) == date(2024, 2, 1)
+
+    @pytest.mark.parametrize(
+        "months,expected",
+        [(0, date(2024, 11, 1)), (1, date(2024, 12, 1)), (2, date(2025, 1, 1)),
+         (14, date(2026, 1, 1)), (-11, date(2023, 12, 1))],
+    )
+    def test_add_months(self, months, expected):
+        """年をまたいで月を加算・減算できる"""
+        assert add_months(date(2024, 11, 1), months) == expected
+
+
+class TestPartitionNames:
+    """パーティション名とDDLのテスト"""
+
+    def test_partition_name(self):
+        assert partition_name("orders", date(2024, 3, 1)) == "orders_p2024_03"
+
+    @pytest.mark.parametrize(
+        "name,parent",
+        [
+            ("orders_p2024_03", "orders"),
+            ("order_details_p2024_03", "order_details"),
+            ("orders_default", "orders"),
+            ("orders", None),
+            ("order_events", None),
+            ("orders_p2024_3", None),
+        ],
+    )
+    def test_partition_parent(self, name, parent):
+        """パーティションのテーブル名だけを親テーブルに対応付ける"""
+        assert partition_parent(name) == parent
+
+    def test_month_partition_ddl(self):
+        """月の1日から翌月の1日までの範囲になる（上限は含まない）"""
+        assert month_partition_ddl("order_details", date(2024, 12, 1)) == (
+            "CREATE TABLE IF NOT EXISTS order_details_p2024_12 PARTITION OF order_details "
+            "FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')"
+        )
+
+    def test_default_partition_ddl(self):
+        assert default_partition_ddl("orders") == (
+            "CREATE TABLE IF NOT EXISTS orders_default PARTITION OF orders DEFAULT"
+        )
+
+
+def test_models_are_partitioned_by_created_at():
+    """パーティションキーが主キーに含まれ、ORMの同一性はidのみで管理されること"""
+    for model in (Order, OrderDetail):
+        table = model.__table__
+        assert table.name in PARTITIONED_TABLES
+        assert table.dialect_options["postgresql"]["partition_by"] == "RANGE (created_at)"
+        assert [column.name for column in table.primary_key] == ["id", "created_at"]
+        assert [column.name for column in model.__mapper__.primary_key] == ["id"]
+
+
+def test_order_details_reference_order_partition_key():
+    """注文詳細は(order_id, created_at)で注文を参照し、注文と同じ月に入ること"""
+    (constraint,) = [
+        fk for fk in OrderDetail.__table__.foreign_key_constraints
+        if fk.referred_table is Order.__table__
+    ]
+    assert [column.name for column in constraint.columns] == ["order_id", "created_at"]
+    assert [element.column.name for element in constraint.elements] == ["id", "created_at"]
+    assert constraint.ondelete == "CASCADE"
@@ -0,0 +1,51 @@
+"""
+コネクションプールの計測のテスト
+接続の返却待ちと新しい接続の確立を別々に集計することを検証
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.database import InstrumentedAsyncQueuePool
+
+pytest.importorskip("aiosqlite")
+
+
+async def test_wait_excludes_connect_time():
+    """接続の確立は接続時間に、返却待ちのみが待ち時間に計上されること"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    pool = engine.pool
+    try:
+        # 初回は接続を確立する（キューに空きがないため待たずにオーバーフロー枠で作る）
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        assert pool.connects == 1
+        assert pool.total_connect_seconds > 0
+        assert pool.max_wait_seconds < 0.05
+
+        async def hold() -> None:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await asyncio.sleep(0.2)
+
+        async def wait_for_connection() -> None:
+            await asyncio.sleep(0.05)
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        await asyncio.gather(hold(), wait_for_connection())
+
+        # 2回目以降はプールの接続を使い回し、返却を待った時間だけが計上される
+        assert pool.connects == 1
+        assert pool.checkouts == 3
+        assert pool.max_wait_seconds >= 0.1
+    finally:
+        await engine.dispose()
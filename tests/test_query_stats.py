@@ -0,0 +1,94 @@
+"""
+SQL文の計測のテスト
+リクエスト単位の計測・入れ子の集計・ヘッダーと警告の出力を検証
+"""
+
+import logging
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.query_budget import QueryBudgetMiddleware, summarize_statement
+from app.db.query_stats import instrument_engine, track_queries
+
+
+def test_counts_only_inside_tracked_block():
+    """track_queriesのブロック内で実行されたSQL文だけを数えること"""
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)  # 二重に登録しても二重に数えない
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with track_queries() as outer:
+            conn.execute(text("SELECT 1"))
+            with track_queries() as inner:
+                conn.execute(text("SELECT 2"))
+                conn.execute(text("SELECT 2"))
+            conn.execute(text("SELECT 3"))
+
+    assert inner.count == 2
+    assert inner.most_repeated() == ("SELECT 2", 2)
+    # 内側で実行された分も外側に含まれる
+    assert outer.count == 4
+    assert outer.statements == {"SELECT 1": 1, "SELECT 2": 2, "SELECT 3": 1}
+    assert outer.seconds >= inner.seconds > 0
+
+
+def test_summarize_statement():
+    assert summarize_statement("SELECT id\n  FROM orders\n WHERE id = ?") == (
+        "SELECT id FROM orders WHERE id = ?"
+    )
+    assert summarize_statement("SELECT " + "x" * 300).endswith("...")
+
+
+def build_app(expose_headers: bool) -> FastAPI:
+    """リクエストごとにn回同じSQL文を実行するアプリケーション"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    app = FastAPI()
+
+    @app.get("/items/{n}")
+    async def run_queries(n: int):
+        async with engine.connect() as conn:
+            for i in range(n):
+                await conn.execute(text("SELECT :i"), {"i": i})
+        return {"n": n}
+
+    app.add_middleware(
+        QueryBudgetMiddleware, budget=3, repeat_threshold=3, expose_headers=expose_headers
+    )
+    return app
+
+
+async def test_debug_headers():
+    """デバッグモードではX-DB-Queries・Server-Timingヘッダーを付与すること"""
+    async with httpx.AsyncClient(app=build_app(True), base_url="http://test") as client:
+        response = await client.get("/items/2")
+    assert response.headers["X-DB-Queries"] == "2"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert response.headers["Server-Timing"].endswith('desc="2 queries"')
+
+    async with httpx.AsyncClient(app=build_app(False), base_url="http://test") as client:
+        response = await client.get("/items/2")
+    assert "X-DB-Queries" not in response.headers
+    assert "Server-Timing" not in response.headers
+
+
+async def test_warns_over_budget_and_on_repeated_statements(caplog):
+    """上限の超過と同じSQL文の繰り返しをルートのテンプレート付きで警告すること"""
+    app = build_app(False)
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        with caplog.at_level(logging.WARNING, logger="app.core.query_budget"):
+            await client.get("/items/2")
+            assert not caplog.records
+
+            await client.get("/items/4")
+
+    over_budget, repeated = [record.getMessage() for record in caplog.records]
+    assert over_budget.startswith("GET /items/{n} ran 4 SQL statements (budget 3, ")
+    assert repeated == (
+        "GET /items/{n} ran the same SQL statement 4 times (possible N+1): SELECT ?"
+    )
@@ -0,0 +1,65 @@
+"""
+JSONレスポンスのテスト
+orjsonによるJSONの生成が標準のJSONResponseと同じ出力になることを検証
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from fastapi.utils import create_response_field
+
+from app.db.models import OrderStatus
+from app.main import app
+from app.schemas.order import OrderDetailResponse, OrderResponse
+
+
+def test_api_routes_use_orjson_response():
+    """APIのルートは既定でORJSONResponseを使用すること"""
+    routes = [
+        route for route in app.routes
+        if isinstance(route, APIRoute) and route.path.startswith("/api/v1/")
+    ]
+    assert routes
+    assert {route.response_class for route in routes} == {ORJSONResponse}
+
+
+async def test_orjson_output_matches_json_response():
+    """Decimal・datetime・Enum・日本語を含むレスポンスが同じバイト列になること"""
+    created_at = datetime(2024, 1, 1, 16, 0, 30, 123456, tzinfo=timezone.utc)
+    order = OrderResponse(
+        id=1,
+        user_id=2,
+        status=OrderStatus.DELIVERED,
+        total_amount=Decimal("1700"),
+        delivery_address="東京都渋谷区",
+        delivery_time=None,
+        notes="辛さ控えめ\n\"よろしく\"",
+        items=[
+            OrderDetailResponse(
+                id=1, menu_id=1, menu_name="唐揚げ弁当", quantity=2,
+                unit_price=Decimal("500"), subtotal=Decimal("1000"),
+            ),
+            OrderDetailResponse(
+                id=2, menu_id=2, menu_name="焼肉弁当", quantity=1,
+                unit_price=Decimal("700.5"), subtotal=Decimal("700.5"),
+            ),
+        ],
+        created_at=created_at,
+        updated_at=created_at,
+    )
+    field = create_response_field(name="response", type_=OrderResponse)
+    content = await serialize_response(field=field, response_content=order)
+
+    body = ORJSONResponse(content).body
+    assert body == JSONResponse(content).body
+    assert b'"status":"delivered"' in body
+    assert b'"unit_price":"700.5"' in body
+    assert b'"created_at":"2024-01-01T16:00:30.123456Z"' in body
+
+
+def test_orjson_output_matches_for_plain_dicts():
+    """response_modelのないエンドポイント（辞書）でも同じ出力になること"""
+    content = {"status": "healthy", "ratio": 0.25, "counts": {1: 2}, "items": [None, True]}
+    assert ORJSONResponse(content).body == JSONResponse(content).body
@@ -0,0 +1,72 @@
+"""
+パスワードハッシュ処理のテスト
+スレッドプールでのハッシュ化・検証と、待ち行列の統計を検証
+"""
+
+import asyncio
+import threading
+
+from app.core.security import (
+    PasswordHashExecutor,
+    get_password_hash,
+    get_password_hash_async,
+    verify_password,
+    verify_password_async,
+)
+
+
+async def test_async_hash_round_trip():
+    """非同期版のハッシュ・検証が同期版と互換であること"""
+    hashed = await get_password_hash_async("correct horse")
+
+    assert hashed != "correct horse"
+    assert await verify_password_async("correct horse", hashed)
+    assert verify_password("correct horse", hashed)
+    assert await verify_password_async("correct horse", get_password_hash("correct horse"))
+
+
+async def test_async_verify_rejects_wrong_password():
+    """誤ったパスワードはFalseになること"""
+    hashed = await get_password_hash_async("correct horse")
+
+    assert await verify_password_async("battery staple", hashed) is False
+
+
+async def test_executor_stats_track_queue():
+    """待ち行列・実行中・完了件数が処理の進行に合わせて変わること"""
+    executor = PasswordHashExecutor(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(value: int) -> int:
+        started.set()
+        release.wait(5)
+        return value
+
+    assert executor.stats() == {
+        "max_workers": 1,
+        "queue_depth": 0,
+        "max_queue_depth": 0,
+        "running": 0,
+        "completed": 0,
+    }
+
+    try:
+        first = asyncio.ensure_future(executor.run(blocking, 1))
+        second = asyncio.ensure_future(executor.run(lambda value: value, 2))
+        await asyncio.sleep(0)
+        assert await asyncio.to_thread(started.wait, 5)
+
+        # 1件目が実行中で、同時実行数1のため2件目は待ち行列にある
+        stats = executor.stats()
+        assert (stats["running"], stats["queue_depth"], stats["completed"]) == (1, 1, 0)
+        assert stats["max_queue_depth"] >= 1
+
+        release.set()
+        assert await asyncio.gather(first, second) == [1, 2]
+
+        stats = executor.stats()
+        assert (stats["running"], stats["queue_depth"], stats["completed"]) == (0, 0, 2)
+    finally:
+        release.set()
+        executor._executor.shutdown()
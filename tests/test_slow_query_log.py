@@ -0,0 +1,105 @@
+"""
+スロークエリログのテスト
+パラメータの秘匿・EXPLAINの対象・リングバッファ・管理者用APIを検証
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.query_budget import current_request_scope
+from app.core.slow_query_log import SlowQueryLog, is_explainable, redact_parameters
+from tests.test_loading import (
+    CUSTOMER_EMAIL,
+    STORE_EMAIL,
+    api_client,
+    auth_headers,
+    loading_database,
+)
+
+
+@pytest.mark.parametrize(
+    "parameters,executemany,expected",
+    [
+        ((1, "secret@example.com", None), False, ["int", "str", "NoneType"]),
+        ({"email": "secret@example.com", "since": datetime(2024, 1, 1)}, False, ["str", "datetime"]),
+        ([(1, "a"), (2, "b"), (3, "c")], True, ["int", "str", "x3 rows"]),
+        ((), False, []),
+        (None, False, []),
+    ],
+)
+def test_redact_parameters(parameters, executemany, expected):
+    """パラメータの値は残さず型名のみにすること"""
+    assert redact_parameters(parameters, executemany) == expected
+
+
+@pytest.mark.parametrize(
+    "statement,expected",
+    [
+        ("SELECT id FROM orders WHERE id = $1", True),
+        ("  with recent AS (SELECT 1) SELECT * FROM recent", True),
+        ("SELECT id FROM orders WHERE id = $1 FOR UPDATE SKIP LOCKED", False),
+        ("WITH moved AS (DELETE FROM orders RETURNING id) SELECT count(*) FROM moved", False),
+        ("UPDATE orders SET status = $1 WHERE id = $2", False),
+        ("INSERT INTO orders (id) VALUES ($1)", False),
+    ],
+)
+def test_is_explainable(statement, expected):
+    """EXPLAIN ANALYZEで再実行するのは読み取りのみのSQL文に限ること"""
+    assert is_explainable(statement) is expected
+
+
+async def test_records_slow_statements_in_bounded_buffer():
+    """しきい値以上のSQL文を新しい順に上限件数まで保持し、呼び出し元を記録すること"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    log = SlowQueryLog(threshold_ms=0.000001, max_entries=2, explain=True)
+    log.instrument(engine)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT :a"), {"a": "secret"})
+            token = current_request_scope.set({"method": "GET", "path": "/api/v1/orders/5"})
+            try:
+                await conn.execute(text("SELECT :a, :b"), {"a": 1, "b": "secret"})
+                await conn.execute(text("SELECT 3"))
+            finally:
+                current_request_scope.reset(token)
+    finally:
+        await engine.dispose()
+
+    assert log.recorded == 3
+    newest, older = log.snapshot()
+    assert newest.statement == "SELECT 3"
+    assert (older.statement, older.parameters) == ("SELECT ?, ?", ["int", "str"])
+    assert older.endpoint == "GET /api/v1/orders/5"
+    assert "secret" not in repr(log.snapshot())
+    # SQLiteではEXPLAINを取得しない
+    assert older.plan is None and older.plan_error is None
+
+
+async def test_disabled_when_threshold_is_zero():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    log = SlowQueryLog(threshold_ms=0, max_entries=10, explain=False)
+    log.instrument(engine)
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await engine.dispose()
+    assert not log.enabled
+    assert log.recorded == 0
+
+
+async def test_slow_query_endpoint_is_admin_only():
+    """スロークエリログは店舗管理者のみ参照できること"""
+    async with loading_database() as session_factory, api_client(session_factory) as client:
+        response = await client.get(
+            "/api/v1/admin/slow-queries/", headers=auth_headers(CUSTOMER_EMAIL)
+        )
+        assert response.status_code == 403
+
+        response = await client.get(
+            "/api/v1/admin/slow-queries/", headers=auth_headers(STORE_EMAIL)
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert set(body) == {"threshold_ms", "explain", "max_entries", "recorded", "items"}
@@ -0,0 +1,42 @@
+"""
+書き込みエンドポイントのSQL文の数のテスト
+日次集計・イベントの書き込みを含めて、PostgreSQL（TEST_DATABASE_URL）で検証
+"""
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.models import OrderDailyStat, OrderEvent, OrderStatus
+from tests.postgres import STORE_EMAIL, create_sample_order, order_database
+from tests.test_loading import api_client, auth_headers
+
+
+@pytest.mark.parametrize(
+    "method,path,limit",
+    [
+        # 認証ユーザーの取得・UPDATE・日次集計の差し引きと加算（各2文）・イベント
+        ("PATCH", "/api/v1/admin/orders/{order_id}?status=preparing", 7),
+        ("PUT", "/api/v1/admin/orders/{order_id}/status?order_status=preparing", 7),
+    ],
+)
+async def test_status_update_query_budgets(max_queries, method, path, limit):
+    """ステータス更新のSQL文の数が上限以下で、集計とイベントが書き込まれること"""
+    async with order_database() as session_factory:
+        order_id = await create_sample_order(session_factory)
+
+        async with api_client(session_factory) as client:
+            with max_queries(limit):
+                response = await client.request(
+                    method, path.format(order_id=order_id), headers=auth_headers(STORE_EMAIL)
+                )
+        assert response.status_code == 200, response.text
+
+        # 上限は副作用の書き込みを含めた数であること（書き込みを飛ばして通らない）
+        async with session_factory() as db:
+            rollups = await db.execute(
+                select(OrderDailyStat.status, func.sum(OrderDailyStat.order_count))
+                .group_by(OrderDailyStat.status)
+            )
+            assert dict(rollups.all()) == {OrderStatus.PENDING: 0, OrderStatus.PREPARING: 1}
+            events = await db.execute(select(OrderEvent.event_type).order_by(OrderEvent.id))
+            assert events.scalars().all() == ["order_created", "order_status_changed"]